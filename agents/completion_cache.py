@@ -0,0 +1,60 @@
+"""
+Shared cache of Gemini completions for the Trip Planner agents.
+
+A prompt embeds the full context an agent sends (user input, accumulated
+conversation, trip data), so identical prompts to the same model can reuse
+the earlier completion instead of another Vertex AI round trip.
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Optional, Tuple
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Completions are kept for a bounded time so retries and repeated turns hit,
+# while long-lived processes still pick up fresh answers
+_completions = TTLCache(maxsize=1024, ttl=900)
+_completions_lock = threading.Lock()
+
+
+def _completion_key(model_name: str, prompt: str) -> Tuple[str, bytes]:
+    """Key a completion by model and a digest of the prompt."""
+    return model_name, hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+
+
+def cached_completion(model_name: str, prompt: str, generate: Callable[[str], Any]) -> Optional[str]:
+    """
+    Return the stripped completion text for a prompt, calling the model on a miss.
+    
+    Args:
+        model_name: Name of the Gemini model the prompt is sent to
+        prompt: Full prompt text
+        generate: The model's generate_content callable
+        
+    Returns:
+        Completion text, or None if the model returned no text
+    """
+    key = _completion_key(model_name, prompt)
+    with _completions_lock:
+        text = _completions.get(key)
+    if text is not None:
+        logger.debug("Completion cache hit for %s", model_name)
+        return text
+        
+    response = generate(prompt)
+    if not (response and response.text):
+        return None
+        
+    text = response.text.strip()
+    with _completions_lock:
+        _completions[key] = text
+    return text
+
+
+def clear_completion_cache() -> None:
+    """Drop all cached completions."""
+    with _completions_lock:
+        _completions.clear()
@@ -6,22 +6,39 @@ POIs, weather data, and transport information.
 """
 
 import logging
+import orjson
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import date, timedelta, datetime, time
-from decimal import Decimal
 import uuid
 import math
 from adk import LlmAgent
 from google.cloud import aiplatform
+from vertexai.generative_models import GenerativeModel
 
 from schemas import (
     Itinerary, DayPlan, ItineraryItem, POI, TripRequest, 
-    WeatherInfo, TransportOption, AgentResponse
+    WeatherInfo, TransportOption, AgentResponse, POICategory, to_cents, to_display
 )
+from agents.completion_cache import cached_completion
 from tools import MapsApiTool
 
 logger = logging.getLogger(__name__)
 
+# Category groupings hold enum members; POI.category is always a member, so
+# lookups hit the identity fast path instead of comparing value strings
+_OUTDOOR_CATEGORIES = frozenset({POICategory.PARK, POICategory.BEACH, POICategory.ADVENTURE})
+_WEATHER_SENSITIVE_CATEGORIES = _OUTDOOR_CATEGORIES | {POICategory.ATTRACTION}
+_PER_TRAVELER_CATEGORIES = frozenset({
+    POICategory.RESTAURANT, POICategory.ENTERTAINMENT, POICategory.ACCOMMODATION
+})
+_CATEGORY_TIPS = {
+    POICategory.RELIGIOUS: "🙏 Dress modestly and respect local customs",
+    POICategory.MUSEUM: "🎫 Consider booking tickets in advance",
+    POICategory.RESTAURANT: "🍽️ Check for reservations if upscale dining",
+    POICategory.BEACH: "🏖️ Bring sunscreen, water, and beach essentials",
+    POICategory.ADVENTURE: "👟 Wear appropriate clothing and footwear",
+}
+
 
 class ItineraryPlannerAgent(LlmAgent):
     """Agent for creating comprehensive trip itineraries."""
@@ -38,10 +55,15 @@ class ItineraryPlannerAgent(LlmAgent):
         # Initialize Vertex AI
         aiplatform.init(
             project=vertex_config["project_id"],
-            location=vertex_config["location"]
+            location=vertex_config["location"],
+            credentials=vertex_config.get("credentials")
         )
         
-        logger.info("Itinerary Planner Agent initialized")
+        # Build the Gemini model once (model name is fixed per agent)
+        self._gen_model = GenerativeModel(self.model_name)
+        self._gen = self._gen_model.generate_content
+        
+        logger.debug("Itinerary Planner Agent initialized")
     
     def _get_destination_currency(self, destination: str) -> Tuple[str, str, float]:
         """
@@ -102,8 +124,8 @@ class ItineraryPlannerAgent(LlmAgent):
         # Default to USD
         return ("USD", "$", 1.0)
     
-    def _format_currency(self, amount: Decimal, destination: str) -> str:
-        """Format currency amount based on destination."""
+    def _format_currency(self, amount: float, destination: str) -> str:
+        """Format an amount in USD (not cents) in the destination's currency."""
         currency_code, symbol, rate = self._get_destination_currency(destination)
         local_amount = float(amount) * rate
         
@@ -170,7 +192,7 @@ class ItineraryPlannerAgent(LlmAgent):
                 agent_name=self.name,
                 success=True,
                 data={
-                    "itinerary": enhanced_itinerary.dict(),
+                    "itinerary": enhanced_itinerary.model_dump(),
                     "summary": self._create_itinerary_summary(enhanced_itinerary)
                 },
                 message=f"Successfully created {trip_request.duration_days}-day itinerary"
@@ -246,7 +268,7 @@ class ItineraryPlannerAgent(LlmAgent):
                 agent_name=self.name,
                 success=True,
                 data={
-                    "itinerary": optimized_itinerary.dict(),
+                    "itinerary": optimized_itinerary.model_dump(),
                     "optimization_summary": self._create_optimization_summary(itinerary, optimized_itinerary)
                 },
                 message="Successfully optimized itinerary"
@@ -433,7 +455,7 @@ class ItineraryPlannerAgent(LlmAgent):
             
             # Add lunch break if needed (around lunch time and no lunch break yet)
             if (start_time >= 12 * 60 and not lunch_break_added and 
-                poi.category.value != "restaurant" and current_time is not None and 
+                poi.category is not POICategory.RESTAURANT and current_time is not None and 
                 current_time < 12 * 60):
                 
                 lunch_start = max(current_time + 15, 12 * 60)  # 12:00 PM
@@ -479,7 +501,7 @@ class ItineraryPlannerAgent(LlmAgent):
             current_time = end_time + travel_time
             
             # Don't schedule past 11 PM for most activities (except nightlife)
-            if current_time > 23 * 60 and poi.category.value != "nightlife":
+            if current_time > 23 * 60 and poi.category is not POICategory.NIGHTLIFE:
                 break
         
         return items
@@ -685,7 +707,7 @@ Examples:
             notes.append(f"⏱️ Estimated visit time: {duration_mins}m")
         
         # Add weather-related notes with more intelligence
-        if weather and poi.category.value in ["park", "beach", "attraction", "adventure"]:
+        if weather and poi.category in _WEATHER_SENSITIVE_CATEGORIES:
             if weather.condition and "rain" in weather.condition.lower():
                 notes.append("☔ Weather alert - indoor backup recommended")
             elif weather.temperature_high:
@@ -705,16 +727,9 @@ Examples:
             notes.append(f"⭐ Highly rated ({poi.rating}/5)")
         
         # Add category-specific tips
-        if poi.category.value == "religious":
-            notes.append("🙏 Dress modestly and respect local customs")
-        elif poi.category.value == "museum":
-            notes.append("🎫 Consider booking tickets in advance")
-        elif poi.category.value == "restaurant":
-            notes.append("🍽️ Check for reservations if upscale dining")
-        elif poi.category.value == "beach":
-            notes.append("🏖️ Bring sunscreen, water, and beach essentials")
-        elif poi.category.value == "adventure":
-            notes.append("👟 Wear appropriate clothing and footwear")
+        tip = _CATEGORY_TIPS.get(poi.category)
+        if tip:
+            notes.append(tip)
         
         # Add opening hours reminder if available
         if poi.opening_hours:
@@ -823,15 +838,6 @@ Examples:
                 taxi_cost = max(2.0, distance_km * base_taxi_rate)  # Minimum fare
                 public_cost = max(0.5, distance_km * base_public_rate)
                 
-                # Return walking as primary option with additional info
-                transport_option = TransportOption(
-                    mode="walking",
-                    duration_minutes=walking_duration,
-                    distance_km=distance_km,
-                    cost=Decimal("0"),  # Walking is free
-                    route_description=leg.get("summary", "")
-                )
-                
                 # Add transport alternatives as description
                 alternatives = []
                 
@@ -839,19 +845,24 @@ Examples:
                     alternatives.append(f"🚶 Walking: {walking_duration} min, Free")
                 
                 driving_time = max(5, int((distance_km / 25.0) * 60))  # Urban speed
-                alternatives.append(f"🚗 Taxi: {driving_time} min, {self._format_currency(Decimal(str(taxi_cost)), destination)}")
+                alternatives.append(f"🚗 Taxi: {driving_time} min, {self._format_currency(taxi_cost, destination)}")
                 
                 if distance_km > 0.5:  # Public transport for longer distances
                     public_time = int((distance_km / 15.0) * 60) + 5  # Add wait time
-                    alternatives.append(f"🚌 Public: {public_time} min, {self._format_currency(Decimal(str(public_cost)), destination)}")
+                    alternatives.append(f"🚌 Public: {public_time} min, {self._format_currency(public_cost, destination)}")
                 
                 if distance_km > 2.0:  # Ride-sharing for longer distances
                     rideshare_cost = taxi_cost * 0.8
-                    alternatives.append(f"📱 Uber/Ola: {driving_time + 3} min, {self._format_currency(Decimal(str(rideshare_cost)), destination)}")
-                
-                transport_option.route_description = f"{leg.get('summary', '')} | Options: {' | '.join(alternatives)}"
+                    alternatives.append(f"📱 Uber/Ola: {driving_time + 3} min, {self._format_currency(rideshare_cost, destination)}")
                 
-                return transport_option
+                # Return walking as primary option with additional info
+                return TransportOption(
+                    mode="walking",
+                    duration_minutes=walking_duration,
+                    distance_km=distance_km,
+                    cost=0,  # Walking is free
+                    route_description=f"{leg.get('summary', '')} | Options: {' | '.join(alternatives)}"
+                )
             
             return None
             
@@ -859,8 +870,8 @@ Examples:
             logger.warning(f"Could not calculate transport: {e}")
             return None
     
-    def _estimate_poi_cost(self, poi: POI, trip_request: TripRequest) -> Decimal:
-        """Estimate cost for visiting a POI."""
+    def _estimate_poi_cost(self, poi: POI, trip_request: TripRequest) -> int:
+        """Estimate cost for visiting a POI, in cents."""
         # Base cost estimates by category and price level
         base_costs = {
             "restaurant": [15, 30, 50, 80],  # By price level 1-4
@@ -884,12 +895,12 @@ Examples:
         base_cost = category_costs[cost_index]
         
         # Adjust for number of travelers
-        if poi.category.value in ["restaurant", "entertainment", "accommodation"]:
-            total_cost = Decimal(str(base_cost * trip_request.number_of_travelers))
+        if poi.category in _PER_TRAVELER_CATEGORIES:
+            total_cost = base_cost * trip_request.number_of_travelers
         else:
-            total_cost = Decimal(str(base_cost))
+            total_cost = base_cost
         
-        return total_cost
+        return to_cents(total_cost)
     
     def _generate_day_notes(
         self,
@@ -927,18 +938,18 @@ Examples:
         if poi.website:
             notes.append("Visit website for tickets/reservations")
         
-        if weather and poi.category.value in ["park", "beach", "adventure"]:
+        if weather and poi.category in _OUTDOOR_CATEGORIES:
             if not weather.is_suitable_for_outdoor:
                 notes.append("Weather may affect this outdoor activity")
         
         return "; ".join(notes) if notes else None
     
-    def _calculate_day_cost(self, items: List[ItineraryItem]) -> Decimal:
-        """Calculate total cost for a day."""
-        return sum(item.cost_estimate or Decimal("0") for item in items)
+    def _calculate_day_cost(self, items: List[ItineraryItem]) -> int:
+        """Calculate total cost for a day, in cents."""
+        return sum(item.cost_estimate or 0 for item in items)
     
-    def _calculate_total_cost(self, daily_plans: List[DayPlan]) -> Decimal:
-        """Calculate total trip cost."""
+    def _calculate_total_cost(self, daily_plans: List[DayPlan]) -> int:
+        """Calculate total trip cost, in cents."""
         return sum(day.total_estimated_cost for day in daily_plans)
     
     def _optimize_daily_route(
@@ -1017,17 +1028,15 @@ Examples:
         updated_items = []
         
         for i, item in enumerate(items):
-            updated_item = item.copy()
-            
             # Calculate transport to next POI
             if i < len(items) - 1:
                 next_poi = items[i + 1].poi
                 transport = self._calculate_transport(item.poi, next_poi, maps_tool, destination)
-                updated_item.transport_to_next = transport
             else:
-                updated_item.transport_to_next = None
+                transport = None
             
-            updated_items.append(updated_item)
+            # Items are immutable; copy with the new transport leg
+            updated_items.append(item.model_copy(update={"transport_to_next": transport}))
         
         return updated_items
     
@@ -1079,17 +1088,9 @@ Provide enhancements in JSON format:
         return prompt
     
     def _call_vertex_ai(self, prompt: str) -> Optional[str]:
-        """Call Vertex AI Gemini model."""
+        """Call Vertex AI Gemini model, reusing cached completions for repeated prompts."""
         try:
-            from vertexai.generative_models import GenerativeModel
-            
-            model = GenerativeModel(self.model_name)
-            response = model.generate_content(prompt)
-            
-            if response and response.text:
-                return response.text.strip()
-            
-            return None
+            return cached_completion(self.model_name, prompt, self._gen)
             
         except Exception as e:
             logger.error(f"Error calling Vertex AI: {e}")
@@ -1098,14 +1099,12 @@ Provide enhancements in JSON format:
     def _parse_enhancement_response(self, response: str) -> Dict[str, Any]:
         """Parse AI enhancement response."""
         try:
-            import json
-            
             start = response.find('{')
             end = response.rfind('}') + 1
             
             if start != -1 and end != 0:
                 json_str = response[start:end]
-                return json.loads(json_str)
+                return orjson.loads(json_str)
             
             return {}
             
@@ -1158,30 +1157,26 @@ Provide enhancements in JSON format:
     
     def _create_itinerary_summary(self, itinerary: Itinerary) -> Dict[str, Any]:
         """Create a comprehensive summary of the itinerary."""
-        total_activities = sum(len(day.items) for day in itinerary.days)
+        total_activities = itinerary.activity_count
         destination = itinerary.trip_request.destination
         
-        # Calculate total estimated time
-        total_time_minutes = 0
-        for day in itinerary.days:
-            for item in day.items:
-                total_time_minutes += item.estimated_duration
+        # Per-day activity time, scanned once and reused for the breakdown
+        day_minutes = [sum(item.estimated_duration for item in day.items) for day in itinerary.days]
+        total_time_minutes = sum(day_minutes)
         
         total_hours = total_time_minutes // 60
         
         summary = {
             "destination": destination,
             "duration_days": len(itinerary.days),
-            "total_cost": self._format_currency(itinerary.total_cost, destination),
+            "total_cost": self._format_currency(to_display(itinerary.total_cost), destination),
             "total_activities": total_activities,
             "total_estimated_time": f"{total_hours}h {total_time_minutes % 60}m",
             "average_activities_per_day": round(total_activities / len(itinerary.days), 1),
             "daily_breakdown": []
         }
         
-        for day in itinerary.days:
-            # Calculate day's total time
-            day_time_minutes = sum(item.estimated_duration for item in day.items)
+        for day, day_time_minutes in zip(itinerary.days, day_minutes):
             day_hours = day_time_minutes // 60
             
             # Get time range for the day
@@ -1201,7 +1196,7 @@ Provide enhancements in JSON format:
                 "day": day.day,
                 "date": day.date.isoformat(),
                 "activities": len(day.items),
-                "estimated_cost": self._format_currency(day.total_estimated_cost, destination),
+                "estimated_cost": self._format_currency(to_display(day.total_estimated_cost), destination),
                 "total_time": f"{day_hours}h {day_time_minutes % 60}m",
                 "time_range": time_range,
                 "weather": day.weather.condition.value if day.weather and hasattr(day.weather.condition, 'value') else (day.weather.condition if day.weather else None),
@@ -1219,9 +1214,9 @@ Provide enhancements in JSON format:
     ) -> Dict[str, Any]:
         """Create summary of optimization changes."""
         return {
-            "original_cost": float(original.total_cost),
-            "optimized_cost": float(optimized.total_cost),
-            "cost_difference": float(optimized.total_cost - original.total_cost),
+            "original_cost": to_display(original.total_cost),
+            "optimized_cost": to_display(optimized.total_cost),
+            "cost_difference": to_display(optimized.total_cost - original.total_cost),
             "route_optimized": True,
             "version_change": f"{original.version} -> {optimized.version}"
         }
\ No newline at end of file
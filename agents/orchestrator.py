@@ -5,17 +5,21 @@ This agent coordinates the entire trip planning workflow by managing
 and calling other specialized agents in the correct sequence.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple, Callable, AsyncIterator, Union
 import uuid
 from adk import LlmAgent
 from google.cloud import aiplatform
+from vertexai.generative_models import GenerativeModel
 
 from schemas import (
     TripRequest, Itinerary, SessionData, AgentResponse,
-    POI, WeatherInfo, BookingBasket
+    POI, WeatherInfo, BookingBasket, POI_LIST_ADAPTER, WEATHER_LIST_ADAPTER, to_display, utc_now
 )
+from agents.completion_cache import cached_completion
 from agents.user_intent import UserIntentAgent
 from agents.place_finder import PlaceFinderAgent
 from agents.weather import WeatherAgent
@@ -40,23 +44,33 @@ class OrchestratorAgent(LlmAgent):
         # Initialize Vertex AI
         aiplatform.init(
             project=vertex_config["project_id"],
-            location=vertex_config["location"]
+            location=vertex_config["location"],
+            credentials=vertex_config.get("credentials")
         )
         
+        # Build the Gemini model once (model name is fixed per agent)
+        self._gen_model = GenerativeModel(self.model_name)
+        self._gen = self._gen_model.generate_content
+        
         # Initialize sub-agents
         self.user_intent_agent = UserIntentAgent(vertex_config)
         self.place_finder_agent = PlaceFinderAgent(vertex_config)
         self.weather_agent = WeatherAgent(vertex_config)
         self.itinerary_planner_agent = ItineraryPlannerAgent(vertex_config)
         
-        logger.info("Orchestrator Agent initialized")
+        # Shared pool for running independent sub-agents side by side
+        self._step_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="orchestrator-step")
+        
+        logger.debug("Orchestrator Agent initialized")
     
     def plan_trip(
         self,
         user_input: str,
         session_id: Optional[str] = None,
         user_id: Optional[str] = None,
-        tools: Optional[Dict[str, Any]] = None
+        tools: Optional[Dict[str, Any]] = None,
+        progress: Optional[Callable[[str], None]] = None,
+        parallel: bool = True
     ) -> AgentResponse:
         """
         Execute the complete trip planning workflow.
@@ -66,6 +80,8 @@ class OrchestratorAgent(LlmAgent):
             session_id: Session identifier
             user_id: User identifier
             tools: Dictionary of tool instances
+            progress: Optional callback receiving a user-facing message as each step starts
+            parallel: Run the independent place and weather lookups concurrently
             
         Returns:
             AgentResponse with complete trip plan
@@ -82,6 +98,8 @@ class OrchestratorAgent(LlmAgent):
             
             # Step 1: Analyze user intent and extract trip requirements
             logger.info(f"Step 1: Analyzing user intent for session {session_id}")
+            if progress:
+                progress("🔍 Understanding your trip requirements...")
             
             # Get accumulated context from previous conversation
             accumulated_context = self._build_accumulated_context(session_data)
@@ -105,14 +123,16 @@ class OrchestratorAgent(LlmAgent):
             session_data.agent_context['validation_status'] = validation
             
             if not validation["is_complete"]:
-                # Save session data with partial trip information
-                if tools and "firestore" in tools:
-                    tools["firestore"].save_session(session_data)
-                
                 # Generate clarifying questions based on what's still missing
                 questions = self.user_intent_agent.generate_clarifying_questions(trip_data)
+                session_data.agent_context['clarifying_questions'] = questions
+                
+                # Save session data with partial trip information and the questions,
+                # so a plan requested through the job queue can show them later
+                if tools and "firestore" in tools:
+                    tools["firestore"].save_session(session_data)
                 
-                return AgentResponse(
+                return AgentResponse.from_trusted(
                     agent_name=self.name,
                     success=False,
                     data={
@@ -133,22 +153,25 @@ class OrchestratorAgent(LlmAgent):
             
             session_data.trip_request = trip_request
             
-            # Step 2: Find places of interest
+            # Steps 2 & 3: Find places of interest and get weather information
             logger.info(f"Step 2: Finding places for {trip_request.destination}")
-            places_response = self._find_places(trip_request, tools)
+            if progress:
+                progress(f"🧭 Finding places in {trip_request.destination}...")
+            logger.info(f"Step 3: Getting weather forecast for {trip_request.destination}")
+            if progress:
+                progress("🌤️ Checking the weather forecast...")
+            places_response, weather_response = self._find_places_and_weather(
+                trip_request, tools, parallel
+            )
             
             if not places_response.success:
                 return self._create_error_response("Failed to find places", places_response.error)
             
-            pois = [POI(**poi_data) for poi_data in places_response.data["places"]]
-            
-            # Step 3: Get weather information
-            logger.info(f"Step 3: Getting weather forecast for {trip_request.destination}")
-            weather_response = self._get_weather_info(trip_request, tools)
+            pois = POI_LIST_ADAPTER.validate_python(places_response.data["places"])
             
             weather_data = []
             if weather_response.success:
-                weather_data = [WeatherInfo(**w) for w in weather_response.data["weather_forecast"]]
+                weather_data = WEATHER_LIST_ADAPTER.validate_python(weather_response.data["weather_forecast"])
             
             # Step 4: Filter and rank places based on weather
             if weather_data:
@@ -159,6 +182,8 @@ class OrchestratorAgent(LlmAgent):
             
             # Step 5: Create itinerary
             logger.info("Step 5: Creating itinerary")
+            if progress:
+                progress("🗓️ Building your day-by-day itinerary...")
             itinerary_response = self._create_itinerary(
                 trip_request, 
                 weather_filtered_pois, 
@@ -236,10 +261,134 @@ class OrchestratorAgent(LlmAgent):
             logger.error(f"Error refining itinerary: {e}")
             return self._create_error_response("Failed to refine itinerary", str(e))
     
+    async def aplan_trip(
+        self,
+        user_input: str,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        tools: Optional[Dict[str, Any]] = None,
+        parallel: bool = True
+    ) -> AgentResponse:
+        """
+        Async variant of plan_trip.
+        
+        The Vertex AI, Maps, BigQuery and Firestore clients are all blocking,
+        so the workflow runs in a worker thread to keep the event loop free
+        for other sessions.
+        """
+        return await asyncio.to_thread(
+            self.plan_trip,
+            user_input=user_input,
+            session_id=session_id,
+            user_id=user_id,
+            tools=tools,
+            parallel=parallel
+        )
+    
+    async def aplan_trip_stream(
+        self,
+        user_input: str,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        tools: Optional[Dict[str, Any]] = None,
+        parallel: bool = True
+    ) -> AsyncIterator[Union[str, AgentResponse]]:
+        """
+        Streaming variant of plan_trip.
+        
+        Yields a progress message as each workflow step starts and the final
+        AgentResponse as the last item, so callers can show feedback before
+        the whole multi-agent run has finished.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        
+        def report(message: str) -> None:
+            loop.call_soon_threadsafe(events.put_nowait, message)
+        
+        def run() -> None:
+            try:
+                response = self.plan_trip(
+                    user_input=user_input,
+                    session_id=session_id,
+                    user_id=user_id,
+                    tools=tools,
+                    progress=report,
+                    parallel=parallel
+                )
+            except Exception as e:
+                logger.error(f"Error in streamed trip planning workflow: {e}")
+                response = self._create_error_response("Trip planning workflow failed", str(e))
+            loop.call_soon_threadsafe(events.put_nowait, response)
+        
+        worker = loop.run_in_executor(None, run)
+        
+        while True:
+            event = await events.get()
+            yield event
+            if isinstance(event, AgentResponse):
+                break
+        
+        await worker
+    
+    async def arefine_itinerary(
+        self,
+        session_id: str,
+        user_feedback: str,
+        tools: Optional[Dict[str, Any]] = None
+    ) -> AgentResponse:
+        """Async variant of refine_itinerary (runs in a worker thread)."""
+        return await asyncio.to_thread(
+            self.refine_itinerary,
+            session_id=session_id,
+            user_feedback=user_feedback,
+            tools=tools
+        )
+    
+    def _find_places_and_weather(
+        self,
+        trip_request: TripRequest,
+        tools: Optional[Dict[str, Any]],
+        parallel: bool = True
+    ) -> Tuple[AgentResponse, AgentResponse]:
+        """
+        Run the place finder and weather agents for the trip.
+        
+        Both only depend on the trip request, so by default they are
+        dispatched side by side and the step costs the slower of the two
+        lookups rather than their sum.
+        
+        Args:
+            trip_request: Validated trip request
+            tools: Dictionary of tool instances
+            parallel: Run both agents concurrently instead of one after the other
+            
+        Returns:
+            Tuple of (places_response, weather_response)
+        """
+        if not parallel:
+            return self._find_places(trip_request, tools), self._get_weather_info(trip_request, tools)
+        
+        places_future = self._step_pool.submit(self._find_places, trip_request, tools)
+        weather_future = self._step_pool.submit(self._get_weather_info, trip_request, tools)
+        
+        try:
+            weather_response = weather_future.result()
+        except Exception as e:
+            # Weather is optional, so a failed lookup must not sink the plan
+            logger.error(f"Error getting weather information: {e}")
+            weather_response = AgentResponse.from_trusted(
+                agent_name=self.name,
+                success=False,
+                error=str(e)
+            )
+        
+        return places_future.result(), weather_response
+    
     def _find_places(self, trip_request: TripRequest, tools: Optional[Dict[str, Any]]) -> AgentResponse:
         """Find places of interest for the trip."""
         if not tools or "maps" not in tools or "bigquery" not in tools:
-            return AgentResponse(
+            return AgentResponse.from_trusted(
                 agent_name=self.name,
                 success=False,
                 error="Required tools not available"
@@ -255,7 +404,7 @@ class OrchestratorAgent(LlmAgent):
         """Get weather information for the trip."""
         if not tools or "weather" not in tools:
             # Weather is optional, return empty response
-            return AgentResponse(
+            return AgentResponse.from_trusted(
                 agent_name=self.name,
                 success=False,
                 error="Weather tool not available"
@@ -320,15 +469,17 @@ class OrchestratorAgent(LlmAgent):
     ) -> AgentResponse:
         """Generate the final response with complete trip plan."""
         try:
+            activity_count = itinerary.activity_count
+            
             # Create comprehensive response
             response_data = {
-                "itinerary": itinerary.dict(),
+                "itinerary": itinerary.to_response_dict(),
                 "session_id": session_data.session_id,
                 "trip_summary": {
                     "destination": itinerary.trip_request.destination,
                     "duration": len(itinerary.days),
-                    "total_cost": float(itinerary.total_cost),
-                    "activities_count": sum(len(day.items) for day in itinerary.days),
+                    "total_cost": to_display(itinerary.total_cost),
+                    "activities_count": activity_count,
                     "group_type": itinerary.trip_request.group_type.value,
                     "budget_range": itinerary.trip_request.budget_range.value
                 }
@@ -344,10 +495,10 @@ class OrchestratorAgent(LlmAgent):
             
             # Create success message
             message = f"✈️ Your {len(itinerary.days)}-day trip to {itinerary.trip_request.destination} is ready! "
-            message += f"We've planned {sum(len(day.items) for day in itinerary.days)} amazing activities "
-            message += f"with an estimated total cost of ${itinerary.total_cost:.2f}."
+            message += f"We've planned {activity_count} amazing activities "
+            message += f"with an estimated total cost of ${to_display(itinerary.total_cost):.2f}."
             
-            return AgentResponse(
+            return AgentResponse.from_trusted(
                 agent_name=self.name,
                 success=True,
                 data=response_data,
@@ -390,10 +541,10 @@ class OrchestratorAgent(LlmAgent):
         itinerary_summary += f"Duration: {len(itinerary.days)} days\n"
         itinerary_summary += f"Budget: {itinerary.trip_request.budget_range.value}\n"
         itinerary_summary += f"Group: {itinerary.trip_request.group_type.value}\n"
-        itinerary_summary += f"Total Cost: ${itinerary.total_cost}\n\n"
+        itinerary_summary += f"Total Cost: ${to_display(itinerary.total_cost):.2f}\n\n"
         
         for day in itinerary.days:
-            itinerary_summary += f"Day {day.day}: {len(day.items)} activities, ${day.total_estimated_cost} cost\n"
+            itinerary_summary += f"Day {day.day}: {len(day.items)} activities, ${to_display(day.total_estimated_cost):.2f} cost\n"
         
         weather_summary = ""
         if weather_data:
@@ -419,17 +570,9 @@ Provide insights in JSON format:
         return prompt
     
     def _call_vertex_ai(self, prompt: str) -> Optional[str]:
-        """Call Vertex AI Gemini model."""
+        """Call Vertex AI Gemini model, reusing cached completions for repeated prompts."""
         try:
-            from vertexai.generative_models import GenerativeModel
-            
-            model = GenerativeModel(self.model_name)
-            response = model.generate_content(prompt)
-            
-            if response and response.text:
-                return response.text.strip()
-            
-            return None
+            return cached_completion(self.model_name, prompt, self._gen)
             
         except Exception as e:
             logger.error(f"Error calling Vertex AI: {e}")
@@ -438,14 +581,12 @@ Provide insights in JSON format:
     def _parse_insights_response(self, response: str) -> Dict[str, Any]:
         """Parse AI insights response."""
         try:
-            import json
-            
             start = response.find('{')
             end = response.rfind('}') + 1
             
             if start != -1 and end != 0:
                 json_str = response[start:end]
-                return json.loads(json_str)
+                return orjson.loads(json_str)
             
             return {}
             
@@ -461,7 +602,7 @@ Provide insights in JSON format:
                 f"{len(itinerary.days)}-day adventure",
                 "Mix of cultural and recreational activities"
             ],
-            "budget_analysis": f"Total estimated cost of ${itinerary.total_cost} for {itinerary.trip_request.number_of_travelers} travelers",
+            "budget_analysis": f"Total estimated cost of ${to_display(itinerary.total_cost):.2f} for {itinerary.trip_request.number_of_travelers} travelers",
             "timing_recommendations": ["Allow flexibility for spontaneous discoveries", "Consider local meal times"],
             "local_tips": ["Research local customs", "Learn basic local phrases"],
             "optimization_suggestions": ["Book popular attractions in advance", "Keep backup indoor activities"],
@@ -492,7 +633,7 @@ Provide insights in JSON format:
         """Modify places in the itinerary based on feedback."""
         # This would involve re-running place finding with modified criteria
         # For now, return a placeholder response
-        return AgentResponse(
+        return AgentResponse.from_trusted(
             agent_name=self.name,
             success=True,
             message="Place modifications not yet implemented",
@@ -507,7 +648,7 @@ Provide insights in JSON format:
     ) -> AgentResponse:
         """Modify schedule in the itinerary based on feedback."""
         # This would involve re-arranging times and activities
-        return AgentResponse(
+        return AgentResponse.from_trusted(
             agent_name=self.name,
             success=True,
             message="Schedule modifications not yet implemented",
@@ -522,7 +663,7 @@ Provide insights in JSON format:
     ) -> AgentResponse:
         """Adjust budget and activities based on feedback."""
         # This would involve filtering activities by price
-        return AgentResponse(
+        return AgentResponse.from_trusted(
             agent_name=self.name,
             success=True,
             message="Budget adjustments not yet implemented",
@@ -541,16 +682,16 @@ Provide insights in JSON format:
                 maps_tool
             )
         else:
-            return AgentResponse(
+            return AgentResponse.from_trusted(
                 agent_name=self.name,
                 success=True,
                 message="Optimization requires Maps API access",
-                data={"current_itinerary": session_data.current_itinerary.dict()}
+                data={"current_itinerary": session_data.current_itinerary.to_response_dict()}
             )
     
     def _create_error_response(self, message: str, error: str) -> AgentResponse:
         """Create a standardized error response."""
-        return AgentResponse(
+        return AgentResponse.from_trusted(
             agent_name=self.name,
             success=False,
             message=message,
@@ -576,25 +717,25 @@ Provide insights in JSON format:
         
         if existing_session:
             # Add current user input to conversation history
-            existing_session.conversation_history.append({
-                "timestamp": datetime.utcnow().isoformat(),
+            existing_session.add_turn({
+                "timestamp": utc_now().isoformat(),
                 "user_input": user_input,
                 "agent": "user"
             })
             
             # Update last activity
-            existing_session.last_activity = datetime.utcnow()
+            existing_session.last_activity = utc_now()
             
             logger.info(f"Retrieved existing session {session_id} with {len(existing_session.conversation_history)} messages")
             return existing_session
         else:
             # Create new session data
             logger.info(f"Creating new session data for {session_id}")
-            return SessionData(
+            return SessionData.from_trusted(
                 session_id=session_id,
                 user_id=user_id,
                 conversation_history=[{
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": utc_now().isoformat(),
                     "user_input": user_input,
                     "agent": "user"
                 }]
@@ -611,6 +752,10 @@ Provide insights in JSON format:
                 if msg.get("agent") == "user"
             ]
             context["conversation_history"] = user_messages
+            
+            # Earlier turns that were trimmed from the history still inform intent
+            if session_data.conversation_summary:
+                user_messages = [session_data.conversation_summary, *user_messages]
             context["accumulated_user_input"] = " ".join(user_messages)
         
         # Include partial trip data if available
@@ -659,8 +804,8 @@ Provide insights in JSON format:
             status_data = {
                 "session_id": session_id,
                 "user_id": session_data.user_id,
-                "created_at": session_data.created_at.isoformat(),
-                "last_activity": session_data.last_activity.isoformat(),
+                "created_at": session_data.created_at.isoformat() if session_data.created_at else None,
+                "last_activity": session_data.last_activity.isoformat() if session_data.last_activity else None,
                 "is_active": session_data.is_active,
                 "has_trip_request": session_data.trip_request is not None,
                 "has_itinerary": session_data.current_itinerary is not None,
@@ -677,12 +822,12 @@ Provide insights in JSON format:
             
             if session_data.current_itinerary:
                 status_data["itinerary_summary"] = {
-                    "total_cost": float(session_data.current_itinerary.total_cost),
-                    "total_activities": sum(len(day.items) for day in session_data.current_itinerary.days),
+                    "total_cost": to_display(session_data.current_itinerary.total_cost),
+                    "total_activities": session_data.current_itinerary.activity_count,
                     "version": session_data.current_itinerary.version
                 }
             
-            return AgentResponse(
+            return AgentResponse.from_trusted(
                 agent_name=self.name,
                 success=True,
                 data=status_data,
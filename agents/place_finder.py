@@ -9,8 +9,10 @@ import logging
 from typing import Dict, Any, Optional, List
 from adk import LlmAgent
 from google.cloud import aiplatform
+from vertexai.generative_models import GenerativeModel
 
 from schemas import POI, POICategory, TripRequest, AgentResponse, Coordinates, Address
+from agents.completion_cache import cached_completion
 from tools import MapsApiTool, BigQueryTool
 
 logger = logging.getLogger(__name__)
@@ -31,10 +33,15 @@ class PlaceFinderAgent(LlmAgent):
         # Initialize Vertex AI
         aiplatform.init(
             project=vertex_config["project_id"],
-            location=vertex_config["location"]
+            location=vertex_config["location"],
+            credentials=vertex_config.get("credentials")
         )
         
-        logger.info("Place Finder Agent initialized")
+        # Build the Gemini model once (model name is fixed per agent)
+        self._gen_model = GenerativeModel(self.model_name)
+        self._gen = self._gen_model.generate_content
+        
+        logger.debug("Place Finder Agent initialized")
     
     def find_places(
         self,
@@ -89,7 +96,7 @@ class PlaceFinderAgent(LlmAgent):
                 agent_name=self.name,
                 success=True,
                 data={
-                    "places": [poi.dict() for poi in enhanced_pois],
+                    "places": [poi.model_dump() for poi in enhanced_pois],
                     "total_found": len(enhanced_pois),
                     "search_radius": radius,
                     "destination": trip_request.destination
@@ -559,17 +566,9 @@ Return only the ranking as numbers separated by commas (e.g., "3,1,7,2,5,4,6").
         return prompt
     
     def _call_vertex_ai(self, prompt: str) -> Optional[str]:
-        """Call Vertex AI Gemini model."""
+        """Call Vertex AI Gemini model, reusing cached completions for repeated prompts."""
         try:
-            from vertexai.generative_models import GenerativeModel
-            
-            model = GenerativeModel(self.model_name)
-            response = model.generate_content(prompt)
-            
-            if response and response.text:
-                return response.text.strip()
-            
-            return None
+            return cached_completion(self.model_name, prompt, self._gen)
             
         except Exception as e:
             logger.error(f"Error calling Vertex AI: {e}")
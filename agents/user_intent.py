@@ -6,11 +6,14 @@ trip requirements and preferences.
 """
 
 import logging
+import orjson
 from typing import Dict, Any, Optional, List
 from adk import LlmAgent
 from google.cloud import aiplatform
+from vertexai.generative_models import GenerativeModel
 
 from schemas import TripRequest, GroupType, BudgetRange, AgentResponse
+from agents.completion_cache import cached_completion
 
 logger = logging.getLogger(__name__)
 
@@ -30,10 +33,15 @@ class UserIntentAgent(LlmAgent):
         # Initialize Vertex AI
         aiplatform.init(
             project=vertex_config["project_id"],
-            location=vertex_config["location"]
+            location=vertex_config["location"],
+            credentials=vertex_config.get("credentials")
         )
         
-        logger.info("User Intent Agent initialized")
+        # Build the Gemini model once (model name is fixed per agent)
+        self._gen_model = GenerativeModel(self.model_name)
+        self._gen = self._gen_model.generate_content
+        
+        logger.debug("User Intent Agent initialized")
     
     def analyze_user_input(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> AgentResponse:
         """
@@ -229,17 +237,9 @@ Examples of combining information:
         return prompt
     
     def _call_vertex_ai(self, prompt: str) -> Optional[str]:
-        """Call Vertex AI Gemini model."""
+        """Call Vertex AI Gemini model, reusing cached completions for repeated prompts."""
         try:
-            from vertexai.generative_models import GenerativeModel
-            
-            model = GenerativeModel(self.model_name)
-            response = model.generate_content(prompt)
-            
-            if response and response.text:
-                return response.text.strip()
-            
-            return None
+            return cached_completion(self.model_name, prompt, self._gen)
             
         except Exception as e:
             logger.error(f"Error calling Vertex AI: {e}")
@@ -248,21 +248,19 @@ Examples of combining information:
     def _parse_intent_response(self, response: str) -> Dict[str, Any]:
         """Parse the Gemini response to extract structured data."""
         try:
-            import json
-            
             # Try to extract JSON from the response
             start = response.find('{')
             end = response.rfind('}') + 1
             
             if start != -1 and end != 0:
                 json_str = response[start:end]
-                data = json.loads(json_str)
+                data = orjson.loads(json_str)
                 return data
             else:
                 logger.error("No valid JSON found in response")
                 return {}
                 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Error parsing JSON response: {e}")
             return {}
         except Exception as e:
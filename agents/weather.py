@@ -6,12 +6,15 @@ for trip activities based on weather forecasts.
 """
 
 import logging
+import orjson
 from typing import Dict, Any, Optional, List
 from datetime import date, timedelta
 from adk import LlmAgent
 from google.cloud import aiplatform
+from vertexai.generative_models import GenerativeModel
 
 from schemas import WeatherInfo, POI, TripRequest, AgentResponse
+from agents.completion_cache import cached_completion
 from tools import WeatherApiTool
 
 logger = logging.getLogger(__name__)
@@ -32,10 +35,15 @@ class WeatherAgent(LlmAgent):
         # Initialize Vertex AI
         aiplatform.init(
             project=vertex_config["project_id"],
-            location=vertex_config["location"]
+            location=vertex_config["location"],
+            credentials=vertex_config.get("credentials")
         )
         
-        logger.info("Weather Agent initialized")
+        # Build the Gemini model once (model name is fixed per agent)
+        self._gen_model = GenerativeModel(self.model_name)
+        self._gen = self._gen_model.generate_content
+        
+        logger.debug("Weather Agent initialized")
     
     def analyze_weather_for_trip(
         self,
@@ -80,7 +88,7 @@ class WeatherAgent(LlmAgent):
                 agent_name=self.name,
                 success=True,
                 data={
-                    "weather_forecast": [w.dict() for w in weather_data],
+                    "weather_forecast": [w.model_dump() for w in weather_data],
                     "weather_analysis": weather_analysis,
                     "ai_recommendations": ai_recommendations,
                     "suitable_days": weather_analysis.get("suitable_days", 0),
@@ -249,17 +257,9 @@ Provide recommendations in JSON format:
         return prompt
     
     def _call_vertex_ai(self, prompt: str) -> Optional[str]:
-        """Call Vertex AI Gemini model."""
+        """Call Vertex AI Gemini model, reusing cached completions for repeated prompts."""
         try:
-            from vertexai.generative_models import GenerativeModel
-            
-            model = GenerativeModel(self.model_name)
-            response = model.generate_content(prompt)
-            
-            if response and response.text:
-                return response.text.strip()
-            
-            return None
+            return cached_completion(self.model_name, prompt, self._gen)
             
         except Exception as e:
             logger.error(f"Error calling Vertex AI: {e}")
@@ -268,15 +268,13 @@ Provide recommendations in JSON format:
     def _parse_weather_recommendations(self, response: str) -> Dict[str, Any]:
         """Parse AI weather recommendations response."""
         try:
-            import json
-            
             # Extract JSON from response
             start = response.find('{')
             end = response.rfind('}') + 1
             
             if start != -1 and end != 0:
                 json_str = response[start:end]
-                recommendations = json.loads(json_str)
+                recommendations = orjson.loads(json_str)
                 return recommendations
             
             return {}
@@ -6,13 +6,35 @@ using Google's Agent Development Kit (ADK).
 """
 
 import os
+import re
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+import functools
+import threading
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Callable, Tuple, AsyncIterator, Protocol
 from adk import AdkApp, Session, Tool, Agent
 from dotenv import load_dotenv
+import google.auth
+import google.auth.transport.requests
+from cachetools import LRUCache, TTLCache
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pythonjsonlogger.json import JsonFormatter
+
+
+@functools.lru_cache(maxsize=1)
+def _env_snapshot() -> Dict[str, str]:
+    """
+    Load the .env file and snapshot the environment, once per process.
+    
+    Call _env_snapshot.cache_clear() to pick up environment changes.
+    """
+    load_dotenv()
+    return dict(os.environ)
 
-# Load environment variables from .env file
-load_dotenv()
 
 # Import our core agents
 from agents.orchestrator import OrchestratorAgent
@@ -25,17 +47,191 @@ from agents.itinerary_planner import ItineraryPlannerAgent
 from tools.maps_api import MapsApiTool
 from tools.weather_api import WeatherApiTool
 from tools.bigquery_tool import BigQueryTool
-from tools.firestore_tool import FirestoreTool
+from tools.firestore_tool import FirestoreTool, SessionWriteBuffer
 from tools.payment_tool import PaymentTool
+from tools.job_queue_tool import JobQueueTool
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from schemas import SessionData, to_display
+
+# Configure logging (LOG_FORMAT=json emits structured records for Cloud Logging)
+_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+if _env_snapshot().get("LOG_FORMAT", "text").lower() == "json":
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(JsonFormatter(
+        '%(asctime)s %(name)s %(levelname)s %(message)s',
+        rename_fields={"levelname": "severity"}
+    ))
+    logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
+else:
+    logging.basicConfig(level=logging.INFO, format=_LOG_FORMAT)
 logger = logging.getLogger(__name__)
 
 
+# Keywords that mark a message as a refinement of an existing itinerary.
+# Verbs list their inflections explicitly so "changes" or "removing" match
+# but words that merely start with a keyword ("address", "laterally") don't.
+_REFINE_RE = re.compile(
+    r"\b(?:chang(?:e|es|ed|ing)|modif(?:y|ies|ied|ying)|different|instead|replac(?:e|es|ed|ing)"
+    r"|earlier|later|cheaper|expensive|add(?:s|ed|ing)?|remov(?:e|es|ed|ing))\b",
+    re.IGNORECASE
+)
+
+GCP_SCOPES = ("https://www.googleapis.com/auth/cloud-platform",)
+
+# Number of recent sessions listed in a user's session summary
+RECENT_SESSIONS_SHOWN = 5
+
+# Bounds, in seconds, of the job worker's backoff while Redis is unreachable
+JOB_WORKER_BACKOFF_MIN = 1.0
+JOB_WORKER_BACKOFF_MAX = 30.0
+
+# Planner errors caused by the request itself; retrying the job can't change them
+JOB_FINAL_ERRORS = frozenset({"Incomplete trip requirements", "Invalid trip data"})
+
+# Display templates for trip details collected while asking clarifying questions
+_PARTIAL_FIELD_TEMPLATES = {
+    "destination": "📍 Destination: {}\n",
+    "start_date": "📅 Start Date: {}\n",
+    "duration_days": "⏰ Duration: {} days\n",
+    "number_of_travelers": "👥 Travelers: {}\n",
+    "budget_range": "💰 Budget: {}\n",
+    "group_type": "👨‍👩‍👧‍👦 Group Type: {}\n",
+    "interests": "🎯 Interests: {}\n"
+}
+
+
+class SessionLike(Protocol):
+    """Anything the app accepts as a session: ADK sessions and UI wrappers alike."""
+    id: str
+    user_id: Optional[str]
+
+
+class LazyRegistry(MutableMapping):
+    """
+    Dict-like registry of tools or agents that builds each entry on first access.
+    
+    Entries are declared as zero-argument factories and only constructed
+    (opening their client connections) when looked up, so a request pays for
+    the components it actually uses. Membership and len() cover declared
+    entries without constructing them.
+    """
+    
+    def __init__(
+        self,
+        factories: Dict[str, Callable[[], Any]],
+        kind: str,
+        errors: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize the registry.
+        
+        Args:
+            factories: Mapping of component name to zero-argument constructor
+            kind: Component kind used in log messages ("tool" or "agent")
+            errors: Optional dict collecting construction failures, keyed "kind:name"
+        """
+        self._factories = dict(factories)
+        self._instances: Dict[str, Any] = {}
+        self._locks = {name: threading.Lock() for name in factories}
+        self._kind = kind
+        self.errors = errors if errors is not None else {}
+    
+    def __getitem__(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        if name not in self._factories:
+            raise KeyError(name)
+        
+        with self._locks[name]:
+            if name in self._instances:
+                return self._instances[name]
+            
+            try:
+                instance = self._factories[name]()
+            except Exception as e:
+                # A failing constructor is logged, recorded and the entry
+                # dropped; other entries are unaffected
+                logger.error("Error initializing %s %s: %s", self._kind, name, e)
+                self.errors[f"{self._kind}:{name}"] = f"{type(e).__name__}: {e}"
+                self._factories.pop(name, None)
+                raise KeyError(name) from e
+            
+            self._instances[name] = instance
+            logger.debug("Initialized %s: %s", self._kind, name)
+        
+        return instance
+    
+    def __setitem__(self, name: str, value: Any) -> None:
+        self._instances[name] = value
+    
+    def __delitem__(self, name: str) -> None:
+        found = self._factories.pop(name, None) is not None
+        found = self._instances.pop(name, None) is not None or found
+        if not found:
+            raise KeyError(name)
+    
+    def __contains__(self, name: object) -> bool:
+        return name in self._instances or name in self._factories
+    
+    def __iter__(self):
+        yield from self._factories
+        yield from (name for name in list(self._instances) if name not in self._factories)
+    
+    def __len__(self) -> int:
+        return len(self._factories.keys() | self._instances.keys())
+    
+    def is_built(self, name: str) -> bool:
+        """Check whether an entry has been constructed yet."""
+        return name in self._instances
+
+
+@functools.lru_cache(maxsize=4)
+def _resolve_gcp_credentials(credentials_path: Optional[str]) -> Tuple[Any, Optional[str]]:
+    """
+    Resolve Application Default Credentials once per credentials source.
+    
+    google.auth.default() may shell out to gcloud and exchange tokens, so the
+    result is shared by every GCP-backed tool and agent. The cache is keyed on
+    GOOGLE_APPLICATION_CREDENTIALS so pointing it elsewhere re-resolves.
+    
+    Args:
+        credentials_path: Current value of GOOGLE_APPLICATION_CREDENTIALS
+        
+    Returns:
+        Tuple of (credentials, project_id); (None, None) if unavailable
+    """
+    try:
+        return google.auth.default(scopes=list(GCP_SCOPES))
+    except Exception as e:
+        logger.warning("Could not resolve Google Cloud credentials: %s", e)
+        return None, None
+
+
+def _create_http_session() -> requests.Session:
+    """
+    Create the pooled HTTP session shared by the HTTP-based tools.
+    
+    Reusing one session keeps TCP/TLS connections alive across calls instead
+    of reconnecting for every Maps or Stripe request.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=100,
+        max_retries=Retry(total=3, backoff_factor=0.2)
+    ))
+    return session
+
+
+def _mask_secret(value: Optional[str]) -> str:
+    """Mask a secret for logging, keeping only its last four characters."""
+    if not value:
+        return 'Not set'
+    # A suffix of a very short value would reveal most or all of it
+    return f"***{value[-4:]}" if len(value) >= 4 else '***'
+
+
 class TripPlannerApp(AdkApp):
     """Main ADK application for trip planning."""
     
@@ -49,190 +245,273 @@ class TripPlannerApp(AdkApp):
         # Configuration
         self.config = self._load_configuration()
         
-        # Initialize tools
-        self.tools = self._initialize_tools()
+        # Per-session "has itinerary" flag used for routing, so refinement
+        # checks don't need a Firestore read on every message
+        self._session_meta_cache = TTLCache(maxsize=10_000, ttl=60)
+        self._session_meta_lock = threading.Lock()
+        
+        # Per-user Firestore lookups (session listings, user info, latest
+        # session) for the sessions views, keyed by user then by lookup
+        self._user_cache = TTLCache(maxsize=1024, ttl=30)
+        self._user_cache_lock = threading.Lock()
+        
+        # Formatted session status, keyed by the session's Firestore version
+        # so a changed session never hits a stale entry
+        self._status_cache = LRUCache(maxsize=256)
+        self._status_cache_lock = threading.Lock()
         
-        # Initialize agents
-        self.agents = self._initialize_agents()
+        # Shared HTTP connection pool for Maps and Stripe
+        self._http = _create_http_session()
         
-        # Register everything with ADK
-        self._register_tools()
-        self._register_agents()
+        # Tools and agents open client connections, so each one is built on
+        # first use rather than at construction/import time. A component that
+        # fails to build is recorded in _init_errors and the rest still load.
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._init_errors: Dict[str, str] = {}
+        
+        # Build and warm the clients in the background so the first user
+        # request doesn't pay for client setup and the OAuth token exchange
+        self._warm = threading.Event()
+        if self.config["warm_start"]:
+            threading.Thread(target=self._warm_clients, name="client-warmup", daemon=True).start()
+        else:
+            self._warm.set()
+        
+        logger.info("Trip Planner ADK application created")
+    
+    def _ensure_initialized(self) -> None:
+        """Declare the lazily built tool and agent registries on first use."""
+        if self._initialized:
+            return
+        
+        with self._init_lock:
+            if self._initialized:
+                return
+            
+            # Declare tools and agents; the registries replace ADK's tool and
+            # agent dicts, so each entry is registered under its declared name
+            self.tools = LazyRegistry(self._initialize_tools(), "tool", errors=self._init_errors)
+            self.agents = LazyRegistry(self._initialize_agents(), "agent", errors=self._init_errors)
+            
+            self._initialized = True
+            logger.info("Trip Planner ADK application initialized")
+    
+    def _warm_clients(self) -> None:
+        """Build the components a request needs, then ping the Google Cloud clients."""
+        try:
+            self._ensure_initialized()
+            
+            credentials = self.config.get("_gcp_credentials")
+            if credentials is not None and not credentials.valid:
+                credentials.refresh(google.auth.transport.requests.Request())
+            
+            # Constructors each do their own auth handshake, so overlap them
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                executor.submit(self.agents.get, "orchestrator")
+                firestore_tool, bigquery_tool = executor.map(self.tools.get, ("firestore", "bigquery"))
+            
+            for tool in (firestore_tool, bigquery_tool):
+                if tool:
+                    tool.ping()
+            
+            logger.info("Client warm-up complete")
+            
+        except Exception as e:
+            logger.warning("Client warm-up failed: %s", e)
+        finally:
+            self._warm.set()
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the startup warm-up has finished.
         
-        logger.info("Trip Planner ADK application initialized")
+        Args:
+            timeout: Maximum number of seconds to wait (None waits indefinitely)
+            
+        Returns:
+            True if warm-up finished, False if the timeout expired first
+        """
+        return self._warm.wait(timeout)
     
     def _load_configuration(self) -> Dict[str, Any]:
         """Load configuration from environment variables."""
+        env = _env_snapshot()
         config = {
             # Google Cloud Configuration
-            "project_id": os.getenv("GOOGLE_CLOUD_PROJECT", "your-project-id"),
-            "location": os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
+            "project_id": env.get("GOOGLE_CLOUD_PROJECT", "your-project-id"),
+            "location": env.get("GOOGLE_CLOUD_LOCATION", "us-central1"),
             
-            # Vertex AI Configuration
+            # Vertex AI Configuration (project and location come from above)
             "vertex_ai": {
-                "project_id": os.getenv("GOOGLE_CLOUD_PROJECT", "your-project-id"),
-                "location": os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
-                "model": os.getenv("VERTEX_AI_MODEL", "gemini-1.5-pro")
+                "model": env.get("VERTEX_AI_MODEL", "gemini-1.5-pro")
             },
             
             # API Keys
-            "google_maps_api_key": os.getenv("GOOGLE_MAPS_API_KEY"),
-            "google_weather_api_key": os.getenv("GOOGLE_WEATHER_API_KEY"),
-            "stripe_api_key": os.getenv("STRIPE_API_KEY"),
+            "google_maps_api_key": env.get("GOOGLE_MAPS_API_KEY"),
+            "google_weather_api_key": env.get("GOOGLE_WEATHER_API_KEY"),
+            "stripe_api_key": env.get("STRIPE_API_KEY"),
             
             # BigQuery Configuration
             "bigquery": {
-                "dataset_id": os.getenv("BIGQUERY_DATASET_ID", "trip_planner"),
-                "location": os.getenv("BIGQUERY_LOCATION", "US")
+                "dataset_id": env.get("BIGQUERY_DATASET_ID", "trip_planner"),
+                "location": env.get("BIGQUERY_LOCATION", "US"),
+                "pool_size": int(env.get("BIGQUERY_POOL_SIZE", "20"))
             },
             
             # Firestore Configuration
             "firestore": {
-                "database": os.getenv("FIRESTORE_DATABASE", "(default)")
-            }
+                "database": env.get("FIRESTORE_DATABASE", "(default)")
+            },
+            
+            # Execution Configuration ("realtime" or "offline")
+            "execution_mode": env.get("EXECUTION_MODE", "realtime"),
+            "redis_url": env.get("REDIS_URL"),
+            
+            # Warm clients in the background at startup
+            "warm_start": env.get("WARM_START", "true").lower() == "true"
         }
         
+        # Resolve Google Cloud credentials once and share them with every client
+        credentials, _ = _resolve_gcp_credentials(env.get("GOOGLE_APPLICATION_CREDENTIALS"))
+        config["_gcp_credentials"] = credentials
+        
         # Debug: Print loaded configuration (without sensitive data)
-        logger.info(f"Loaded configuration:")
-        logger.info(f"  Project ID: {config['project_id']}")
-        logger.info(f"  Location: {config['location']}")
-        logger.info(f"  Maps API Key: {'***' + config['google_maps_api_key'][-4:] if config['google_maps_api_key'] else 'Not set'}")
-        logger.info(f"  Weather API Key: {'***' + config['google_weather_api_key'][-4:] if config['google_weather_api_key'] else 'Not set'}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Loaded configuration:")
+            logger.info("  Project ID: %s", config['project_id'])
+            logger.info("  Location: %s", config['location'])
+            logger.info("  Maps API Key: %s", _mask_secret(config['google_maps_api_key']))
+            logger.info("  Weather API Key: %s", _mask_secret(config['google_weather_api_key']))
         
         # Validate required configuration
         required_keys = ["google_maps_api_key", "google_weather_api_key"]
         missing_keys = [key for key in required_keys if not config.get(key)]
         
         if missing_keys:
-            logger.warning(f"Missing configuration for: {missing_keys}")
+            logger.warning("Missing configuration for: %s", missing_keys)
         
         return config
     
-    def _initialize_tools(self) -> Dict[str, Tool]:
-        """Initialize all tools for the application."""
-        tools = {}
+    @functools.cached_property
+    def vertex_config(self) -> Dict[str, Any]:
+        """Vertex AI settings passed to the agents, with the shared project, location and credentials."""
+        return {
+            "project_id": self.config["project_id"],
+            "location": self.config["location"],
+            "credentials": self.config["_gcp_credentials"],
+            **self.config["vertex_ai"]
+        }
+    
+    @functools.cached_property
+    def bigquery_config(self) -> Dict[str, Any]:
+        """BigQuery section of the configuration."""
+        return self.config["bigquery"]
+    
+    @functools.cached_property
+    def firestore_config(self) -> Dict[str, Any]:
+        """Firestore section of the configuration."""
+        return self.config["firestore"]
+    
+    @functools.cached_property
+    def _session_writes(self) -> SessionWriteBuffer:
+        """Batched Firestore writer for newly registered sessions."""
+        return SessionWriteBuffer(
+            self.tools["firestore"],
+            on_flushed=lambda sessions: [self._invalidate_user_cache(s.user_id) for s in sessions]
+        )
+    
+    def _initialize_tools(self) -> Dict[str, Callable[[], Tool]]:
+        """Declare constructors for all tools of the application."""
+        factories = {}
         
-        try:
-            # Maps API Tool
-            if self.config.get("google_maps_api_key"):
-                tools["maps"] = MapsApiTool(self.config["google_maps_api_key"])
-                logger.info("Maps API tool initialized")
-            else:
-                logger.warning("Maps API tool not initialized - missing API key")
-            
-            # Weather API Tool
-            if self.config.get("google_weather_api_key"):
-                tools["weather"] = WeatherApiTool(self.config["google_weather_api_key"])
-                logger.info("Weather API tool initialized")
-            else:
-                logger.warning("Weather API tool not initialized - missing API key")
-            
-            # BigQuery Tool
-            tools["bigquery"] = BigQueryTool(
-                project_id=self.config["project_id"],
-                dataset_id=self.config["bigquery"]["dataset_id"],
-                location=self.config["bigquery"]["location"]
-            )
-            logger.info("BigQuery tool initialized")
-            
-            # Firestore Tool
-            tools["firestore"] = FirestoreTool(
-                project_id=self.config["project_id"],
-                database=self.config["firestore"]["database"]
-            )
-            logger.info("Firestore tool initialized")
-            
-            # Payment Tool
-            if self.config.get("stripe_api_key"):
-                tools["payment"] = PaymentTool(self.config["stripe_api_key"])
-                logger.info("Payment tool initialized")
-            else:
-                logger.warning("Payment tool not initialized - missing API key")
-            
-        except Exception as e:
-            logger.error(f"Error initializing tools: {e}")
+        # Maps API Tool
+        if self.config.get("google_maps_api_key"):
+            factories["maps"] = lambda: MapsApiTool(self.config["google_maps_api_key"], http=self._http)
+        else:
+            logger.warning("Maps API tool not initialized - missing API key")
         
-        return tools
-    
-    def _initialize_agents(self) -> Dict[str, Agent]:
-        """Initialize all agents for the application."""
-        agents = {}
+        # Weather API Tool
+        if self.config.get("google_weather_api_key"):
+            factories["weather"] = lambda: WeatherApiTool(self.config["google_weather_api_key"])
+        else:
+            logger.warning("Weather API tool not initialized - missing API key")
         
-        try:
-            vertex_config = self.config["vertex_ai"]
-            
-            # Initialize our core agents
-            agents["orchestrator"] = OrchestratorAgent(vertex_config)
-            agents["user_intent"] = UserIntentAgent(vertex_config)
-            agents["place_finder"] = PlaceFinderAgent(vertex_config)
-            agents["weather"] = WeatherAgent(vertex_config)
-            agents["itinerary_planner"] = ItineraryPlannerAgent(vertex_config)
-            
-            logger.info(f"Initialized {len(agents)} agents")
-            
-        except Exception as e:
-            logger.error(f"Error initializing agents: {e}")
+        # BigQuery Tool
+        factories["bigquery"] = lambda: BigQueryTool(
+            project_id=self.config["project_id"],
+            dataset_id=self.bigquery_config["dataset_id"],
+            location=self.bigquery_config["location"],
+            credentials=self.config.get("_gcp_credentials"),
+            pool_size=self.bigquery_config["pool_size"]
+        )
         
-        return agents
-    
-    def _register_tools(self):
-        """Register tools with the ADK application."""
-        for tool_name in list(self.tools.keys()):
-            try:
-                tool_instance = self.tools[tool_name]
-                self.add_tool(tool_instance)
-                logger.info(f"Registered tool: {tool_name}")
-            except Exception as e:
-                logger.error(f"Error registering tool {tool_name}: {e}")
+        # Firestore Tool
+        factories["firestore"] = lambda: FirestoreTool(
+            project_id=self.config["project_id"],
+            database=self.firestore_config["database"],
+            credentials=self.config.get("_gcp_credentials")
+        )
+        
+        # Payment Tool
+        if self.config.get("stripe_api_key"):
+            factories["payment"] = lambda: PaymentTool(self.config["stripe_api_key"], http=self._http)
+        else:
+            logger.warning("Payment tool not initialized - missing API key")
+        
+        # Job Queue Tool (offline execution mode)
+        if self.config.get("redis_url"):
+            factories["job_queue"] = lambda: JobQueueTool(self.config["redis_url"])
+        
+        return factories
     
-    def _register_agents(self):
-        """Register agents with the ADK application."""
-        for agent_name in list(self.agents.keys()):
-            try:
-                agent_instance = self.agents[agent_name]
-                self.add_agent(agent_instance)
-                logger.info(f"Registered agent: {agent_name}")
-            except Exception as e:
-                logger.error(f"Error registering agent {agent_name}: {e}")
+    def _initialize_agents(self) -> Dict[str, Callable[[], Agent]]:
+        """Declare constructors for all agents of the application."""
+        vertex_config = self.vertex_config
+        
+        # Initialize our core agents
+        factories = {
+            "orchestrator": lambda: OrchestratorAgent(vertex_config),
+            "user_intent": lambda: UserIntentAgent(vertex_config),
+            "place_finder": lambda: PlaceFinderAgent(vertex_config),
+            "weather": lambda: WeatherAgent(vertex_config),
+            "itinerary_planner": lambda: ItineraryPlannerAgent(vertex_config),
+        }
+        
+        logger.info("Declared %s agents", len(factories))
+        
+        return factories
     
-    def ensure_session_registered(self, session: Session) -> Session:
+    def ensure_session_registered(self, session: SessionLike) -> SessionLike:
         """Ensure session is properly registered with the application."""
+        self._ensure_initialized()
+        session_id = session.id
+        
         # Register with app's session store
-        if hasattr(session, 'id') and session.id not in self.sessions:
-            self.sessions[session.id] = session
-            logger.info(f"Registered session {session.id} with application")
+        self.sessions.setdefault(session_id, session)
         
-        # Always try to save to Firestore for orchestrator compatibility
+        # Save to Firestore for orchestrator compatibility; the write buffer
+        # queues each session once (and again if its flush fails) and writes
+        # it in a batch off the request path
         firestore_tool = self.tools.get("firestore")
-        if firestore_tool and hasattr(session, 'id'):
+        if firestore_tool:
             try:
-                # Check if session already exists in Firestore
-                existing_session = firestore_tool.get_session(session.id)
-                if not existing_session:
-                    from schemas import SessionData
-                    from datetime import datetime
-                    
-                    # Create SessionData object for Firestore
-                    session_data = SessionData(
-                        session_id=session.id,
-                        user_id=getattr(session, 'user_id', 'unknown'),
-                        created_at=datetime.utcnow(),
-                        conversation_history=[]
-                    )
-                    
-                    # Save to Firestore
-                    result = firestore_tool.save_session(session_data)
-                    if result:
-                        logger.info(f"Saved session {session.id} to Firestore")
-                    else:
-                        logger.warning(f"Failed to save session {session.id} to Firestore")
+                # Create SessionData object for Firestore
+                session_data = SessionData.from_trusted(
+                    session_id=session_id,
+                    user_id=session.user_id,
+                    conversation_history=[]
+                )
+                
+                if self._session_writes.enqueue(session_data):
+                    logger.info("Registered session %s with application", session_id)
                     
             except Exception as e:
-                logger.warning(f"Failed to save session to Firestore: {e}")
+                logger.warning("Failed to queue session for Firestore: %s", e)
                     
         return session
     
-    async def process_user_input(self, user_input: str, session: Session) -> str:
+    async def process_user_input(self, user_input: str, session: SessionLike) -> str:
         """
         Process user input through the trip planning workflow.
         
@@ -243,204 +522,379 @@ class TripPlannerApp(AdkApp):
         Returns:
             Response message
         """
+        response = ""
+        async for chunk in self.process_user_input_stream(user_input, session):
+            response = chunk
+        return response
+    
+    async def process_user_input_stream(self, user_input: str, session: SessionLike) -> AsyncIterator[str]:
+        """
+        Process user input, yielding progress updates as the workflow runs.
+        
+        Args:
+            user_input: User's message/request
+            session: ADK session object
+            
+        Yields:
+            Progress messages while agents run; the formatted response is
+            always the last item
+        """
+        registration = None
         try:
-            # Ensure session is registered with the app
-            session = self.ensure_session_registered(session)
+            if not self._initialized:
+                await asyncio.to_thread(self._ensure_initialized)
             
-            # Get the orchestrator agent
-            orchestrator = self.agents.get("orchestrator")
+            # Register the session in the background; it isn't needed to
+            # answer this message, so it overlaps with the agent work below
+            registration = asyncio.create_task(asyncio.to_thread(self.ensure_session_registered, session))
+            
+            # Get the orchestrator agent (built on first use)
+            orchestrator = await asyncio.to_thread(self.agents.get, "orchestrator")
             if not orchestrator:
-                return "Trip planning system not available. Please try again later."
+                yield "Trip planning system not available. Please try again later."
+                return
             
             # Extract session information
-            session_id = session.id if hasattr(session, 'id') else None
-            user_id = session.user_id if hasattr(session, 'user_id') else None
+            session_id = session.id
+            user_id = session.user_id
             
             # Check if this is a refinement request (has existing session)
-            is_refinement = self._is_refinement_request(user_input, session_id)
+            is_refinement = await asyncio.to_thread(self._is_refinement_request, user_input, session_id)
             
             if is_refinement and session_id:
                 # Handle itinerary refinement
-                response = orchestrator.refine_itinerary(
+                response = await orchestrator.arefine_itinerary(
                     session_id=session_id,
                     user_feedback=user_input,
                     tools=self.tools
                 )
+            elif self._execution_mode(session) == "offline" and "job_queue" in self.tools:
+                # Queue the plan for a background worker and release the request
+                job_id = await self.tools["job_queue"].enqueue({
+                    "user_input": user_input,
+                    "session_id": session_id,
+                    "user_id": user_id
+                })
+                if job_id:
+                    yield f"🕒 Job queued: {job_id}\nYour trip plan is being prepared - check back with 'status' shortly."
+                    return
+                yield "I apologize, but I couldn't queue your trip plan. Please try again."
+                return
             else:
                 # Handle new trip planning request
-                response = orchestrator.plan_trip(
+                response = None
+                async for event in orchestrator.aplan_trip_stream(
                     user_input=user_input,
                     session_id=session_id,
                     user_id=user_id,
-                    tools=self.tools
-                )
+                    tools=self.tools,
+                    parallel=True
+                ):
+                    if isinstance(event, str):
+                        yield event
+                    else:
+                        response = event
+            
+            # Planning and refinement both rewrite the session's itinerary
+            self._invalidate_session_meta(session_id)
+            self._invalidate_user_cache(user_id)
             
             # Format response for user
-            return self._format_response(response)
+            yield self._format_response(response)
             
         except Exception as e:
-            logger.error(f"Error processing user input: {e}")
-            return "I apologize, but I encountered an error while planning your trip. Please try again."
+            logger.error("Error processing user input: %s", e)
+            yield "I apologize, but I encountered an error while planning your trip. Please try again."
+        finally:
+            if registration is not None:
+                await asyncio.gather(registration, return_exceptions=True)
+    
+    def _execution_mode(self, session: SessionLike) -> str:
+        """Get the execution mode for a session, falling back to the app default."""
+        default_mode = self.config.get("execution_mode", "realtime")
+        if isinstance(session, Session):
+            return session.get("execution_mode", default_mode)
+        return default_mode
+    
+    async def run_job_worker(self, consumer_name: str = "worker-1") -> None:
+        """
+        Consume queued offline planning jobs until cancelled.
+        
+        The orchestrator persists the resulting session and itinerary to
+        Firestore, where the user picks them up via the session status.
+        
+        Args:
+            consumer_name: Unique name of this worker within the consumer group
+        """
+        await asyncio.to_thread(self._ensure_initialized)
+        
+        job_queue = self.tools.get("job_queue")
+        orchestrator = self.agents.get("orchestrator")
+        if not job_queue or not orchestrator:
+            logger.error("Job worker requires the job queue tool and orchestrator agent")
+            return
+        
+        logger.info("Job worker %s started", consumer_name)
+        backoff = 0.0
+        while True:
+            jobs = await job_queue.consume(consumer_name)
+            if jobs is None:
+                # Redis is unreachable; back off instead of spinning on errors
+                backoff = min(backoff * 2 or JOB_WORKER_BACKOFF_MIN, JOB_WORKER_BACKOFF_MAX)
+                logger.warning("Job queue unavailable, retrying in %.0fs", backoff)
+                await asyncio.sleep(backoff)
+                continue
+            backoff = 0.0
+            
+            for job_id, job in jobs:
+                await self._run_job(job_queue, orchestrator, job_id, job)
+    
+    async def _run_job(self, job_queue: JobQueueTool, orchestrator: OrchestratorAgent, job_id: str, job: Dict[str, Any]) -> None:
+        """
+        Plan one queued trip, retrying it only if planning failed transiently.
+        
+        Jobs that end in a plan, or in an error the request itself caused (such
+        as missing trip details, whose clarifying questions are saved on the
+        session), are acked.
+        
+        Args:
+            job_queue: Job queue tool the job was read from
+            orchestrator: Orchestrator agent that plans the trip
+            job_id: Job ID returned by consume
+            job: Job payload returned by consume
+        """
+        try:
+            response = await orchestrator.aplan_trip(
+                user_input=job["user_input"],
+                session_id=job["session_id"],
+                user_id=job["user_id"],
+                tools=self.tools
+            )
+            self._invalidate_session_meta(job["session_id"])
+            
+            if response.success or response.error in JOB_FINAL_ERRORS:
+                logger.info("Completed job %s for session %s: %s", job_id, job['session_id'], response.message)
+                await job_queue.ack(job_id)
+                return
+            logger.warning("Job %s finished without a plan: %s", job_id, response.message)
+            
+        except Exception as e:
+            logger.error("Job %s failed: %s", job_id, e)
+        
+        await job_queue.retry(job_id, job)
     
     def _is_refinement_request(self, user_input: str, session_id: Optional[str]) -> bool:
         """Check if the user input is a refinement request for existing itinerary."""
         if not session_id:
             return False
         
+        # Check for refinement keywords
+        if not _REFINE_RE.search(user_input):
+            return False
+        
         # Check if session has existing itinerary
+        with self._session_meta_lock:
+            has_itinerary = self._session_meta_cache.get(session_id)
+        if has_itinerary is not None:
+            return has_itinerary
+        
         firestore_tool = self.tools.get("firestore")
         if firestore_tool:
             try:
                 session_data = firestore_tool.get_session(session_id)
-                if session_data and session_data.current_itinerary:
-                    # Check for refinement keywords
-                    refinement_keywords = [
-                        "change", "modify", "different", "instead", "replace",
-                        "earlier", "later", "cheaper", "expensive", "add", "remove"
-                    ]
-                    user_input_lower = user_input.lower()
-                    return any(keyword in user_input_lower for keyword in refinement_keywords)
+                has_itinerary = bool(session_data and session_data.current_itinerary)
+                with self._session_meta_lock:
+                    self._session_meta_cache[session_id] = has_itinerary
+                return has_itinerary
             except Exception as e:
-                logger.error(f"Error checking for refinement request: {e}")
+                logger.error("Error checking for refinement request: %s", e)
         
         return False
     
+    def _invalidate_session_meta(self, session_id: Optional[str]) -> None:
+        """Drop cached session metadata after the itinerary may have changed."""
+        if session_id:
+            with self._session_meta_lock:
+                self._session_meta_cache.pop(session_id, None)
+    
+    def _cached_user_lookup(self, user_id: str, key: Tuple, loader: Callable[[], Any]) -> Any:
+        """Return a cached per-user lookup, calling loader on a miss."""
+        with self._user_cache_lock:
+            entries = self._user_cache.get(user_id)
+            if entries is not None and key in entries:
+                return entries[key]
+        
+        value = loader()
+        with self._user_cache_lock:
+            self._user_cache.setdefault(user_id, {})[key] = value
+        return value
+    
+    def _invalidate_user_cache(self, user_id: Optional[str]) -> None:
+        """Drop cached lookups for a user after their sessions changed."""
+        if user_id:
+            with self._user_cache_lock:
+                self._user_cache.pop(user_id, None)
+    
     def _format_response(self, agent_response) -> str:
         """Format agent response for user display."""
         try:
-            if not agent_response.success:
-                # Handle error responses
-                if agent_response.data and "clarifying_questions" in agent_response.data:
-                    # Need more information
-                    questions = agent_response.data["clarifying_questions"]
-                    partial_data = agent_response.data.get("partial_data", {})
-                    conversation_count = agent_response.data.get("conversation_count", 1)
-                    
-                    message = f"💬 Great! I'm building your trip plan (exchange {conversation_count})...\n\n"
-                    
-                    # Show what we already have
-                    if partial_data:
-                        message += "✅ **Information collected so far:**\n"
-                        for key, value in partial_data.items():
-                            if value is not None and value != "":
-                                if key == "destination":
-                                    message += f"📍 Destination: {value}\n"
-                                elif key == "start_date":
-                                    message += f"📅 Start Date: {value}\n"
-                                elif key == "duration_days":
-                                    message += f"⏰ Duration: {value} days\n"
-                                elif key == "number_of_travelers":
-                                    message += f"👥 Travelers: {value}\n"
-                                elif key == "budget_range":
-                                    message += f"💰 Budget: {value}\n"
-                                elif key == "group_type":
-                                    message += f"👨‍👩‍👧‍👦 Group Type: {value}\n"
-                                elif key == "interests":
-                                    message += f"🎯 Interests: {', '.join(value) if isinstance(value, list) else value}\n"
-                        message += "\n"
-                    
-                    message += "❓ **I need a bit more information:**\n"
-                    for i, question in enumerate(questions, 1):
-                        message += f"{i}. {question}\n"
-                    
-                    message += "\n💡 *Just answer any of the questions above - I'll keep track of everything!*"
-                    return message
-                else:
-                    return f"❌ {agent_response.message or 'Something went wrong'}"
-            
-            # Handle successful responses
             data = agent_response.data
-            message = f"✅ {agent_response.message}\n\n"
-            
-            # Add itinerary summary if available
-            if "itinerary" in data:
-                itinerary = data["itinerary"]
-                message += f"📍 **Destination:** {itinerary['trip_request']['destination']}\n"
-                message += f"📅 **Duration:** {len(itinerary['days'])} days\n"
-                message += f"💰 **Total Estimated Cost:** ${float(itinerary['total_cost']):.2f}\n"
-                message += f"🎯 **Activities:** {sum(len(day['items']) for day in itinerary['days'])}\n\n"
-                
-                # Add detailed daily breakdown - SHOW ALL ACTIVITIES
-                message += "📋 **Detailed Daily Itinerary:**\n"
-                message += "=" * 60 + "\n"
-                
-                for day in itinerary['days']:
-                    message += f"\n**🗓️ Day {day['day']}** - {len(day['items'])} activities | 💰 ${day['total_estimated_cost']:.2f}\n"
-                    message += "-" * 50 + "\n"
-                    
-                    # Show ALL activities for the day
-                    for idx, item in enumerate(day['items'], 1):
-                        # Handle both direct POI access and nested POI structure
-                        poi_name = item.get('poi', {}).get('name') or item.get('name', f'Activity {idx}')
-                        start_time = item.get('start_time', item.get('time_slot', '').split('-')[0] if item.get('time_slot') else 'TBD')
-                        end_time = item.get('end_time', item.get('time_slot', '').split('-')[-1] if item.get('time_slot') else 'TBD')
-                        
-                        # Get activity type or category
-                        activity_type = item.get('activity_type', item.get('poi', {}).get('types', ['Activity'])[0] if item.get('poi', {}).get('types') else 'Activity')
-                        
-                        # Get estimated cost
-                        estimated_cost = item.get('estimated_cost', 0)
-                        cost_display = f"${estimated_cost:.2f}" if estimated_cost > 0 else "Free"
-                        
-                        # Get duration
-                        duration = item.get('duration_hours', item.get('duration', 'N/A'))
-                        duration_display = f"{duration}h" if isinstance(duration, (int, float)) else duration
-                        
-                        # Format the activity line
-                        message += f"  {idx:2d}. 🏛️ **{poi_name}**\n"
-                        message += f"      ⏰ {start_time} - {end_time} ({duration_display})\n"
-                        message += f"      💰 {cost_display} | 🏷️ {activity_type}\n"
-                        
-                        # Add description if available
-                        description = item.get('description', item.get('poi', {}).get('description', ''))
-                        if description and len(description) > 0:
-                            # Truncate long descriptions
-                            desc_preview = description[:100] + "..." if len(description) > 100 else description
-                            message += f"      📝 {desc_preview}\n"
-                        
-                        # Add location if available
-                        location = item.get('location', item.get('poi', {}).get('formatted_address', ''))
-                        if location:
-                            message += f"      📍 {location}\n"
-                        
-                        message += "\n"
-                
-                # Add travel summary
-                message += "\n" + "=" * 60 + "\n"
-                message += "🚗 **Travel Information:**\n"
-                
-                total_distance = sum(day.get('total_distance_km', 0) for day in itinerary['days'])
-                total_travel_time = sum(day.get('total_travel_time_minutes', 0) for day in itinerary['days'])
-                
-                if total_distance > 0:
-                    message += f"📏 Total Distance: {total_distance:.1f} km\n"
-                if total_travel_time > 0:
-                    hours = total_travel_time // 60
-                    minutes = total_travel_time % 60
-                    message += f"⏱️ Total Travel Time: {hours}h {minutes}m\n"
-            
-            # Add AI insights if available
-            if "ai_insights" in data and data["ai_insights"]:
-                insights = data["ai_insights"]
-                if "highlights" in insights and insights["highlights"]:
-                    message += "✨ **Trip Highlights:**\n"
-                    for highlight in insights["highlights"]:
-                        message += f"  • {highlight}\n"
-                    message += "\n"
-            
-            # Add session information
-            if "session_id" in data:
-                message += f"🔗 **Session ID:** `{data['session_id']}` (save this to modify your trip later)\n"
-            
-            return message
+            
+            # Dispatch on the response shape; each renderer handles one shape
+            if agent_response.success:
+                return self._render_success(agent_response.message, data)
+            if data and "clarifying_questions" in data:
+                return self._render_clarifying_questions(data)
+            return f"❌ {agent_response.message or 'Something went wrong'}"
             
         except Exception as e:
-            logger.error(f"Error formatting response: {e}")
+            logger.error("Error formatting response: %s", e)
             return "Your trip has been planned successfully! However, I had trouble displaying the details. Please check your session."
     
+    def _render_clarifying_questions(self, data: Dict[str, Any]) -> str:
+        """Render a request for missing trip details, with what's known so far."""
+        questions = data["clarifying_questions"]
+        partial_data = data.get("partial_data", {})
+        conversation_count = data.get("conversation_count", 1)
+        
+        parts = [f"💬 Great! I'm building your trip plan (exchange {conversation_count})...\n\n"]
+        
+        # Show what we already have
+        if partial_data:
+            parts.append("✅ **Information collected so far:**\n")
+            parts.extend(
+                _PARTIAL_FIELD_TEMPLATES[key].format(', '.join(value) if key == "interests" and isinstance(value, list) else value)
+                for key, value in partial_data.items()
+                if key in _PARTIAL_FIELD_TEMPLATES and value is not None and value != ""
+            )
+            parts.append("\n")
+        
+        parts.append("❓ **I need a bit more information:**\n")
+        parts.extend(f"{i}. {question}\n" for i, question in enumerate(questions, 1))
+        
+        parts.append("\n💡 *Just answer any of the questions above - I'll keep track of everything!*")
+        return "".join(parts)
+    
+    def _render_success(self, message: str, data: Dict[str, Any]) -> str:
+        """Render a successful planning or refinement response."""
+        parts = [f"✅ {message}\n\n"]
+        
+        # Add itinerary summary if available
+        itinerary = data.get("itinerary")
+        if itinerary is not None:
+            parts.append(self._render_itinerary(itinerary))
+        
+        # Add AI insights if available
+        highlights = (data.get("ai_insights") or {}).get("highlights")
+        if highlights:
+            parts.append("✨ **Trip Highlights:**\n")
+            parts.extend(f"  • {highlight}\n" for highlight in highlights)
+            parts.append("\n")
+        
+        # Add session information
+        if "session_id" in data:
+            parts.append(f"🔗 **Session ID:** `{data['session_id']}` (save this to modify your trip later)\n")
+        
+        return "".join(parts)
+    
+    def _render_itinerary(self, itinerary: Dict[str, Any]) -> str:
+        """Render the itinerary summary, daily breakdown and travel totals in one pass over the days."""
+        days = itinerary['days']
+        parts = [
+            f"📍 **Destination:** {itinerary['trip_request']['destination']}\n",
+            f"📅 **Duration:** {len(days)} days\n",
+            f"💰 **Total Estimated Cost:** ${to_display(itinerary['total_cost']):.2f}\n",
+            f"🎯 **Activities:** {itinerary['activity_count']}\n\n",
+            # Add detailed daily breakdown - SHOW ALL ACTIVITIES
+            "📋 **Detailed Daily Itinerary:**\n",
+            "=" * 60 + "\n"
+        ]
+        append = parts.append
+        
+        total_distance = 0
+        total_travel_time = 0
+        for day in days:
+            items = day['items']
+            append(f"\n**🗓️ Day {day['day']}** - {len(items)} activities | 💰 ${to_display(day['total_estimated_cost']):.2f}\n")
+            append("-" * 50 + "\n")
+            parts.extend(self._render_activity(idx, item) for idx, item in enumerate(items, 1))
+            
+            total_distance += day.get('total_distance_km', 0)
+            total_travel_time += day.get('total_travel_time_minutes', 0)
+        
+        # Add travel summary
+        append("\n" + "=" * 60 + "\n")
+        append("🚗 **Travel Information:**\n")
+        
+        if total_distance > 0:
+            append(f"📏 Total Distance: {total_distance:.1f} km\n")
+        if total_travel_time > 0:
+            hours = total_travel_time // 60
+            minutes = total_travel_time % 60
+            append(f"⏱️ Total Travel Time: {hours}h {minutes}m\n")
+        
+        return "".join(parts)
+    
+    @staticmethod
+    def _render_activity(idx: int, item: Dict[str, Any]) -> str:
+        """Render a single itinerary item of the daily breakdown."""
+        poi = item.get('poi', {})
+        time_slot = item.get('time_slot')
+        
+        # Handle both direct POI access and nested POI structure
+        poi_name = poi.get('name') or item.get('name', f'Activity {idx}')
+        start_time = item.get('start_time', time_slot.split('-')[0] if time_slot else 'TBD')
+        end_time = item.get('end_time', time_slot.split('-')[-1] if time_slot else 'TBD')
+        
+        # Get activity type or category
+        activity_type = item.get('activity_type', poi['types'][0] if poi.get('types') else 'Activity')
+        
+        # Get estimated cost
+        estimated_cost = to_display(item.get('cost_estimate') or 0)
+        cost_display = f"${estimated_cost:.2f}" if estimated_cost > 0 else "Free"
+        
+        # Get duration
+        duration = item.get('duration_hours', item.get('duration', 'N/A'))
+        duration_display = f"{duration}h" if isinstance(duration, (int, float)) else duration
+        
+        # Format the activity line
+        parts = [
+            f"  {idx:2d}. 🏛️ **{poi_name}**\n",
+            f"      ⏰ {start_time} - {end_time} ({duration_display})\n",
+            f"      💰 {cost_display} | 🏷️ {activity_type}\n"
+        ]
+        
+        # Add description if available
+        description = item.get('description', poi.get('description', ''))
+        if description:
+            # Truncate long descriptions
+            desc_preview = description[:100] + "..." if len(description) > 100 else description
+            parts.append(f"      📝 {desc_preview}\n")
+        
+        # Add location if available
+        location = item.get('location', poi.get('formatted_address', ''))
+        if location:
+            parts.append(f"      📍 {location}\n")
+        
+        parts.append("\n")
+        return "".join(parts)
+    
     def get_session_status(self, session_id: str) -> str:
         """Get status of a planning session."""
         try:
+            self._ensure_initialized()
+            
+            # Check the session's version first; if it hasn't changed since the
+            # last call, the full session read and reformatting are skipped
+            firestore_tool = self.tools.get("firestore")
+            version = firestore_tool.get_session_metadata(session_id) if firestore_tool else None
+            cache_key = (session_id, version)
+            if version is not None:
+                with self._status_cache_lock:
+                    cached = self._status_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
             orchestrator = self.agents.get("orchestrator")
             if not orchestrator:
                 return "Session management not available."
@@ -451,26 +905,32 @@ class TripPlannerApp(AdkApp):
                 return f"❌ {response.message}"
             
             data = response.data
-            status_message = f"📊 **Session Status**\n"
-            status_message += f"🆔 **Session ID:** {data['session_id']}\n"
-            status_message += f"📅 **Created:** {data['created_at']}\n"
-            status_message += f"🔄 **Active:** {'Yes' if data['is_active'] else 'No'}\n"
+            parts = [
+                "📊 **Session Status**\n",
+                f"🆔 **Session ID:** {data['session_id']}\n",
+                f"📅 **Created:** {data['created_at']}\n",
+                f"🔄 **Active:** {'Yes' if data['is_active'] else 'No'}\n",
+            ]
             
             if data['has_trip_request'] and "trip_details" in data:
                 trip = data["trip_details"]
-                status_message += f"📍 **Destination:** {trip['destination']}\n"
-                status_message += f"📅 **Start Date:** {trip['start_date']}\n"
-                status_message += f"⏰ **Duration:** {trip['duration_days']} days\n"
+                parts.append(f"📍 **Destination:** {trip['destination']}\n")
+                parts.append(f"📅 **Start Date:** {trip['start_date']}\n")
+                parts.append(f"⏰ **Duration:** {trip['duration_days']} days\n")
             
             if data['has_itinerary'] and "itinerary_summary" in data:
                 summary = data["itinerary_summary"]
-                status_message += f"💰 **Total Cost:** ${summary['total_cost']:.2f}\n"
-                status_message += f"🎯 **Activities:** {summary['total_activities']}\n"
+                parts.append(f"💰 **Total Cost:** ${summary['total_cost']:.2f}\n")
+                parts.append(f"🎯 **Activities:** {summary['total_activities']}\n")
             
-            return status_message
+            status = "".join(parts)
+            if version is not None:
+                with self._status_cache_lock:
+                    self._status_cache[cache_key] = status
+            return status
             
         except Exception as e:
-            logger.error(f"Error getting session status: {e}")
+            logger.error("Error getting session status: %s", e)
             return "Error retrieving session status."
     
     def get_user_sessions(self, user_id: str, limit: Optional[int] = None, active_only: bool = False) -> List[Dict[str, Any]]:
@@ -486,41 +946,63 @@ class TripPlannerApp(AdkApp):
             List of session dictionaries
         """
         try:
+            self._ensure_initialized()
+            
             firestore_tool = self.tools.get("firestore")
             if not firestore_tool:
                 logger.error("Firestore tool not available")
                 return []
             
-            sessions = firestore_tool.get_user_sessions(user_id, limit, active_only)
-            
-            # Convert to dictionary format for easier consumption
-            session_list = []
-            for session in sessions:
-                session_dict = {
-                    "session_id": session.session_id,
-                    "user_id": session.user_id,
-                    "created_at": session.created_at.isoformat() if session.created_at else None,
-                    "last_activity": session.last_activity.isoformat() if session.last_activity else None,
-                    "is_active": session.is_active,
-                    "has_trip_request": session.trip_request is not None,
-                    "has_itinerary": session.current_itinerary is not None,
-                    "conversation_length": len(session.conversation_history)
-                }
-                
-                # Add trip details if available
-                if session.trip_request:
-                    session_dict["destination"] = session.trip_request.destination
-                    session_dict["start_date"] = session.trip_request.start_date.isoformat() if session.trip_request.start_date else None
-                    session_dict["duration_days"] = session.trip_request.duration_days
-                
-                session_list.append(session_dict)
-            
-            return session_list
+            return self._cached_user_lookup(
+                user_id,
+                ("sessions", limit, active_only),
+                lambda: self._load_user_sessions(firestore_tool, user_id, limit, active_only)
+            )
             
         except Exception as e:
-            logger.error(f"Error retrieving user sessions: {e}")
+            logger.error("Error retrieving user sessions: %s", e)
             return []
     
+    def _load_user_sessions(
+        self,
+        firestore_tool: FirestoreTool,
+        user_id: str,
+        limit: Optional[int],
+        active_only: bool
+    ) -> List[Dict[str, Any]]:
+        """Query a user's sessions from Firestore and convert them to dictionaries."""
+        sessions = firestore_tool.get_user_sessions(user_id, limit, active_only)
+        
+        # Convert to dictionary format for easier consumption
+        return [self._session_summary(session) for session in sessions]
+    
+    @staticmethod
+    def _session_summary(session) -> Dict[str, Any]:
+        """Flatten a SessionData into the dictionary used by session listings."""
+        created_at = session.created_at
+        last_activity = session.last_activity
+        trip_request = session.trip_request
+        
+        session_dict = {
+            "session_id": session.session_id,
+            "user_id": session.user_id,
+            "created_at": created_at.isoformat() if created_at else None,
+            "last_activity": last_activity.isoformat() if last_activity else None,
+            "is_active": session.is_active,
+            "has_trip_request": trip_request is not None,
+            "has_itinerary": session.current_itinerary is not None,
+            "conversation_length": len(session.conversation_history)
+        }
+        
+        # Add trip details if available
+        if trip_request:
+            start_date = trip_request.start_date
+            session_dict["destination"] = trip_request.destination
+            session_dict["start_date"] = start_date.isoformat() if start_date else None
+            session_dict["duration_days"] = trip_request.duration_days
+        
+        return session_dict
+    
     def get_user_latest_session(self, user_id: str) -> Optional[Session]:
         """
         Get the most recent session for a user and load it into the app.
@@ -532,28 +1014,49 @@ class TripPlannerApp(AdkApp):
             Session object or None if not found
         """
         try:
+            self._ensure_initialized()
+            
             firestore_tool = self.tools.get("firestore")
             if not firestore_tool:
                 logger.error("Firestore tool not available")
                 return None
             
-            session_data = firestore_tool.get_user_latest_session(user_id)
+            session_data = self._cached_user_lookup(
+                user_id, ("latest",), lambda: firestore_tool.get_user_latest_session(user_id)
+            )
             if session_data:
-                # Create ADK Session object
-                session = Session(session_id=session_data.session_id, user_id=session_data.user_id)
-                
-                # Register with app
-                self.sessions[session_data.session_id] = session
+                # Create ADK Session object and register it with the app,
+                # reusing the instance if the session is already loaded
+                session = self.sessions.setdefault(
+                    session_data.session_id,
+                    Session(session_id=session_data.session_id, user_id=session_data.user_id)
+                )
                 
-                logger.info(f"Loaded latest session {session_data.session_id} for user {user_id}")
+                logger.info("Loaded latest session %s for user %s", session_data.session_id, user_id)
                 return session
             
             return None
             
         except Exception as e:
-            logger.error(f"Error getting user latest session: {e}")
+            logger.error("Error getting user latest session: %s", e)
             return None
     
+    def _session_counts(
+        self,
+        firestore_tool: Optional[FirestoreTool],
+        user_id: str,
+        recent: List[Dict[str, Any]]
+    ) -> Tuple[int, int]:
+        """Return (total, active) session counts, falling back to the recent rows."""
+        def load() -> Tuple[int, int]:
+            total = firestore_tool.count_user_sessions(user_id) if firestore_tool else None
+            active = firestore_tool.count_user_sessions(user_id, active_only=True) if firestore_tool else None
+            if total is None or active is None:
+                return len(recent), sum(1 for s in recent if s['is_active'])
+            return total, active
+        
+        return self._cached_user_lookup(user_id, ("counts",), load)
+    
     def format_user_sessions_summary(self, user_id: str) -> str:
         """
         Get a formatted summary of all sessions for a user.
@@ -565,66 +1068,108 @@ class TripPlannerApp(AdkApp):
             Formatted string with session summary
         """
         try:
-            sessions = self.get_user_sessions(user_id)
+            # Only the rows that are displayed are fetched; totals come from
+            # Firestore count aggregations instead of the full session list
+            sessions = self.get_user_sessions(user_id, limit=RECENT_SESSIONS_SHOWN)
             
             if not sessions:
                 return f"👤 **User {user_id}**\n❌ No sessions found."
             
             # Get user info
             firestore_tool = self.tools.get("firestore")
-            user_info = firestore_tool.get_user_info(user_id) if firestore_tool else None
+            user_info = self._cached_user_lookup(
+                user_id, ("info",), lambda: firestore_tool.get_user_info(user_id)
+            ) if firestore_tool else None
+            total_count, active_count = self._session_counts(firestore_tool, user_id, sessions)
             
-            summary = f"👤 **User {user_id}**\n"
-            summary += f"📊 **Total Sessions:** {len(sessions)}\n"
+            parts = [
+                f"👤 **User {user_id}**\n",
+                f"📊 **Total Sessions:** {total_count}\n"
+            ]
+            append = parts.append
             
             if user_info:
                 if 'last_activity' in user_info:
-                    summary += f"⏰ **Last Activity:** {user_info['last_activity']}\n"
+                    append(f"⏰ **Last Activity:** {user_info['last_activity']}\n")
             
-            active_sessions = [s for s in sessions if s['is_active']]
-            summary += f"🔄 **Active Sessions:** {len(active_sessions)}\n\n"
+            append(f"🔄 **Active Sessions:** {active_count}\n\n")
             
-            summary += "📋 **Recent Sessions:**\n"
-            for i, session in enumerate(sessions[:5], 1):  # Show top 5 recent sessions
+            append("📋 **Recent Sessions:**\n")
+            for session in sessions:
                 status_icon = "🟢" if session['is_active'] else "🔴"
-                summary += f"{status_icon} **{session['session_id'][:8]}...** "
-                
-                if session.get('destination'):
-                    summary += f"({session['destination']}) "
-                
-                summary += f"- {session['last_activity'][:10]}\n"
+                destination = f"({session['destination']}) " if session.get('destination') else ""
+                append(f"{status_icon} **{session['session_id'][:8]}...** {destination}- {session['last_activity'][:10]}\n")
             
-            if len(sessions) > 5:
-                summary += f"... and {len(sessions) - 5} more sessions\n"
+            if total_count > len(sessions):
+                append(f"... and {total_count - len(sessions)} more sessions\n")
             
-            return summary
+            return "".join(parts)
             
         except Exception as e:
-            logger.error(f"Error formatting user sessions summary: {e}")
+            logger.error("Error formatting user sessions summary: %s", e)
             return f"❌ Error retrieving sessions for user {user_id}"
 
 
-# Create the main application instance
-app = TripPlannerApp()
-
-
 # ADK entry points
-def create_app():
-    """ADK entry point for creating the application."""
-    return app
+@functools.lru_cache(maxsize=1)
+def create_app() -> TripPlannerApp:
+    """ADK entry point for creating the application (one instance per process)."""
+    return TripPlannerApp()
 
 
-async def handle_message(user_input: str, session: Session) -> str:
+async def handle_message(user_input: str, session: SessionLike) -> str:
     """ADK entry point for handling user messages."""
-    return await app.process_user_input(user_input, session)
+    return await create_app().process_user_input(user_input, session)
+
+
+async def handle_message_stream(user_input: str, session: SessionLike) -> AsyncIterator[str]:
+    """ADK entry point for handling user messages with incremental progress."""
+    async for chunk in create_app().process_user_input_stream(user_input, session):
+        yield chunk
 
 
 # For local development and testing
 if __name__ == "__main__":
-    import asyncio
     import sys
     from adk import Session as AdkSession
     
+    app = create_app()
+    
+    HELP_TEXT = (
+        "\n📋 Available commands:\n"
+        "  - Type your trip planning request naturally\n"
+        "  - 'sessions' - View your recent sessions\n"
+        "  - 'status' - Check current session status\n"
+        "  - 'clear' - Start a new session\n"
+        "  - 'help' - Show this help\n"
+        "  - 'quit', 'exit', 'bye' - End session"
+    )
+    EXIT_CMDS = frozenset({"quit", "exit", "bye"})
+    
+    def _cmd_help(user_id, session):
+        print(HELP_TEXT)
+    
+    def _cmd_sessions(user_id, session):
+        print(f"\n{app.format_user_sessions_summary(user_id)}")
+    
+    def _cmd_status(user_id, session):
+        print(f"\n{app.get_session_status(session.id)}")
+    
+    def _cmd_clear(user_id, session):
+        """Start a new session; the returned session replaces the current one."""
+        session = app.create_session(user_id=user_id)
+        session = app.ensure_session_registered(session)
+        print(f"🆕 Created new session {session.id[:8]}...")
+        return session
+    
+    # Interactive commands; a handler returning a session switches to it
+    CMD_DISPATCH = {
+        "sessions": _cmd_sessions,
+        "status": _cmd_status,
+        "clear": _cmd_clear,
+        "help": _cmd_help,
+    }
+    
     async def interactive_session():
         """Interactive session for single user trip planning."""
         print("🚀 Trip Planner - Interactive Mode")
@@ -695,38 +1240,18 @@ if __name__ == "__main__":
                 if not user_input:
                     continue
                 
-                # Check for exit commands
-                if user_input.lower() in ['quit', 'exit', 'bye']:
+                # Commands are matched case-insensitively, lowering the input once
+                cmd = user_input.lower()
+                if cmd in EXIT_CMDS:
                     print("\n👋 Thanks for using Trip Planner! Have a great trip!")
                     break
                 
-                # Check for help command
-                if user_input.lower() == 'help':
-                    print("\n📋 Available commands:")
-                    print("  - Type your trip planning request naturally")
-                    print("  - 'sessions' - View your recent sessions")
-                    print("  - 'status' - Check current session status")
-                    print("  - 'clear' - Start a new session")
-                    print("  - 'help' - Show this help")
-                    print("  - 'quit', 'exit', 'bye' - End session")
-                    continue
-                
-                # Check for special commands
-                if user_input.lower() == 'sessions':
-                    summary = app.format_user_sessions_summary(user_id)
-                    print(f"\n{summary}")
-                    continue
-                
-                if user_input.lower() == 'status':
-                    status = app.get_session_status(session.id)
-                    print(f"\n{status}")
-                    continue
-                
-                if user_input.lower() == 'clear':
-                    session = app.create_session(user_id=user_id)
-                    session = app.ensure_session_registered(session)
-                    print(f"🆕 Created new session {session.id[:8]}...")
-                    conversation_count = 0
+                handler = CMD_DISPATCH.get(cmd)
+                if handler:
+                    new_session = handler(user_id, session)
+                    if new_session is not None:
+                        session = new_session
+                        conversation_count = 0
                     continue
                 
                 # Process the trip planning request
@@ -821,6 +1346,8 @@ if __name__ == "__main__":
         if len(sys.argv) > 1:
             if sys.argv[1] in ['--test', '-t', '--multi-user', '-m']:
                 await test_multi_user_sessions()
+            elif sys.argv[1] in ['--worker', '-w']:
+                await app.run_job_worker(sys.argv[2] if len(sys.argv) > 2 else "worker-1")
             elif sys.argv[1] in ['--help', '-h']:
                 print("🚀 Trip Planner ADK Application")
                 print("=" * 50)
@@ -828,6 +1355,7 @@ if __name__ == "__main__":
                 print("  python app.py                    # Interactive mode (default)")
                 print("  python app.py --test            # Multi-user test mode")
                 print("  python app.py --multi-user      # Multi-user test mode")
+                print("  python app.py --worker [name]   # Process offline planning jobs")
                 print("  python app.py --help            # Show this help")
                 print("\nInteractive mode commands:")
                 print("  - Type your trip planning requests naturally")
@@ -4,76 +4,121 @@ Schema definitions for the Trip Planner ADK application.
 This module exports all data models used throughout the trip planning workflow.
 """
 
-# Export all models from sub-modules
-from .base_models import (
-    GroupType,
-    BudgetRange,
-    POICategory,
-    TransportMode,
-    WeatherCondition,
-    BookingStatus,
-    Coordinates,
-    Address
-)
+import importlib
+from typing import TYPE_CHECKING
 
-from .trip_models import TripRequest
-
-from .poi_models import POI
-
-from .weather_transport_models import (
-    WeatherInfo,
-    TransportOption
-)
-
-from .itinerary_models import (
-    ItineraryItem,
-    DayPlan,
-    Itinerary
-)
-
-from .booking_models import (
-    BookingItem,
-    BookingBasket,
-    PaymentInfo
-)
-
-from .agent_models import (
-    AgentResponse,
-    SessionData
-)
-
-__all__ = [
+# Sub-modules are imported on first attribute access (PEP 562), so callers
+# that need only a few models don't pay for compiling every schema
+_LAZY = {
     # Base enums and models
-    "GroupType",
-    "BudgetRange", 
-    "POICategory",
-    "TransportMode",
-    "WeatherCondition",
-    "BookingStatus",
-    "Coordinates",
-    "Address",
+    "GroupType": "base_models",
+    "BudgetRange": "base_models",
+    "POICategory": "base_models",
+    "TransportMode": "base_models",
+    "WeatherCondition": "base_models",
+    "BookingStatus": "base_models",
+    "Coordinates": "base_models",
+    "Address": "base_models",
+    "Money": "base_models",
+    "to_cents": "base_models",
+    "to_display": "base_models",
+    "TimestampedModel": "base_models",
+    "utc_now": "base_models",
+    "MONEY_UNIT_KEY": "base_models",
+    "MONEY_UNIT_CENTS": "base_models",
+    "LEGACY_MONEY_CONTEXT": "base_models",
     
     # Trip models
-    "TripRequest",
+    "TripRequest": "trip_models",
     
     # POI models
-    "POI",
+    "POI": "poi_models",
+    "POI_LIST_ADAPTER": "poi_models",
     
     # Weather and transport models
-    "WeatherInfo",
-    "TransportOption",
+    "WeatherInfo": "weather_transport_models",
+    "TransportOption": "weather_transport_models",
+    "WEATHER_LIST_ADAPTER": "weather_transport_models",
     
     # Itinerary models
-    "ItineraryItem",
-    "DayPlan",
-    "Itinerary",
+    "ItineraryItem": "itinerary_models",
+    "DayPlan": "itinerary_models",
+    "Itinerary": "itinerary_models",
     
     # Booking models
-    "BookingItem",
-    "BookingBasket", 
-    "PaymentInfo",
+    "BookingItem": "booking_models",
+    "BookingBasket": "booking_models",
+    "PaymentInfo": "booking_models",
+    "BookingType": "booking_models",
+    "PaymentMethod": "booking_models",
+    "PaymentStatus": "booking_models",
+    "CurrencyCode": "booking_models",
     
     # Agent models
-    "AgentResponse",
-    "SessionData"
-]
\ No newline at end of file
+    "AgentResponse": "agent_models",
+    "SessionData": "agent_models",
+}
+
+# Static imports for type checkers and IDEs only; _LAZY is the runtime source
+# of truth and __all__ is derived from it
+if TYPE_CHECKING:
+    from .base_models import (
+        GroupType,
+        BudgetRange,
+        POICategory,
+        TransportMode,
+        WeatherCondition,
+        BookingStatus,
+        Coordinates,
+        Address,
+        Money,
+        to_cents,
+        to_display,
+        TimestampedModel,
+        utc_now,
+        MONEY_UNIT_KEY,
+        MONEY_UNIT_CENTS,
+        LEGACY_MONEY_CONTEXT
+    )
+    from .trip_models import TripRequest
+    from .poi_models import POI, POI_LIST_ADAPTER
+    from .weather_transport_models import (
+        WeatherInfo,
+        TransportOption,
+        WEATHER_LIST_ADAPTER
+    )
+    from .itinerary_models import (
+        ItineraryItem,
+        DayPlan,
+        Itinerary
+    )
+    from .booking_models import (
+        BookingItem,
+        BookingBasket,
+        PaymentInfo,
+        BookingType,
+        PaymentMethod,
+        PaymentStatus,
+        CurrencyCode
+    )
+    from .agent_models import (
+        AgentResponse,
+        SessionData
+    )
+
+
+def __getattr__(name: str):
+    """Import the sub-module defining name on first access and cache the attribute."""
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+__all__ = list(_LAZY)
@@ -3,9 +3,10 @@ Agent and session data models.
 """
 
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import ClassVar, List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel, Field
 
+from .base_models import TimestampedModel, utc_now_coarse
 from .trip_models import TripRequest
 from .itinerary_models import Itinerary
 from .booking_models import BookingBasket
@@ -18,18 +19,59 @@ class AgentResponse(BaseModel):
     data: Optional[Dict[str, Any]] = Field(None, description="Response data")
     message: Optional[str] = Field(None, description="Response message")
     error: Optional[str] = Field(None, description="Error message if unsuccessful")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Response timestamp")
+    timestamp: datetime = Field(default_factory=utc_now_coarse, description="Response timestamp (second resolution)")
+    
+    def to_response_dict(self) -> Dict[str, Any]:
+        """JSON-ready dict for returning to clients, omitting fields that are None."""
+        return self.model_dump(mode='json', exclude_none=True)
+    
+    @classmethod
+    def from_trusted(cls, **kwargs: Any) -> 'AgentResponse':
+        """Build a response from values the application produced, skipping validation."""
+        return cls.model_construct(**kwargs)
 
 
-class SessionData(BaseModel):
+class SessionData(TimestampedModel):
     """Session data for maintaining conversation state."""
+    # Turns kept verbatim; older user input is folded into conversation_summary
+    MAX_HISTORY: ClassVar[int] = 50
+    MAX_SUMMARY_CHARS: ClassVar[int] = 2000
+    TIMESTAMP_FIELDS: ClassVar[Tuple[str, ...]] = ('created_at', 'last_activity')
+    
     session_id: str = Field(..., description="Unique session identifier")
     user_id: Optional[str] = None
     trip_request: Optional[TripRequest] = None
     current_itinerary: Optional[Itinerary] = None
     current_basket: Optional[BookingBasket] = None
-    conversation_history: List[Dict[str, Any]] = Field(default_factory=list, description="Conversation history")
+    conversation_history: List[Dict[str, Any]] = Field(default_factory=list, description="Most recent conversation turns")
+    conversation_summary: str = Field(default="", description="User input from turns dropped from the history")
     agent_context: Dict[str, Any] = Field(default_factory=dict, description="Context shared between agents")
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Session creation timestamp")
-    last_activity: datetime = Field(default_factory=datetime.utcnow, description="Last activity timestamp")
-    is_active: bool = Field(default=True, description="Whether session is active")
\ No newline at end of file
+    created_at: Optional[datetime] = Field(None, description="Session creation timestamp, stamped when first saved")
+    last_activity: Optional[datetime] = Field(None, description="Last activity timestamp, stamped when first saved")
+    is_active: bool = Field(default=True, description="Whether session is active")
+    
+    def add_turn(self, turn: Dict[str, Any]) -> None:
+        """Append a conversation turn, keeping at most MAX_HISTORY turns in the history."""
+        history = self.conversation_history
+        history.append(turn)
+        
+        overflow = len(history) - self.MAX_HISTORY
+        if overflow > 0:
+            evicted = [t.get("user_input", "") for t in history[:overflow] if t.get("agent") == "user"]
+            del history[:overflow]
+            summary = " ".join(part for part in (self.conversation_summary, *evicted) if part)
+            self.conversation_summary = summary[-self.MAX_SUMMARY_CHARS:]
+    
+    def to_response_dict(self) -> Dict[str, Any]:
+        """JSON-ready dict for returning to clients, omitting fields that are None."""
+        return self.model_dump(mode='json', exclude_none=True)
+    
+    @classmethod
+    def from_trusted(cls, **kwargs: Any) -> 'SessionData':
+        """
+        Build session data the application produced, skipping validation.
+        
+        Nested values must already be model instances; data read back from
+        storage goes through the normal constructor instead.
+        """
+        return cls.model_construct(**kwargs)
\ No newline at end of file
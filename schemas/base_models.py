@@ -2,11 +2,80 @@
 Core data models for the Trip Planner ADK application.
 """
 
-from datetime import datetime, date as date_type
-from typing import List, Optional, Dict, Any
+import sys
+import time
+from datetime import datetime, timezone, date as date_type
+from typing import Annotated, ClassVar, List, Optional, Dict, Any, Tuple
 from enum import Enum
-from pydantic import BaseModel, Field, validator
-from decimal import Decimal
+from pydantic import AfterValidator, BaseModel, BeforeValidator, ConfigDict, Field, ValidationInfo
+
+
+def utc_now() -> datetime:
+    """Timezone-aware current UTC time, used as the default for timestamp fields."""
+    return datetime.now(timezone.utc)
+
+
+# (epoch second, datetime) of the last coarse timestamp handed out; replaced
+# as a whole tuple so concurrent readers never see a mismatched pair
+_coarse_now = (0, datetime.fromtimestamp(0, timezone.utc))
+
+
+def utc_now_coarse() -> datetime:
+    """
+    Current UTC time truncated to the second, shared between calls in that second.
+    
+    For high-volume timestamps where second resolution is enough, this avoids
+    building a new datetime on every call.
+    """
+    global _coarse_now
+    second = int(time.time())
+    cached_second, cached = _coarse_now
+    if second != cached_second:
+        cached = datetime.fromtimestamp(second, timezone.utc)
+        _coarse_now = (second, cached)
+    return cached
+
+
+# Strings repeated across many POIs of a trip (city, country, amenity tags)
+# share a single interned object per distinct value
+InternedStr = Annotated[str, AfterValidator(sys.intern)]
+
+
+def to_cents(amount: float) -> int:
+    """Convert an amount in major currency units to integer cents."""
+    return round(amount * 100)
+
+
+def to_display(cents: int) -> float:
+    """Convert integer cents to major currency units for display."""
+    return cents / 100
+
+
+# Stored documents written since Money moved to cents carry this marker;
+# documents without it hold amounts in major units
+MONEY_UNIT_KEY = "money_unit"
+MONEY_UNIT_CENTS = "cents"
+
+# Validation context for documents without the marker
+LEGACY_MONEY_CONTEXT = {"legacy_money": True}
+
+
+def _legacy_to_cents(value: Any, info: ValidationInfo) -> Any:
+    """
+    Convert amounts from records stored before Money moved to cents.
+    
+    Under LEGACY_MONEY_CONTEXT every amount is in major units, integers
+    included (15 and "15" are $15.00), and is converted with to_cents.
+    Otherwise amounts are already integer cents and pass through unchanged.
+    """
+    if value is not None and info.context and info.context.get("legacy_money"):
+        return to_cents(float(value))
+    return value
+
+
+# Money amounts are stored as integer cents so sums and fee calculations
+# are exact without Decimal arithmetic
+Money = Annotated[int, BeforeValidator(_legacy_to_cents), Field(ge=0, description="Amount in cents")]
 
 
 class GroupType(str, Enum):
@@ -74,15 +143,45 @@ class BookingStatus(str, Enum):
 
 class Coordinates(BaseModel):
     """Geographic coordinates."""
+    model_config = ConfigDict(frozen=True)
+    
     latitude: float = Field(..., ge=-90, le=90, description="Latitude coordinate")
     longitude: float = Field(..., ge=-180, le=180, description="Longitude coordinate")
 
 
 class Address(BaseModel):
     """Physical address information."""
+    model_config = ConfigDict(frozen=True)
+    
     street: Optional[str] = None
-    city: str = Field(..., description="City name")
-    state: Optional[str] = None
-    country: str = Field(..., description="Country name")
+    city: InternedStr = Field(..., description="City name")
+    state: Optional[InternedStr] = None
+    country: InternedStr = Field(..., description="Country name")
     postal_code: Optional[str] = None
-    formatted_address: Optional[str] = None
\ No newline at end of file
+    formatted_address: Optional[str] = None
+
+
+class TimestampedModel(BaseModel):
+    """
+    Base for models whose timestamps are stamped when they are persisted.
+    
+    Fields named in TIMESTAMP_FIELDS default to None, so building an instance
+    doesn't read the clock. Storage code calls stamp_timestamps() before
+    writing; serializing the model never changes it.
+    """
+    TIMESTAMP_FIELDS: ClassVar[Tuple[str, ...]] = ()
+    
+    def stamp_timestamps(self, now: datetime) -> None:
+        """
+        Fill unset timestamps, here and in nested timestamped models, with now.
+        
+        Args:
+            now: Timezone-aware time to stamp
+        """
+        for name in self.TIMESTAMP_FIELDS:
+            if getattr(self, name) is None:
+                setattr(self, name, now)
+        for name in type(self).model_fields:
+            value = getattr(self, name)
+            if isinstance(value, TimestampedModel):
+                value.stamp_timestamps(now)
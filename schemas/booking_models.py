@@ -3,53 +3,66 @@ Booking and payment data models.
 """
 
 from datetime import datetime, date as date_type
-from typing import List, Optional
+from typing import Any, ClassVar, Dict, List, Literal, Optional, Tuple
 from pydantic import BaseModel, Field
-from decimal import Decimal
 
-from .base_models import BookingStatus
+from .base_models import BookingStatus, Money, TimestampedModel
+
+
+BookingType = Literal["accommodation", "activity", "restaurant", "transport"]
+PaymentMethod = Literal["card", "paypal", "bank_transfer"]
+PaymentStatus = Literal["pending", "processing", "succeeded", "failed"]
+CurrencyCode = Literal["USD", "EUR", "GBP", "JPY", "INR"]
 
 
 class BookingItem(BaseModel):
     """Individual booking item."""
     id: str = Field(..., description="Unique booking item identifier")
     poi_id: str = Field(..., description="Associated POI identifier")
-    booking_type: str = Field(..., description="Type of booking (e.g., 'accommodation', 'activity')")
+    booking_type: BookingType = Field(..., description="Type of booking")
     name: str = Field(..., description="Booking item name")
     date: date_type = Field(..., description="Booking date")
     time: Optional[str] = None
     quantity: int = Field(default=1, gt=0, description="Number of bookings")
-    unit_price: Decimal = Field(..., ge=0, description="Price per unit")
-    total_price: Decimal = Field(..., ge=0, description="Total price")
+    unit_price: Money = Field(..., description="Price per unit in cents")
+    total_price: Money = Field(..., description="Total price in cents")
     provider: Optional[str] = None
     confirmation_number: Optional[str] = None
     cancellation_policy: Optional[str] = None
     status: BookingStatus = Field(default=BookingStatus.PENDING, description="Booking status")
 
 
-class BookingBasket(BaseModel):
+class BookingBasket(TimestampedModel):
     """Collection of booking items for a trip."""
+    TIMESTAMP_FIELDS: ClassVar[Tuple[str, ...]] = ('created_at',)
+    
     id: str = Field(..., description="Unique basket identifier")
     itinerary_id: str = Field(..., description="Associated itinerary identifier")
     items: List[BookingItem] = Field(..., description="Booking items")
-    subtotal: Decimal = Field(default=Decimal('0'), ge=0, description="Subtotal amount")
-    taxes: Decimal = Field(default=Decimal('0'), ge=0, description="Tax amount")
-    fees: Decimal = Field(default=Decimal('0'), ge=0, description="Additional fees")
-    total: Decimal = Field(default=Decimal('0'), ge=0, description="Total amount")
-    currency: str = Field(default="USD", description="Currency code")
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp")
+    subtotal: Money = Field(default=0, description="Subtotal amount in cents")
+    taxes: Money = Field(default=0, description="Tax amount in cents")
+    fees: Money = Field(default=0, description="Additional fees in cents")
+    total: Money = Field(default=0, description="Total amount in cents")
+    currency: CurrencyCode = Field(default="USD", description="Currency code")
+    created_at: Optional[datetime] = Field(None, description="Creation timestamp, stamped when first saved")
     expires_at: Optional[datetime] = None
+    
+    def to_response_dict(self) -> Dict[str, Any]:
+        """JSON-ready dict for returning to clients, omitting fields that are None."""
+        return self.model_dump(mode='json', exclude_none=True)
 
 
-class PaymentInfo(BaseModel):
+class PaymentInfo(TimestampedModel):
     """Payment information and status."""
+    TIMESTAMP_FIELDS: ClassVar[Tuple[str, ...]] = ('created_at',)
+    
     id: str = Field(..., description="Unique payment identifier")
     booking_basket_id: str = Field(..., description="Associated booking basket identifier")
-    amount: Decimal = Field(..., gt=0, description="Payment amount")
-    currency: str = Field(default="USD", description="Currency code")
-    payment_method: str = Field(..., description="Payment method (e.g., 'card', 'paypal')")
-    status: str = Field(..., description="Payment status")
+    amount: Money = Field(..., gt=0, description="Payment amount in cents")
+    currency: CurrencyCode = Field(default="USD", description="Currency code")
+    payment_method: PaymentMethod = Field(..., description="Payment method")
+    status: PaymentStatus = Field(..., description="Payment status")
     transaction_id: Optional[str] = None
     provider_transaction_id: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Payment timestamp")
+    created_at: Optional[datetime] = Field(None, description="Payment timestamp, stamped when first saved")
     failure_reason: Optional[str] = None
\ No newline at end of file
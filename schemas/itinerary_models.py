@@ -3,10 +3,10 @@ Itinerary and planning data models.
 """
 
 from datetime import datetime, date as date_type
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
-from decimal import Decimal
+from typing import ClassVar, List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, ConfigDict, Field, computed_field, model_validator
 
+from .base_models import Money, TimestampedModel
 from .poi_models import POI
 from .weather_transport_models import WeatherInfo, TransportOption
 from .trip_models import TripRequest
@@ -14,13 +14,15 @@ from .trip_models import TripRequest
 
 class ItineraryItem(BaseModel):
     """Single item in the itinerary."""
+    model_config = ConfigDict(frozen=True)
+    
     day: int = Field(..., gt=0, description="Day number of the trip")
     time_slot: str = Field(..., description="Time slot (e.g., '09:00-11:00')")
     poi: POI = Field(..., description="Point of interest to visit")
     estimated_duration: int = Field(..., gt=0, description="Estimated duration in minutes")
     transport_to_next: Optional[TransportOption] = None
     notes: Optional[str] = None
-    cost_estimate: Optional[Decimal] = Field(None, ge=0, description="Estimated cost for this item")
+    cost_estimate: Optional[Money] = Field(None, description="Estimated cost for this item in cents")
 
 
 class DayPlan(BaseModel):
@@ -29,25 +31,36 @@ class DayPlan(BaseModel):
     date: date_type = Field(..., description="Date of this day")
     items: List[ItineraryItem] = Field(..., description="Itinerary items for this day")
     weather: Optional[WeatherInfo] = None
-    total_estimated_cost: Decimal = Field(default=Decimal('0'), ge=0, description="Total estimated cost for the day")
+    total_estimated_cost: Money = Field(default=0, description="Total estimated cost for the day in cents")
     notes: Optional[str] = None
 
 
-class Itinerary(BaseModel):
+class Itinerary(TimestampedModel):
     """Complete trip itinerary."""
+    TIMESTAMP_FIELDS: ClassVar[Tuple[str, ...]] = ('created_at', 'updated_at')
+    
     id: str = Field(..., description="Unique itinerary identifier")
     trip_request: TripRequest = Field(..., description="Original trip request")
     days: List[DayPlan] = Field(..., description="Daily plans")
-    total_cost: Decimal = Field(default=Decimal('0'), ge=0, description="Total trip cost")
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp")
-    updated_at: datetime = Field(default_factory=datetime.utcnow, description="Last update timestamp")
+    total_cost: Money = Field(default=0, description="Total trip cost in cents")
+    created_at: Optional[datetime] = Field(None, description="Creation timestamp, stamped when first saved")
+    updated_at: Optional[datetime] = Field(None, description="Last update timestamp, stamped when first saved")
     version: int = Field(default=1, description="Itinerary version")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
     
-    @validator('days')
-    def validate_days(cls, v, values):
-        if 'trip_request' in values:
-            expected_days = values['trip_request'].duration_days
-            if len(v) != expected_days:
-                raise ValueError(f'Expected {expected_days} days, got {len(v)}')
-        return v
\ No newline at end of file
+    @computed_field
+    @property
+    def activity_count(self) -> int:
+        """Total number of itinerary items across all days (serialized with the model)."""
+        return sum(len(day.items) for day in self.days)
+    
+    def to_response_dict(self) -> Dict[str, Any]:
+        """JSON-ready dict for returning to clients, omitting fields that are None."""
+        return self.model_dump(mode='json', exclude_none=True)
+    
+    @model_validator(mode='after')
+    def validate_days(self) -> 'Itinerary':
+        expected_days = self.trip_request.duration_days
+        if len(self.days) != expected_days:
+            raise ValueError(f'Expected {expected_days} days, got {len(self.days)}')
+        return self
\ No newline at end of file
@@ -3,10 +3,10 @@ Point of Interest (POI) data models.
 """
 
 from typing import List, Optional, Dict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from decimal import Decimal
 
-from .base_models import POICategory, GroupType, Coordinates, Address
+from .base_models import POICategory, GroupType, Coordinates, Address, InternedStr
 
 
 class POI(BaseModel):
@@ -24,8 +24,12 @@ class POI(BaseModel):
     website: Optional[str] = None
     phone: Optional[str] = None
     photos: List[str] = Field(default_factory=list, description="Photo URLs")
-    amenities: List[str] = Field(default_factory=list, description="Available amenities")
+    amenities: List[InternedStr] = Field(default_factory=list, description="Available amenities")
     suitable_for_groups: List[GroupType] = Field(default_factory=list, description="Suitable group types")
     estimated_visit_duration: Optional[int] = Field(None, description="Estimated visit duration in minutes")
     popularity_score: Optional[float] = Field(None, ge=0, le=100, description="Popularity score")
-    accessibility_features: List[str] = Field(default_factory=list, description="Accessibility features")
\ No newline at end of file
+    accessibility_features: List[InternedStr] = Field(default_factory=list, description="Accessibility features")
+
+
+# Validator for lists of POIs, built once and reused for every batch
+POI_LIST_ADAPTER = TypeAdapter(List[POI])
\ No newline at end of file
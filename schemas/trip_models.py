@@ -4,7 +4,7 @@ Trip request and core trip data models.
 
 from datetime import date as date_type
 from typing import List, Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, model_validator
 from decimal import Decimal
 
 from .base_models import GroupType, BudgetRange
@@ -25,11 +25,11 @@ class TripRequest(BaseModel):
     user_id: Optional[str] = Field(None, description="User identifier")
     session_id: Optional[str] = Field(None, description="Session identifier")
     
-    @validator('end_date')
-    def validate_dates(cls, v, values):
-        if 'start_date' in values and v <= values['start_date']:
+    @model_validator(mode='after')
+    def validate_dates(self) -> 'TripRequest':
+        if self.end_date <= self.start_date:
             raise ValueError('End date must be after start date')
-        return v
+        return self
     
     @property
     def duration_days(self) -> int:
@@ -3,33 +3,66 @@ Weather and transport data models.
 """
 
 from datetime import datetime, date as date_type
-from typing import Optional
-from pydantic import BaseModel, Field
-from decimal import Decimal
+from functools import cached_property
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, computed_field
 
-from .base_models import WeatherCondition, TransportMode
+from .base_models import WeatherCondition, TransportMode, Money
+
+
+_SEVERE_CONDITIONS = frozenset({WeatherCondition.STORMY, WeatherCondition.SNOWY})
 
 
 class WeatherInfo(BaseModel):
     """Weather information for a specific date and location."""
+    model_config = ConfigDict(frozen=True)
+    
     date: date_type = Field(..., description="Date of weather forecast")
     condition: WeatherCondition = Field(..., description="Weather condition")
     temperature_high: float = Field(..., description="High temperature in Celsius")
     temperature_low: float = Field(..., description="Low temperature in Celsius")
     humidity: Optional[int] = Field(None, ge=0, le=100, description="Humidity percentage")
     precipitation_chance: Optional[int] = Field(None, ge=0, le=100, description="Precipitation chance percentage")
+    precipitation_mm: Optional[float] = Field(None, ge=0, description="Expected precipitation in millimetres")
     wind_speed: Optional[float] = Field(None, ge=0, description="Wind speed in km/h")
     uv_index: Optional[int] = Field(None, ge=0, le=11, description="UV index")
-    is_suitable_for_outdoor: bool = Field(default=True, description="Whether suitable for outdoor activities")
+    
+    @computed_field
+    @cached_property
+    def is_suitable_for_outdoor(self) -> bool:
+        """Whether suitable for outdoor activities, derived once from the forecast fields."""
+        if self.condition in _SEVERE_CONDITIONS:
+            return False
+        
+        if self.temperature_high < -5 or self.temperature_high > 40:  # Extreme temperatures
+            return False
+        
+        if (self.wind_speed or 0) > 25:  # Very windy
+            return False
+        
+        precipitation_mm = self.precipitation_mm or 0
+        if precipitation_mm > 5:  # Heavy precipitation
+            return False
+        
+        if self.condition == WeatherCondition.RAINY and precipitation_mm > 1:
+            return False
+        
+        return True
 
 
 class TransportOption(BaseModel):
     """Transportation option between two locations."""
+    model_config = ConfigDict(frozen=True)
+    
     mode: TransportMode = Field(..., description="Transportation mode")
     duration_minutes: int = Field(..., gt=0, description="Travel duration in minutes")
     distance_km: float = Field(..., gt=0, description="Distance in kilometers")
-    cost: Optional[Decimal] = Field(None, ge=0, description="Transportation cost")
+    cost: Optional[Money] = Field(None, description="Transportation cost in cents")
     provider: Optional[str] = None
     route_description: Optional[str] = None
     departure_time: Optional[datetime] = None
-    arrival_time: Optional[datetime] = None
\ No newline at end of file
+    arrival_time: Optional[datetime] = None
+
+
+# Validator for lists of forecasts, built once and reused for every batch
+WEATHER_LIST_ADAPTER = TypeAdapter(List[WeatherInfo])
\ No newline at end of file
@@ -3,10 +3,13 @@ Streamlit UI for the Personalized AI Travel Itinerary System.
 """
 import streamlit as st
 import asyncio
+import bisect
+import functools
 import json
+import html
 import sys
 import re
-import requests
+import string
 import logging
 from typing import Dict, List, Optional, Any
 from pathlib import Path
@@ -16,17 +19,33 @@ from datetime import datetime, timedelta, date
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ISO date format used for parsed and submitted trip dates
+_DATE_FMT = "%Y-%m-%d"
+
+# Every st.cache_data cache is bounded in size and age; planner results are
+# per-user and kept in st.session_state instead (see _session_memo)
+_cache = functools.partial(st.cache_data, ttl=24 * 60 * 60, max_entries=256, show_spinner=False)
+
 # Add current directory to path for imports
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
-# Try to import the ADK app
-try:
-    from app import TripPlannerApp
-    from streamlit_wrapper import SimpleTripPlannerWrapper
-    ADK_AVAILABLE = True
-except ImportError as e:
-    ADK_AVAILABLE = False
+@st.cache_resource(show_spinner=False)
+def _load_adk():
+    """
+    Import the ADK app once per process.
+    
+    Returns:
+        (TripPlannerApp, SimpleTripPlannerWrapper) classes, or None if the
+        ADK app can't be imported (the result is cached either way)
+    """
+    try:
+        from app import TripPlannerApp
+        from streamlit_wrapper import SimpleTripPlannerWrapper
+    except ImportError as e:
+        logger.warning(f"ADK app unavailable, running in demo mode: {e}")
+        return None
+    return TripPlannerApp, SimpleTripPlannerWrapper
 
 # Page configuration
 st.set_page_config(
@@ -42,806 +61,26 @@ st.set_page_config(
 )
 
 # EaseMyTrip-inspired CSS styling
-st.markdown("""
-<style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    /* Reset and base styles */
-    * {
-        margin: 0;
-        padding: 0;
-        box-sizing: border-box;
-    }
-    
-    .main {
-        background: #f8f9fa;
-        font-family: 'Inter', sans-serif;
-        padding: 0;
-    }
-    
-    /* Add spacing to main container - left, right, and bottom only */
-    .stMainBlockContainer {
-        padding: 0rem 1rem 1rem 1rem !important;
-        margin: 0rem !important;
-    }
-    
-    /* Header Navigation */
-    .header-nav {
-        background: #fff;
-        padding: 1rem 0;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.08);
-        position: sticky;
-        top: 0;
-        z-index: 1000;
-        margin-bottom: 0.5rem;
-    }
-    
-    .nav-container {
-        max-width: 1200px;
-        margin: 0 auto;
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        padding: 0 2rem;
-        position: relative;
-    }
-    
-    .logo {
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-        order: -1; /* Ensures logo stays on the left */
-    }
-    
-    .logo-text {
-        font-size: 1.8rem;
-        font-weight: 700;
-        color: #1e40af;
-    }
-    
-    .nav-menu {
-        display: flex;
-        gap: 2rem;
-        list-style: none;
-        margin: 0 auto; /* Center the navigation items */
-    }
-    
-    .nav-item {
-        color: #4b5563;
-        font-weight: 500;
-        text-decoration: none;
-        padding: 0.5rem 1rem;
-        border-radius: 6px;
-        transition: all 0.3s ease;
-    }
-    
-    .nav-item:hover {
-        background: #eff6ff;
-        color: #1e40af;
-    }
-    
-    /* Hamburger Menu Styles */
-    .hamburger {
-        display: none;
-        flex-direction: column;
-        cursor: pointer;
-        padding: 0.5rem;
-        z-index: 1001;
-    }
-    
-    .hamburger span {
-        width: 25px;
-        height: 3px;
-        background: #1e40af;
-        margin: 3px 0;
-        transition: 0.3s;
-        border-radius: 2px;
-    }
-    
-    .hamburger.active span:nth-child(1) {
-        transform: rotate(-45deg) translate(-5px, 6px);
-    }
-    
-    .hamburger.active span:nth-child(2) {
-        opacity: 0;
-    }
-    
-    .hamburger.active span:nth-child(3) {
-        transform: rotate(45deg) translate(-5px, -6px);
-    }
-    
-    /* Mobile Navigation */
-    .nav-menu.mobile {
-        position: fixed;
-        top: 70px;
-        left: -100%;
-        width: 100%;
-        height: calc(100vh - 70px);
-        background: white;
-        flex-direction: column;
-        justify-content: flex-start;
-        align-items: center;
-        padding-top: 2rem;
-        transition: left 0.3s ease;
-        z-index: 1000;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-    }
-    
-    .nav-menu.mobile.active {
-        left: 0;
-    }
-    
-    .nav-menu.mobile .nav-item {
-        padding: 1rem 2rem;
-        width: 80%;
-        text-align: center;
-        border-bottom: 1px solid #e5e7eb;
-        margin: 0.5rem 0;
-    }
-    
-    /* Hero Section */
-    .hero-section {
-        background: linear-gradient(135deg, #1e40af 0%, #3b82f6 50%, #60a5fa 100%);
-        color: white;
-        padding: 3rem 0;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    
-    .hero-title {
-        font-size: 3rem;
-        font-weight: 700;
-        margin-bottom: 1rem;
-    }
-    
-    .hero-subtitle {
-        font-size: 1.2rem;
-        opacity: 0.9;
-        margin-bottom: 2rem;
-    }
-    
-    /* Search Widget Tabs */
-    .search-tabs {
-        background: white;
-        border-radius: 15px;
-        padding: 2rem;
-        box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-        margin: 2rem auto;
-        max-width: 1000px;
-    }
-    
-    .tab-header {
-        display: flex;
-        border-bottom: 2px solid #e5e7eb;
-        margin-bottom: 2rem;
-    }
-    
-    .tab-button {
-        padding: 1rem 2rem;
-        background: none;
-        border: none;
-        font-weight: 600;
-        color: #6b7280;
-        cursor: pointer;
-        border-bottom: 3px solid transparent;
-        transition: all 0.3s ease;
-    }
-    
-    .tab-button.active {
-        color: #1e40af;
-        border-bottom-color: #1e40af;
-    }
-    
-    /* Form container */
-    .form-container {
-        background: white;
-        padding: 2rem;
-        border-radius: 15px;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-        margin-bottom: 2rem;
-        border: 1px solid #e0e0e0;
-    }
-    
-    /* Section headers */
-    .section-header {
-        color: #1f2937;
-        font-size: 1.4rem;
-        font-weight: 600;
-        margin-bottom: 1.5rem;
-        padding-bottom: 0.5rem;
-        border-bottom: 2px solid #e2e8f0;
-        text-align: center;
-    }
-    
-    .form-label {
-        font-weight: 600;
-        color: #374151;
-        margin-bottom: 0.5rem;
-        font-size: 0.9rem;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-    
-    /* Input styling */
-    .stTextInput > div > div > input,
-    .stSelectbox > div > div > select,
-    .stDateInput > div > div > input,
-    .stNumberInput > div > div > input,
-    .stTextArea > div > div > textarea {
-        border: 2px solid #e5e7eb;
-        border-radius: 8px;
-        padding: 0.75rem;
-        font-size: 1rem;
-        transition: all 0.3s ease;
-        font-family: 'Inter', sans-serif;
-    }
-    
-    .stTextInput > div > div > input:focus,
-    .stSelectbox > div > div > select:focus,
-    .stDateInput > div > div > input:focus,
-    .stNumberInput > div > div > input:focus,
-    .stTextArea > div > div > textarea:focus {
-        border-color: #3b82f6;
-        box-shadow: 0 0 0 3px rgba(59, 130, 246, 0.1);
-    }
-    
-    /* Button styling */
-    .stButton > button {
-        background: linear-gradient(45deg, #1e40af, #3b82f6) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 8px !important;
-        padding: 1rem 2rem !important;
-        font-size: 1.1rem !important;
-        font-weight: 600 !important;
-        cursor: pointer !important;
-        transition: all 0.3s ease !important;
-        width: 100% !important;
-        font-family: 'Inter', sans-serif !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 6px 20px rgba(30, 64, 175, 0.3) !important;
-    }
-    
-    /* Quick Actions */
-    .quick-actions {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-        gap: 1rem;
-        margin: 2rem 0;
-    }
-    
-    .quick-btn {
-        background: linear-gradient(45deg, #06b6d4, #0891b2);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        border: none;
-        font-weight: 500;
-    }
-    
-    .quick-btn:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 6px 20px rgba(6, 182, 212, 0.3);
-    }
-    
-    /* Text Input Alternative */
-    .text-input-section {
-        background: #f0f9ff;
-        padding: 2rem;
-        border-radius: 15px;
-        margin: 2rem 0;
-        border-left: 4px solid #0284c7;
-    }
-    
-    /* Result container */
-    .result-container {
-        background: #f8fafc;
-        padding: 2rem;
-        border-radius: 15px;
-        border: 1px solid #e2e8f0;
-        margin-top: 2rem;
-    }
-    
-    /* Success message */
-    .success-banner {
-        background: linear-gradient(90deg, #10b981, #059669);
-        color: white;
-        padding: 1rem 2rem;
-        border-radius: 10px;
-        margin-bottom: 1rem;
-        text-align: center;
-        font-weight: 600;
-    }
-    
-    /* Vertical Timeline Styles */
-    .timeline-container {
-        position: relative;
-        max-width: 800px;
-        margin: 2rem auto;
-        padding: 2rem 0;
-    }
-    
-    /* Main vertical line connecting all items */
-    .timeline-container::before {
-        content: '';
-        position: absolute;
-        left: 50%;
-        top: 0;
-        bottom: 0;
-        width: 2px;
-        background: linear-gradient(180deg, #cbd5e0 0%, #667eea 20%, #764ba2 50%, #667eea 80%, #cbd5e0 100%);
-        border-radius: 2px;
-        transform: translateX(-50%);
-        z-index: 0;
-    }
-    
-    /* Plain text styles for first and last items - attached to line */
-    .plain-item {
-        background: #f8fafc;
-        border: 2px solid #667eea;
-        border-radius: 12px;
-        padding: 1.5rem;
-        margin: 2rem auto;
-        max-width: 400px;
-        text-align: center;
-        color: #4a5568;
-        font-size: 1rem;
-        line-height: 1.6;
-        position: relative;
-        z-index: 2;
-        /* Attach to the vertical line */
-        border-left: 4px solid #667eea;
-    }
-    
-    .plain-item-title {
-        font-size: 1.3rem;
-        font-weight: 600;
-        color: #667eea;
-        margin-bottom: 0.8rem;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        gap: 0.5rem;
-    }
-    
-    .timeline {
-        position: relative;
-        padding: 2rem 0;
-    }
-    
-    .timeline::before {
-        content: '';
-        position: absolute;
-        left: 50%;
-        top: 0;
-        bottom: 0;
-        width: 3px;
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 50%, #667eea 100%);
-        border-radius: 2px;
-        transform: translateX(-50%);
-        z-index: 1;
-    }
-    
-    .timeline-item {
-        position: relative;
-        margin: 3rem 0;
-        width: 100%;
-    }
-    
-    /* Centered items (Day 1) - attached to line */
-    .timeline-item.center .timeline-content {
-        margin: 0 auto;
-        text-align: center;
-        max-width: 400px;
-        /* Attach to the vertical line */
-        border-left: 4px solid #667eea;
-    }
-    
-    /* Left-aligned items */
-    .timeline-item.left .timeline-content {
-        margin-left: 0;
-        margin-right: 52%;
-        padding-right: 2rem;
-        text-align: left;
-    }
-    
-    /* Right-aligned items */
-    .timeline-item.right .timeline-content {
-        margin-left: 52%;
-        margin-right: 0;
-        padding-left: 2rem;
-        text-align: left;
-    }
-    
-    .timeline-content {
-        background: white;
-        border-radius: 12px;
-        padding: 1.2rem;
-        box-shadow: 0 6px 20px rgba(0,0,0,0.08);
-        position: relative;
-        border: 2px solid #f1f5f9;
-        transition: all 0.3s ease;
-        max-width: 350px;
-    }
-    
-    .timeline-content:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 12px 28px rgba(0,0,0,0.12);
-        border-color: #667eea;
-    }
-    
-    /* Remove circle markers for centered items, keep for left/right items */
-    .timeline-item.left .timeline-marker,
-    .timeline-item.right .timeline-marker {
-        position: absolute;
-        left: 50%;
-        top: 50%;
-        width: 18px;
-        height: 18px;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border: 3px solid white;
-        border-radius: 50%;
-        transform: translate(-50%, -50%);
-        z-index: 2;
-        box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.2);
-    }
-    
-    /* Hide marker for centered items */
-    .timeline-item.center .timeline-marker {
-        display: none;
-    }
-    
-    .timeline-day {
-        font-size: 1.3rem;
-        font-weight: 700;
-        color: #667eea;
-        margin-bottom: 0.6rem;
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-    }
-    
-    /* Center the day label for centered items */
-    .timeline-item.center .timeline-day {
-        justify-content: center;
-    }
-    
-    .timeline-activities {
-        color: #4a5568;
-        line-height: 1.5;
-        font-size: 0.9rem;
-    }
-    
-    .timeline-activities ul {
-        margin: 0.5rem 0;
-        padding-left: 1.2rem;
-    }
-    
-    .timeline-activities li {
-        margin: 0.25rem 0;
-        color: #2d3748;
-    }
-    
-    /* Payment Section Styles */
-    .payment-section {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 2rem;
-        border-radius: 20px;
-        margin: 2rem 0;
-        color: white;
-        text-align: center;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-    }
-    
-    .payment-title {
-        font-size: 2rem;
-        font-weight: 700;
-        margin-bottom: 1rem;
-        color: white;
-    }
-    
-    .payment-subtitle {
-        font-size: 1.1rem;
-        margin-bottom: 2rem;
-        opacity: 0.9;
-    }
-    
-    .payment-button {
-        background: white;
-        color: #667eea;
-        padding: 1rem 2rem;
-        border-radius: 50px;
-        font-weight: 600;
-        font-size: 1.1rem;
-        text-decoration: none;
-        display: inline-flex;
-        align-items: center;
-        gap: 0.5rem;
-        transition: all 0.3s ease;
-        border: none;
-        cursor: pointer;
-        box-shadow: 0 4px 15px rgba(255,255,255,0.3);
-    }
-    
-    .payment-button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 25px rgba(255,255,255,0.4);
-        color: #5a67d8;
-    }
-    
-    /* Mobile Responsive Timeline */
-    @media (max-width: 768px) {
-        .timeline::before {
-            left: 20px;
-        }
-        
-        .timeline-container::before {
-            left: 20px;
-        }
-        
-        .timeline-item.left .timeline-content,
-        .timeline-item.right .timeline-content {
-            margin-left: 60px;
-            margin-right: 0;
-            padding-left: 1rem;
-            padding-right: 1rem;
-            text-align: left;
-            max-width: calc(100vw - 120px);
-        }
-        
-        .timeline-item.center .timeline-content {
-            margin-left: 60px;
-            margin-right: 0;
-            padding-left: 1rem;
-            padding-right: 1rem;
-            text-align: left;
-            max-width: calc(100vw - 120px);
-            border-left: 4px solid #667eea;
-        }
-        
-        .timeline-item.left .timeline-marker,
-        .timeline-item.right .timeline-marker {
-            left: 20px;
-        }
-        
-        .timeline-container {
-            padding: 1rem 0;
-            max-width: 100%;
-        }
-        
-        .plain-item {
-            margin: 1rem;
-            max-width: calc(100vw - 2rem);
-            border-left: 4px solid #667eea;
-        }
-    }
-        }
-        
-        .timeline {
-            padding: 0 1rem;
-        }
-    }
-    
-    /* Horizontal Flashcard styles */
-    .flashcard-container {
-        display: flex;
-        flex-direction: column;
-        gap: 1rem;
-        margin: 2rem 0;
-    }
-    
-    .day-flashcard {
-        background: white;
-        border-radius: 15px;
-        border-left: 6px solid #667eea;
-        padding: 1.5rem;
-        width: 100%;
-        min-height: 120px;
-        color: #2d3748;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        transition: all 0.3s ease;
-        cursor: pointer;
-        position: relative;
-        overflow: hidden;
-        display: flex;
-        align-items: center;
-        gap: 2rem;
-    }
-    
-    .day-flashcard:hover {
-        transform: translateX(5px);
-        box-shadow: 0 8px 25px rgba(0,0,0,0.15);
-        border-left-width: 8px;
-    }
-    
-    .day-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 1rem 1.5rem;
-        border-radius: 12px;
-        text-align: center;
-        min-width: 140px;
-        flex-shrink: 0;
-    }
-    
-    .day-number {
-        font-size: 1.8rem;
-        font-weight: 800;
-        margin-bottom: 0.3rem;
-    }
-    
-    .day-title {
-        font-size: 1rem;
-        font-weight: 600;
-        margin-bottom: 0.3rem;
-        color: white;
-        opacity: 0.9;
-    }
-    
-    .day-content {
-        flex-grow: 1;
-        color: #4a5568;
-    }
-    
-    .day-activities {
-        font-size: 0.9rem;
-        line-height: 1.6;
-        color: #4a5568;
-        margin: 0;
-        max-height: none;
-        overflow: visible;
-    }
-    
-    .attractions-section {
-        margin: 1.5rem 0;
-        padding: 1.5rem;
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-        border-radius: 15px;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-    }
-    
-    .attractions-title {
-        color: #2d3748;
-        font-size: 1.8rem;
-        font-weight: 700;
-        margin-bottom: 1.5rem;
-        text-align: center;
-    }
-    
-    .attraction-card {
-        background: white;
-        border-radius: 15px;
-        overflow: hidden;
-        box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-        transition: all 0.3s ease;
-        position: relative;
-        margin-bottom: 1rem;
-        height: 320px;
-        display: flex;
-        flex-direction: column;
-    }
-    
-    .attraction-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 8px 30px rgba(0,0,0,0.15);
-    }
-    
-    .attraction-image {
-        width: 100%;
-        height: 180px;
-        object-fit: cover;
-        border-radius: 0;
-        flex-shrink: 0;
-    }
-    
-    .attraction-content {
-        padding: 1rem;
-        flex-grow: 1;
-        display: flex;
-        flex-direction: column;
-    }
-    
-    .attraction-name {
-        font-size: 1.1rem;
-        font-weight: 600;
-        color: #2d3748;
-        margin-bottom: 0.5rem;
-        line-height: 1.3;
-    }
-    
-    .attraction-rating {
-        margin-bottom: 0.5rem;
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-    }
-    
-    .rating-badge {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 0.2rem 0.6rem;
-        border-radius: 15px;
-        font-size: 0.8rem;
-        font-weight: 600;
-        min-width: 35px;
-        text-align: center;
-    }
-    
-    .attraction-type {
-        color: #718096;
-        font-size: 0.8rem;
-        background: #edf2f7;
-        padding: 0.3rem 0.8rem;
-        border-radius: 15px;
-        display: inline-block;
-        margin-bottom: 0.5rem;
-        width: fit-content;
-    }
-    
-    .attraction-description {
-        color: #718096;
-        font-size: 0.85rem;
-        line-height: 1.4;
-        margin-top: auto;
-        flex-grow: 1;
-    }
-    
-    /* Hide Streamlit elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    .stDeployButton {visibility: hidden;}
-    
-    /* Responsive design */
-    @media (max-width: 768px) {
-        .hero-title {
-            font-size: 2rem;
-        }
-        
-        .nav-container {
-            padding: 0 1rem;
-        }
-        
-        .hamburger {
-            display: flex;
-        }
-        
-        .nav-menu:not(.mobile) {
-            display: none;
-        }
-        
-        .nav-container > div:last-child {
-            display: none; /* Hide "AI-Powered Travel Planning" text on mobile */
-        }
-        
-        .search-tabs {
-            margin: 1rem;
-            padding: 1rem;
-        }
-        
-        .logo-text {
-            font-size: 1.5rem;
-        }
-    }
-    
-    @media (max-width: 480px) {
-        .nav-container {
-            padding: 0 0.5rem;
-        }
-        
-        .logo-text {
-            font-size: 1.3rem;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_WS_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r' ?([{};,>]) ?')
+
+
+def _minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet."""
+    css = _CSS_COMMENT_RE.sub('', css)
+    css = _CSS_WS_RE.sub(' ', css)
+    css = _CSS_PUNCT_RE.sub(r'\1', css)
+    return css.replace(': ', ':').replace(';}', '}').strip()
+
+
+@_cache()
+def _load_css() -> str:
+    """Read and minify the app stylesheet once; reruns reuse the cached text."""
+    return _minify_css((current_dir / "static" / "easytrip.css").read_text(encoding="utf-8"))
+
+
+st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
 
 def create_header():
     """Create EaseMyTrip-style header navigation with quick access links"""
@@ -874,49 +113,219 @@ def create_hero_section():
     </div>
     """, unsafe_allow_html=True)
 
+# Voice/text parsing patterns, compiled once at import. They match
+# case-insensitively so the input is searched as typed.
+#
+# The patterns run on free text of any length, so each is kept linear-time:
+# a leading digit run only starts where the run does ((?<!\d)), and the gap
+# between a keyword and what it introduces is bounded ({0,100}) instead of
+# scanning the rest of the text from every keyword.
+_DESTINATION_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?:go to|visit|travel to|trip to|vacation to|holiday to|planning.{0,100}?to)\s+([^,.\n!?]+?)(?:[,.\n!?]|for|in|during|with|and|starting|from|$)',
+    r'(?:destination is|going to|flying to|heading to|want to go to)\s+([^,.\n!?]+?)(?:[,.\n!?]|for|in|during|with|and|$)',
+    r'(?:want to see|explore|discover|planning.{0,100}?in)\s+([^,.\n!?]+?)(?:[,.\n!?]|for|in|during|with|and|$)',
+    r'(?:visiting|touring)\s+([^,.\n!?]+?)(?:[,.\n!?]|for|in|during|with|and|$)',
+))
+_STOPWORD_RE = re.compile(r'\b(the|in|at|to|for|a|an)\b', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+
+# Structured prompts like "5 day trip to Goa for 2 people" carry nothing
+# beyond destination, duration and group size, so a full match of this
+# pattern skips the cascades below
+_FAST_PATH_RE = re.compile(
+    r'\s*(?P<days>\d+)[- ]days?\s+(?:trip|vacation|holiday)\s+to\s+(?P<destination>[a-z][a-z ]*?)'
+    r'\s+for\s+(?P<travelers>\d+)\s+(?:people|persons?)\s*[.!]?\s*',
+    re.IGNORECASE,
+)
+
+_DURATION_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?<!\d)(\d+)\s*(?:days?|day)\s*(?:trip|vacation|holiday|tour)?',
+    r'for\s*(\d+)\s*(?:days?|day)',
+    r'(?<!\d)(\d+)(?:-|\s*)day\s*(?:trip|vacation|holiday)',
+    r'stay(?:ing)?\s*(?:for\s*)?(\d+)\s*(?:days?|day)',
+    r'(?<!\d)(\d+)\s*(?:weeks?|week)',  # Handle weeks
+    r'a\s*week' # Handle "a week"
+))
+_ONE_WEEK_RE = re.compile(r'a week|one week', re.IGNORECASE)
+
+_TRAVELER_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?<!\d)(\d+)\s*(?:people|persons?|travelers?|travellers?|guests?|adults?)',
+    r'(?:group of|party of|team of|with)\s*(\d+)',
+    r'(?<!\d)(\d+)\s*(?:of us|in our group|in the group)',
+    r'(?:we are|there are|there will be)\s*(\d+)',
+    r'for\s*(\d+)\s*(?:people|persons?|travelers?|adults?)',
+    r'me and (\d+) others?',  # "me and 2 others" = 3 people
+))
+
+# Checked in order; the first category with a keyword anywhere in the text wins
+_TRAVEL_TYPE_KEYWORDS = {
+    'solo': ['solo', 'alone', 'myself', 'by myself', 'single traveler', 'just me'],
+    'couple': ['couple', 'partner', 'boyfriend', 'girlfriend', 'husband', 'wife', 'spouse', 'my partner', 'with my'],
+    'family': ['family', 'kids', 'children', 'parents', 'family trip', 'with family'],
+    'friends': ['friends', 'buddies', 'mates', 'group', 'with friends'],
+    'business': ['business', 'work', 'conference', 'meeting', 'business trip']
+}
+_TRAVEL_TYPE_RE = {
+    travel_type: re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+    for travel_type, keywords in _TRAVEL_TYPE_KEYWORDS.items()
+}
+
+_BUDGET_KEYWORDS = {
+    'low': ['cheap', 'budget', 'affordable', 'low cost', 'economical', 'inexpensive', 'tight budget'],
+    'medium': ['medium', 'moderate', 'mid-range', 'reasonable', 'average', 'middle'],
+    'high': ['luxury', 'premium', 'expensive', 'high-end', 'upscale', 'lavish', 'fancy', 'splurge']
+}
+_BUDGET_RE = {
+    budget_type: re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+    for budget_type, keywords in _BUDGET_KEYWORDS.items()
+}
+
+_RUPEE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?<!\d)₹?(\d+(?:,\d{3}){0,4})\s*(?:per day|daily|each day|a day)',
+    r'budget\s*of\s*₹?(\d+(?:,\d{3}){0,4})',
+    r'(?<!\d)₹?(\d+(?:,\d{3}){0,4})\s*budget',
+    r'around\s*₹?(\d+(?:,\d{3}){0,4})',
+    r'about\s*₹?(\d+(?:,\d{3}){0,4})',
+))
+# Daily amounts below ₹6,200 (approx $75) are low and below ₹16,600
+# (approx $200) medium; anything else is high
+_RUPEE_THRESHOLDS = (6200, 16600)
+_RUPEE_BUDGET_LABELS = ('low', 'medium', 'high')
+
+_INTEREST_KEYWORDS = {
+    'cultural': ['culture', 'cultural', 'heritage', 'tradition', 'traditional'],
+    'food': ['food', 'cuisine', 'eating', 'restaurants', 'dining', 'culinary'],
+    'temples': ['temple', 'temples', 'shrine', 'shrines', 'religious'],
+    'photography': ['photography', 'photos', 'pictures', 'instagram', 'camera'],
+    'museums': ['museum', 'museums', 'gallery', 'galleries', 'exhibitions'],
+    'nightlife': ['nightlife', 'bars', 'clubs', 'evening', 'night'],
+    'nature': ['nature', 'outdoors', 'hiking', 'mountains', 'forests', 'parks'],
+    'shopping': ['shopping', 'shops', 'markets', 'boutiques', 'souvenirs'],
+    'adventure': ['adventure', 'activities', 'sports', 'extreme', 'adrenaline'],
+    'relaxation': ['relax', 'relaxation', 'spa', 'wellness', 'peaceful', 'calm'],
+    'history': ['history', 'historical', 'historic', 'ancient', 'old'],
+    'art': ['art', 'artistic', 'paintings', 'sculptures', 'artists'],
+    'architecture': ['architecture', 'buildings', 'churches', 'castles'],
+    'local experiences': ['local', 'authentic', 'real', 'genuine', 'native']
+}
+# Interests match whole words, so the text is tokenized once and each
+# interest is a single set intersection. Words also match with a trailing
+# inflection removed ("museums", "relaxing", "relaxed"), as they did when
+# keywords were matched as substrings of the text.
+_INTEREST_KEYWORD_SETS = {
+    interest: frozenset(keywords) for interest, keywords in _INTEREST_KEYWORDS.items()
+}
+_WORD_RE = re.compile(r"[a-z']+", re.IGNORECASE)
+_INFLECTION_SUFFIXES = ('s', 'ing', 'ed', 'ly')
+
+_MONTH_NAMES = "january|february|march|april|may|june|july|august|september|october|november|december"
+_MONTH_ABBRS = "jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec"
+# Full and abbreviated month names both resolve with one dict lookup
+_MONTH_NUMBERS = {
+    **{name: i for i, name in enumerate(_MONTH_NAMES.split("|"), 1)},
+    **{name: i for i, name in enumerate(_MONTH_ABBRS.split("|"), 1)},
+}
+
+_DATE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    # Month Day, Year or Month Day Year
+    rf'({_MONTH_NAMES})\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s*(\d{{4}})?',
+    # Month Year (without day)
+    rf'in\s+({_MONTH_NAMES})\s*(\d{{4}})?',
+    # Abbreviated months
+    rf'({_MONTH_ABBRS})\s+(\d{{1,2}}),?\s*(\d{{4}})?',
+    # Departure/return patterns
+    rf'(?:depart|departing|leaving|start).{{0,100}}?(?:on\s+)?(?:in\s+)?({_MONTH_NAMES})\s*(\d{{1,2}})?,?\s*(\d{{4}})?',
+    rf'(?:return|returning|coming back|end).{{0,100}}?(?:on\s+)?(?:in\s+)?({_MONTH_NAMES})\s*(\d{{1,2}})?,?\s*(\d{{4}})?',
+))
+
+
+def _clean_destination(destination: str) -> Optional[str]:
+    """Strip filler words from a captured destination and capitalize each word, or None if too short"""
+    # Clean up common words and improve formatting
+    destination = _STOPWORD_RE.sub('', destination.strip()).strip()
+    destination = _WS_RE.sub(' ', destination)  # Remove extra spaces
+    if len(destination) > 2:
+        # Capitalize properly (each word)
+        return string.capwords(destination)
+    return None
+
+def _extract_start_date(text: str) -> Optional[datetime]:
+    """Return the trip start date mentioned in text, moved to next year if already past, or None"""
+    current_year = datetime.now().year
+    
+    # Later patterns (departure/return phrases) take precedence over earlier
+    # ones, so they are tried first and the first valid date is returned
+    for pattern in reversed(_DATE_PATTERNS):
+        for match in pattern.finditer(text):
+            groups = match.groups()
+            month_str = groups[0].lower()
+            
+            # Get month number
+            month_num = _MONTH_NUMBERS.get(month_str)
+            
+            if month_num:
+                # Get day (default to 15 if not specified)
+                day = 15
+                if len(groups) > 1 and groups[1]:
+                    try:
+                        day = int(groups[1])
+                    except:
+                        pass
+                
+                # Get year (default to current or next year)
+                year = current_year
+                if len(groups) > 2 and groups[2]:
+                    try:
+                        year = int(groups[2])
+                    except:
+                        pass
+                
+                # If the date would be in the past, assume next year
+                try:
+                    test_date = datetime(year, month_num, day)
+                    if test_date < datetime.now():
+                        year += 1
+                    
+                    return datetime(year, month_num, day)
+                except ValueError:
+                    continue  # Invalid date, try next match
+    
+    return None
+
+# Parsing is deterministic in the text apart from defaulting dates against
+# today, so cached results are only kept for an hour
+@_cache(ttl=60 * 60)
 def parse_voice_text_to_form_data(text: str) -> Dict:
     """Parse voice/text input and extract structured travel information"""
     if not text:
         return {}
     
-    text_lower = text.lower()
+    # Fast path for the common structured prompt
+    match = _FAST_PATH_RE.fullmatch(text)
+    if match:
+        destination = _clean_destination(match.group('destination'))
+        days = int(match.group('days'))
+        travelers = int(match.group('travelers'))
+        if destination and 1 <= days <= 365 and 1 <= travelers <= 50:
+            return {'destination': destination, 'num_days': days, 'num_travelers': travelers}
+    
     parsed_data = {}
     
     # Extract destination using enhanced patterns
-    destination_patterns = [
-        r'(?:go to|visit|travel to|trip to|vacation to|holiday to|planning.*?to)\s+([^,.\n!?]+?)(?:[,.\n!?]|for|in|during|with|and|starting|from|$)',
-        r'(?:destination is|going to|flying to|heading to|want to go to)\s+([^,.\n!?]+?)(?:[,.\n!?]|for|in|during|with|and|$)',
-        r'(?:want to see|explore|discover|planning.*?in)\s+([^,.\n!?]+?)(?:[,.\n!?]|for|in|during|with|and|$)',
-        r'(?:visiting|touring)\s+([^,.\n!?]+?)(?:[,.\n!?]|for|in|during|with|and|$)',
-    ]
-    
-    for pattern in destination_patterns:
-        match = re.search(pattern, text_lower)
+    for pattern in _DESTINATION_PATTERNS:
+        match = pattern.search(text)
         if match:
-            destination = match.group(1).strip()
-            # Clean up common words and improve formatting
-            destination = re.sub(r'\b(the|in|at|to|for|a|an)\b', '', destination).strip()
-            destination = re.sub(r'\s+', ' ', destination)  # Remove extra spaces
-            if len(destination) > 2:
-                # Capitalize properly (each word)
-                parsed_data['destination'] = ' '.join(word.capitalize() for word in destination.split())
+            destination = _clean_destination(match.group(1))
+            if destination:
+                parsed_data['destination'] = destination
                 break
     
     # Extract duration with more patterns
-    duration_patterns = [
-        r'(\d+)\s*(?:days?|day)\s*(?:trip|vacation|holiday|tour)?',
-        r'for\s*(\d+)\s*(?:days?|day)',
-        r'(\d+)(?:-|\s*)day\s*(?:trip|vacation|holiday)',
-        r'stay(?:ing)?\s*(?:for\s*)?(\d+)\s*(?:days?|day)',
-        r'(\d+)\s*(?:weeks?|week)',  # Handle weeks
-        r'a\s*week' # Handle "a week"
-    ]
-    
-    for pattern in duration_patterns:
-        match = re.search(pattern, text_lower)
+    for pattern in _DURATION_PATTERNS:
+        match = pattern.search(text)
         if match:
-            if 'week' in pattern:
-                if 'a week' in text_lower or 'one week' in text_lower:
+            if 'week' in pattern.pattern:
+                if _ONE_WEEK_RE.search(text):
                     days = 7
                 else:
                     days = int(match.group(1)) * 7  # Convert weeks to days
@@ -929,180 +338,70 @@ def parse_voice_text_to_form_data(text: str) -> Dict:
                 start_date = parsed_data.get('start_date')
                 if start_date:
                     try:
-                        start = datetime.strptime(start_date, "%Y-%m-%d")
+                        start = datetime.strptime(start_date, _DATE_FMT)
                         end = start + timedelta(days=days)
-                        parsed_data['end_date'] = end.strftime("%Y-%m-%d")
+                        parsed_data['end_date'] = end.strftime(_DATE_FMT)
                     except:
                         pass
                 break
     
     # Extract number of travelers with enhanced patterns
-    traveler_patterns = [
-        r'(\d+)\s*(?:people|persons?|travelers?|travellers?|guests?|adults?)',
-        r'(?:group of|party of|team of|with)\s*(\d+)',
-        r'(\d+)\s*(?:of us|in our group|in the group)',
-        r'(?:we are|there are|there will be)\s*(\d+)',
-        r'for\s*(\d+)\s*(?:people|persons?|travelers?|adults?)',
-        r'me and (\d+) others?',  # "me and 2 others" = 3 people
-    ]
-    
-    for pattern in traveler_patterns:
-        match = re.search(pattern, text_lower)
+    for pattern in _TRAVELER_PATTERNS:
+        match = pattern.search(text)
         if match:
             num = int(match.group(1))
             # Handle "me and X others" case
-            if 'me and' in pattern and 'others' in pattern:
+            if 'me and' in pattern.pattern and 'others' in pattern.pattern:
                 num += 1  # Add 1 for "me"
             if 1 <= num <= 50:  # Reasonable range
                 parsed_data['num_travelers'] = num
                 break
     
     # Extract travel type with enhanced detection
-    if any(word in text_lower for word in ['solo', 'alone', 'myself', 'by myself', 'single traveler', 'just me']):
-        parsed_data['travel_type'] = 'solo'
-        parsed_data['num_travelers'] = 1
-    elif any(word in text_lower for word in ['couple', 'partner', 'boyfriend', 'girlfriend', 'husband', 'wife', 'spouse', 'my partner', 'with my']):
-        parsed_data['travel_type'] = 'couple'
-        if 'num_travelers' not in parsed_data:
-            parsed_data['num_travelers'] = 2
-    elif any(word in text_lower for word in ['family', 'kids', 'children', 'parents', 'family trip', 'with family']):
-        parsed_data['travel_type'] = 'family'
-    elif any(word in text_lower for word in ['friends', 'buddies', 'mates', 'group', 'with friends']):
-        parsed_data['travel_type'] = 'friends'
-    elif any(word in text_lower for word in ['business', 'work', 'conference', 'meeting', 'business trip']):
-        parsed_data['travel_type'] = 'business'
+    for travel_type, pattern in _TRAVEL_TYPE_RE.items():
+        if pattern.search(text):
+            parsed_data['travel_type'] = travel_type
+            if travel_type == 'solo':
+                parsed_data['num_travelers'] = 1
+            elif travel_type == 'couple' and 'num_travelers' not in parsed_data:
+                parsed_data['num_travelers'] = 2
+            break
     
     # Extract budget with enhanced patterns and rupee amounts
-    budget_keywords = {
-        'low': ['cheap', 'budget', 'affordable', 'low cost', 'economical', 'inexpensive', 'tight budget'],
-        'medium': ['medium', 'moderate', 'mid-range', 'reasonable', 'average', 'middle'],
-        'high': ['luxury', 'premium', 'expensive', 'high-end', 'upscale', 'lavish', 'fancy', 'splurge']
-    }
-    
     # Check for specific rupee amounts
-    rupee_patterns = [
-        r'₹?(\d+(?:,\d{3})*)\s*(?:per day|daily|each day|a day)',
-        r'budget\s*of\s*₹?(\d+(?:,\d{3})*)',
-        r'₹?(\d+(?:,\d{3})*)\s*budget',
-        r'around\s*₹?(\d+(?:,\d{3})*)',
-        r'about\s*₹?(\d+(?:,\d{3})*)',
-    ]
-    
-    for pattern in rupee_patterns:
-        match = re.search(pattern, text_lower)
+    for pattern in _RUPEE_PATTERNS:
+        match = pattern.search(text)
         if match:
             amount = int(match.group(1).replace(',', ''))
-            if amount < 6200:  # Less than ₹6,200 (approx $75)
-                parsed_data['budget_range'] = 'low'
-            elif amount < 16600:  # Less than ₹16,600 (approx $200)
-                parsed_data['budget_range'] = 'medium'
-            else:
-                parsed_data['budget_range'] = 'high'
+            parsed_data['budget_range'] = _RUPEE_BUDGET_LABELS[bisect.bisect_right(_RUPEE_THRESHOLDS, amount)]
             break
     else:
         # Fall back to keyword detection
-        for budget_type, keywords in budget_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for budget_type, pattern in _BUDGET_RE.items():
+            if pattern.search(text):
                 parsed_data['budget_range'] = budget_type
                 break
     
     # Extract preferences/interests
-    interest_keywords = {
-        'cultural': ['culture', 'cultural', 'heritage', 'tradition', 'traditional'],
-        'food': ['food', 'cuisine', 'eating', 'restaurants', 'dining', 'culinary'],
-        'temples': ['temple', 'temples', 'shrine', 'shrines', 'religious'],
-        'photography': ['photography', 'photos', 'pictures', 'instagram', 'camera'],
-        'museums': ['museum', 'museums', 'gallery', 'galleries', 'exhibitions'],
-        'nightlife': ['nightlife', 'bars', 'clubs', 'evening', 'night'],
-        'nature': ['nature', 'outdoors', 'hiking', 'mountains', 'forests', 'parks'],
-        'shopping': ['shopping', 'shops', 'markets', 'boutiques', 'souvenirs'],
-        'adventure': ['adventure', 'activities', 'sports', 'extreme', 'adrenaline'],
-        'relaxation': ['relax', 'relaxation', 'spa', 'wellness', 'peaceful', 'calm'],
-        'history': ['history', 'historical', 'historic', 'ancient', 'old'],
-        'art': ['art', 'artistic', 'paintings', 'sculptures', 'artists'],
-        'architecture': ['architecture', 'buildings', 'churches', 'castles'],
-        'local experiences': ['local', 'authentic', 'real', 'genuine', 'native']
-    }
-    
-    preferences = []
-    for interest, keywords in interest_keywords.items():
-        if any(keyword in text_lower for keyword in keywords):
-            preferences.append(interest)
+    words = set()
+    for word in _WORD_RE.findall(text):
+        word = word.lower()
+        words.add(word)
+        words.update(word[:-len(suffix)] for suffix in _INFLECTION_SUFFIXES if word.endswith(suffix))
+    preferences = [interest for interest, keywords in _INTEREST_KEYWORD_SETS.items() if words & keywords]
     
     if preferences:
         parsed_data['preferences'] = preferences
     
     # Extract dates with enhanced patterns
-    from datetime import datetime, timedelta
-    import calendar
-    
-    month_names = ['january', 'february', 'march', 'april', 'may', 'june',
-                   'july', 'august', 'september', 'october', 'november', 'december']
-    month_abbr = ['jan', 'feb', 'mar', 'apr', 'may', 'jun',
-                  'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-    
-    # Date patterns to look for
-    date_patterns = [
-        # Month Day, Year or Month Day Year
-        r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2})(?:st|nd|rd|th)?,?\s*(\d{4})?',
-        # Month Year (without day)
-        r'in\s+(january|february|march|april|may|june|july|august|september|october|november|december)\s*(\d{4})?',
-        # Abbreviated months
-        r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+(\d{1,2}),?\s*(\d{4})?',
-        # Departure/return patterns
-        r'(?:depart|departing|leaving|start).*?(?:on\s+)?(?:in\s+)?(january|february|march|april|may|june|july|august|september|october|november|december)\s*(\d{1,2})?,?\s*(\d{4})?',
-        r'(?:return|returning|coming back|end).*?(?:on\s+)?(?:in\s+)?(january|february|march|april|may|june|july|august|september|october|november|december)\s*(\d{1,2})?,?\s*(\d{4})?',
-    ]
-    
-    current_year = datetime.now().year
-    
-    for pattern in date_patterns:
-        matches = re.finditer(pattern, text_lower)
-        for match in matches:
-            groups = match.groups()
-            month_str = groups[0].lower()
-            
-            # Get month number
-            month_num = None
-            if month_str in month_names:
-                month_num = month_names.index(month_str) + 1
-            elif month_str in month_abbr:
-                month_num = month_abbr.index(month_str) + 1
-            
-            if month_num:
-                # Get day (default to 15 if not specified)
-                day = 15
-                if len(groups) > 1 and groups[1]:
-                    try:
-                        day = int(groups[1])
-                    except:
-                        pass
-                
-                # Get year (default to current or next year)
-                year = current_year
-                if len(groups) > 2 and groups[2]:
-                    try:
-                        year = int(groups[2])
-                    except:
-                        pass
-                
-                # If the date would be in the past, assume next year
-                try:
-                    test_date = datetime(year, month_num, day)
-                    if test_date < datetime.now():
-                        year += 1
-                    
-                    start_date = datetime(year, month_num, day)
-                    parsed_data['start_date'] = start_date.strftime("%Y-%m-%d")
-                    
-                    # Calculate end date if we have duration
-                    if 'num_days' in parsed_data:
-                        end_date = start_date + timedelta(days=parsed_data['num_days'])
-                        parsed_data['end_date'] = end_date.strftime("%Y-%m-%d")
-                    
-                    break  # Stop after finding first valid date
-                except ValueError:
-                    continue  # Invalid date, try next pattern
+    start_date = _extract_start_date(text)
+    if start_date:
+        parsed_data['start_date'] = start_date.strftime(_DATE_FMT)
+        
+        # Calculate end date if we have duration
+        if 'num_days' in parsed_data:
+            end_date = start_date + timedelta(days=parsed_data['num_days'])
+            parsed_data['end_date'] = end_date.strftime(_DATE_FMT)
     
     return parsed_data
 
@@ -1180,43 +479,107 @@ def form_data_to_text(form_data):
     
     return ". ".join(text_parts) + "."
 
+# Smart-parsing patterns for text_to_form_data. Destinations are matched
+# case-sensitively (they start with a capital); the rest ignore case. They
+# are kept linear-time the same way as the voice/text patterns above; a
+# "City" before a "City, Country" comma is at most 50 characters.
+_FORM_DESTINATION_PATTERNS = tuple(re.compile(p) for p in (
+    r'(?:visit|to|in|going to)\s+([A-Z][a-zA-Z\s,]+?)(?:\s+for|\s+from|\s+with|\s+during|[.!?]|$)',
+    r'trip to\s+([A-Z][a-zA-Z\s,]+?)(?:\s+for|\s+from|\s+with|\s+during|[.!?]|$)',
+    r'([A-Z][a-zA-Z\s]{1,50},\s*[A-Z][a-zA-Z\s]+)(?:\s+for|\s+from|\s+with|\s+during|[.!?]|$)'
+))
+# Trailing "for/from/with/during ..." left on a captured destination
+_FORM_DESTINATION_CLEAN_RE = re.compile(r'(?<!\s)\s+(?:for|from|with|during).*$')
+
+_FORM_DURATION_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?<!\d)(\d+)\s*(?:days?|day)',
+    r'for\s+(\d+)\s*(?:days?|day)',
+    r'(?<!\d)(\d+)[-\s]*day'
+))
+
+_FORM_TRAVELER_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(?<!\d)(\d+)\s+(?:people|travelers?|persons?)',
+    r'with\s+(\d+)\s+(?:people|travelers?|persons?|friends?|family)',
+    r'group of\s+(\d+)',
+    r'(?<!\d)(\d+)\s+of us'
+))
+
+_FORM_BUDGET_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\$(\d+)(?:\s*per\s*day|\s*daily|\s*each|\s*pp)',
+    r'budget.{0,100}?\$(\d+)',
+    r'(?<!\d)(\d+)\s*dollars?\s*(?:per\s*day|daily)',
+))
+
+# Keyword groups for text_to_form_data, matched as substrings of the
+# lowercased text. Within a group the first label with a hit wins.
+_FORM_TRAVELER_KEYWORDS = {
+    1: ['solo', 'alone', 'by myself'],
+    2: ['couple', 'partner', 'boyfriend', 'girlfriend', 'husband', 'wife'],
+    4: ['family', 'kids', 'children'],
+    3: ['friends', 'group'],
+}
+_FORM_TRAVEL_TYPE_KEYWORDS = {
+    'solo': ['solo', 'alone', 'by myself'],
+    'couple': ['couple', 'romantic', 'honeymoon', 'partner', 'boyfriend', 'girlfriend', 'husband', 'wife'],
+    'family': ['family', 'kids', 'children', 'parents'],
+    'friends': ['friends', 'group', 'buddies'],
+    'business': ['business', 'work', 'conference', 'meeting'],
+}
+_FORM_BUDGET_KEYWORDS = {
+    'low': ['cheap', 'budget', 'low cost', 'affordable', 'backpack'],
+    'high': ['luxury', 'expensive', 'high end', 'premium', 'splurge'],
+}
+_FORM_PREFERENCE_KEYWORDS = {
+    'food': ['food', 'cuisine', 'restaurant', 'dining', 'eat', 'culinary'],
+    'cultural': ['culture', 'cultural', 'tradition', 'heritage', 'local'],
+    'temples': ['temple', 'shrine', 'religious', 'spiritual', 'church'],
+    'photography': ['photo', 'picture', 'instagram', 'scenic', 'views'],
+    'museums': ['museum', 'gallery', 'art', 'exhibit'],
+    'nightlife': ['nightlife', 'bar', 'club', 'party', 'drinks'],
+    'nature': ['nature', 'hiking', 'outdoor', 'wildlife', 'park'],
+    'shopping': ['shopping', 'market', 'souvenirs', 'retail'],
+    'adventure': ['adventure', 'extreme', 'thrill', 'adrenaline'],
+    'relaxation': ['relax', 'spa', 'wellness', 'peaceful', 'calm'],
+    'history': ['history', 'historical', 'ancient', 'historic'],
+    'architecture': ['architecture', 'building', 'design'],
+    'local experiences': ['local', 'authentic', 'traditional', 'immersive']
+}
+_FORM_KEYWORDS = frozenset(
+    keyword
+    for groups in (_FORM_TRAVELER_KEYWORDS, _FORM_TRAVEL_TYPE_KEYWORDS, _FORM_BUDGET_KEYWORDS, _FORM_PREFERENCE_KEYWORDS)
+    for keywords in groups.values()
+    for keyword in keywords
+)
+
+def _first_keyword_label(keyword_hits: set, groups: Dict[Any, List[str]], default: Any) -> Any:
+    """Return the first label in groups with a keyword among keyword_hits, or default"""
+    return next((label for label, keywords in groups.items() if not keyword_hits.isdisjoint(keywords)), default)
+
+# Like the voice/text parser, results only depend on the text and today's
+# date (for default trip dates), so they are kept for an hour
+@_cache(ttl=60 * 60)
 def text_to_form_data(text):
     """Extract form data from natural language text using smart parsing"""
     if not text or len(text.strip()) < 10:
         return {}
     
-    import re
-    from datetime import datetime, timedelta
-    
     text_lower = text.lower()
     form_data = {}
     
     # Extract destination (look for "to X" or "visit X" patterns)
-    destination_patterns = [
-        r'(?:visit|to|in|going to)\s+([A-Z][a-zA-Z\s,]+?)(?:\s+for|\s+from|\s+with|\s+during|[.!?]|$)',
-        r'trip to\s+([A-Z][a-zA-Z\s,]+?)(?:\s+for|\s+from|\s+with|\s+during|[.!?]|$)',
-        r'([A-Z][a-zA-Z\s]+,\s*[A-Z][a-zA-Z\s]+)(?:\s+for|\s+from|\s+with|\s+during|[.!?]|$)'
-    ]
-    
-    for pattern in destination_patterns:
-        match = re.search(pattern, text)
+    for pattern in _FORM_DESTINATION_PATTERNS:
+        match = pattern.search(text)
         if match:
             destination = match.group(1).strip()
             # Clean up common artifacts
-            destination = re.sub(r'\s+(?:for|from|with|during).*$', '', destination)
+            destination = _FORM_DESTINATION_CLEAN_RE.sub('', destination)
             if len(destination) > 3 and not destination.lower() in ['and', 'the', 'with']:
                 form_data['destination'] = destination
                 break
     
     # Extract duration
-    duration_patterns = [
-        r'(\d+)\s*(?:days?|day)',
-        r'for\s+(\d+)\s*(?:days?|day)',
-        r'(\d+)[-\s]*day'
-    ]
-    
-    for pattern in duration_patterns:
-        match = re.search(pattern, text_lower)
+    for pattern in _FORM_DURATION_PATTERNS:
+        match = pattern.search(text)
         if match:
             days = int(match.group(1))
             if 1 <= days <= 365:
@@ -1224,57 +587,27 @@ def text_to_form_data(text):
                 break
     
     # Extract number of travelers
-    traveler_patterns = [
-        r'(\d+)\s+(?:people|travelers?|persons?)',
-        r'with\s+(\d+)\s+(?:people|travelers?|persons?|friends?|family)',
-        r'group of\s+(\d+)',
-        r'(\d+)\s+of us'
-    ]
-    
-    for pattern in traveler_patterns:
-        match = re.search(pattern, text_lower)
+    for pattern in _FORM_TRAVELER_PATTERNS:
+        match = pattern.search(text)
         if match:
             travelers = int(match.group(1))
             if 1 <= travelers <= 20:
                 form_data['num_travelers'] = travelers
                 break
     
+    # Every keyword below is looked up once; each group is then a set check
+    keyword_hits = {keyword for keyword in _FORM_KEYWORDS if keyword in text_lower}
+    
     # If no explicit travelers mentioned, infer from travel type
     if 'num_travelers' not in form_data:
-        if any(word in text_lower for word in ['solo', 'alone', 'by myself']):
-            form_data['num_travelers'] = 1
-        elif any(word in text_lower for word in ['couple', 'partner', 'boyfriend', 'girlfriend', 'husband', 'wife']):
-            form_data['num_travelers'] = 2
-        elif any(word in text_lower for word in ['family', 'kids', 'children']):
-            form_data['num_travelers'] = 4
-        elif any(word in text_lower for word in ['friends', 'group']):
-            form_data['num_travelers'] = 3
-        else:
-            form_data['num_travelers'] = 2  # Default
+        form_data['num_travelers'] = _first_keyword_label(keyword_hits, _FORM_TRAVELER_KEYWORDS, 2)  # Default 2
     
     # Extract travel type
-    if any(word in text_lower for word in ['solo', 'alone', 'by myself']):
-        form_data['travel_type'] = 'solo'
-    elif any(word in text_lower for word in ['couple', 'romantic', 'honeymoon', 'partner', 'boyfriend', 'girlfriend', 'husband', 'wife']):
-        form_data['travel_type'] = 'couple'
-    elif any(word in text_lower for word in ['family', 'kids', 'children', 'parents']):
-        form_data['travel_type'] = 'family'
-    elif any(word in text_lower for word in ['friends', 'group', 'buddies']):
-        form_data['travel_type'] = 'friends'
-    elif any(word in text_lower for word in ['business', 'work', 'conference', 'meeting']):
-        form_data['travel_type'] = 'business'
-    else:
-        form_data['travel_type'] = 'couple'  # Default
+    form_data['travel_type'] = _first_keyword_label(keyword_hits, _FORM_TRAVEL_TYPE_KEYWORDS, 'couple')  # Default
     
     # Extract budget
-    budget_patterns = [
-        r'\$(\d+)(?:\s*per\s*day|\s*daily|\s*each|\s*pp)',
-        r'budget.*?\$(\d+)',
-        r'(\d+)\s*dollars?\s*(?:per\s*day|daily)',
-    ]
-    
-    for pattern in budget_patterns:
-        match = re.search(pattern, text_lower)
+    for pattern in _FORM_BUDGET_PATTERNS:
+        match = pattern.search(text)
         if match:
             budget = int(match.group(1))
             if 20 <= budget <= 2000:
@@ -1283,56 +616,25 @@ def text_to_form_data(text):
     
     # If no specific budget, categorize by keywords
     if 'budget_range' not in form_data:
-        if any(word in text_lower for word in ['cheap', 'budget', 'low cost', 'affordable', 'backpack']):
-            form_data['budget_range'] = 'low'
-        elif any(word in text_lower for word in ['luxury', 'expensive', 'high end', 'premium', 'splurge']):
-            form_data['budget_range'] = 'high'
-        else:
-            form_data['budget_range'] = 'medium'
+        form_data['budget_range'] = _first_keyword_label(keyword_hits, _FORM_BUDGET_KEYWORDS, 'medium')
     
     # Extract preferences/interests
-    preference_mapping = {
-        'food': ['food', 'cuisine', 'restaurant', 'dining', 'eat', 'culinary'],
-        'cultural': ['culture', 'cultural', 'tradition', 'heritage', 'local'],
-        'temples': ['temple', 'shrine', 'religious', 'spiritual', 'church'],
-        'photography': ['photo', 'picture', 'instagram', 'scenic', 'views'],
-        'museums': ['museum', 'gallery', 'art', 'exhibit'],
-        'nightlife': ['nightlife', 'bar', 'club', 'party', 'drinks'],
-        'nature': ['nature', 'hiking', 'outdoor', 'wildlife', 'park'],
-        'shopping': ['shopping', 'market', 'souvenirs', 'retail'],
-        'adventure': ['adventure', 'extreme', 'thrill', 'adrenaline'],
-        'relaxation': ['relax', 'spa', 'wellness', 'peaceful', 'calm'],
-        'history': ['history', 'historical', 'ancient', 'historic'],
-        'architecture': ['architecture', 'building', 'design'],
-        'local experiences': ['local', 'authentic', 'traditional', 'immersive']
-    }
-    
-    preferences = []
-    for pref, keywords in preference_mapping.items():
-        if any(keyword in text_lower for keyword in keywords):
-            preferences.append(pref)
+    preferences = [
+        pref for pref, keywords in _FORM_PREFERENCE_KEYWORDS.items()
+        if not keyword_hits.isdisjoint(keywords)
+    ]
     
     if not preferences:  # Default preferences
         preferences = ['cultural', 'food']
     
     form_data['preferences'] = preferences
     
-    # Extract dates (basic pattern matching)
-    import re
-    date_patterns = [
-        r'(\d{4}[-/]\d{1,2}[-/]\d{1,2})',
-        r'(\d{1,2}[-/]\d{1,2}[-/]\d{4})',
-        r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2})',
-        r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+(\d{1,2})'
-    ]
-    
     # For now, set default dates if duration is known
     if form_data.get('num_days'):
-        from datetime import date, timedelta
         start_date = date.today() + timedelta(days=30)
         end_date = start_date + timedelta(days=form_data['num_days'])
-        form_data['start_date'] = start_date.strftime("%Y-%m-%d")
-        form_data['end_date'] = end_date.strftime("%Y-%m-%d")
+        form_data['start_date'] = start_date.strftime(_DATE_FMT)
+        form_data['end_date'] = end_date.strftime(_DATE_FMT)
     
     return form_data
 
@@ -1344,25 +646,27 @@ def get_travel_preferences_form():
     st.markdown("### 💬 Quick Trip Description (Optional)")
     st.markdown("*Describe your trip in your own words, or use the detailed form below*")
     
-    user_text_input = st.text_area(
-        "",
-        placeholder='e.g., "I want to visit Tokyo, Japan for 5 days in November with my partner. We love food and temples. Budget is medium."',
-        help="Describe your trip preferences in natural language",
-        key="quick_text_input",
-        label_visibility="collapsed",
-        height=100
-    )
-    
-    if user_text_input and user_text_input.strip():
-        if st.button("🚀 Generate Trip from Description", type="primary", use_container_width=True):
-            with st.spinner("🤖 Understanding your request and generating itinerary..."):
-                # Parse the text input and generate itinerary
-                text_data = parse_text_input_to_preferences(user_text_input)
-                st.session_state.travel_data = text_data
-                st.session_state.input_method = "text"
-                result = generate_itinerary_with_adk_text(user_text_input)
-                st.session_state.itinerary_result = result
-                st.rerun()
+    # Typing in a form doesn't rerun the script; it is only read on submit
+    with st.form("quick_trip_form", clear_on_submit=False):
+        user_text_input = st.text_area(
+            "",
+            placeholder='e.g., "I want to visit Tokyo, Japan for 5 days in November with my partner. We love food and temples. Budget is medium."',
+            help="Describe your trip preferences in natural language",
+            key="quick_text_input",
+            label_visibility="collapsed",
+            height=100
+        )
+        submitted = st.form_submit_button("🚀 Generate Trip from Description", type="primary", use_container_width=True)
+    
+    if submitted and user_text_input and user_text_input.strip():
+        with st.spinner("🤖 Understanding your request and generating itinerary..."):
+            # Parse the text input and generate itinerary
+            text_data = parse_text_input_to_preferences(user_text_input)
+            st.session_state.travel_data = text_data
+            st.session_state.input_method = "text"
+            result = generate_itinerary_with_adk_text(user_text_input)
+            st.session_state.itinerary_result = result
+            st.rerun()
     
     st.markdown("---")
     st.markdown("### � Detailed Trip Form")
@@ -1401,7 +705,7 @@ def get_travel_preferences_form():
         start_date_value = date.today() + timedelta(days=30)
         if default_start:
             try:
-                start_date_value = datetime.strptime(default_start, "%Y-%m-%d").date()
+                start_date_value = datetime.strptime(default_start, _DATE_FMT).date()
             except:
                 pass
         
@@ -1420,7 +724,7 @@ def get_travel_preferences_form():
         end_date_value = date.today() + timedelta(days=35)
         if default_end:
             try:
-                end_date_value = datetime.strptime(default_end, "%Y-%m-%d").date()
+                end_date_value = datetime.strptime(default_end, _DATE_FMT).date()
             except:
                 pass
         elif get_default_value('num_days', 0):
@@ -1544,8 +848,8 @@ def get_travel_preferences_form():
     
     return {
         "destination": destination,
-        "start_date": start_date.strftime("%Y-%m-%d") if start_date else "",
-        "end_date": end_date.strftime("%Y-%m-%d") if end_date else "",
+        "start_date": start_date.strftime(_DATE_FMT) if start_date else "",
+        "end_date": end_date.strftime(_DATE_FMT) if end_date else "",
         "num_days": num_days,
         "num_travelers": int(num_travelers),
         "travel_type": travel_type,
@@ -1608,21 +912,64 @@ def show_example_buttons():
 @st.cache_resource
 def initialize_trip_planner():
     """Initialize the trip planner with caching"""
-    if not ADK_AVAILABLE:
+    adk = _load_adk()
+    if adk is None:
         return None
     try:
-        from streamlit_wrapper import SimpleTripPlannerWrapper
+        _, SimpleTripPlannerWrapper = adk
         wrapper = SimpleTripPlannerWrapper()
         return wrapper
     except Exception as e:
         st.error(f"Failed to initialize trip planner: {e}")
         return None
 
+class _UnsuccessfulPlan(Exception):
+    """Raised from _plan_trip so _session_memo doesn't keep a failed plan"""
+    
+    def __init__(self, result):
+        super().__init__("Trip planner returned an unsuccessful result")
+        self.result = result
+
+def _plan_trip(trip: tuple) -> Dict[str, Any]:
+    """
+    Run the ADK agents for a trip given its normalized inputs.
+    
+    Args:
+        trip: (destination with whitespace collapsed, num_days, num_travelers,
+            travel_type, budget_range, sorted preferences, start_date, end_date,
+            special_requirements), dates as YYYY-MM-DD; also the session memo key
+        
+    Returns:
+        Successful planner result dict
+        
+    Raises:
+        _UnsuccessfulPlan: If the planner didn't succeed or answered with an
+            error message, so the result isn't kept
+    """
+    (destination, num_days, num_travelers, travel_type, budget_range,
+     preferences, start_date, end_date, special_requirements) = trip
+    
+    # Convert travel input to the format expected by ADK
+    user_query = f"""
+    Plan a {num_days}-day trip to {destination} 
+    for {num_travelers} {travel_type} travelers.
+    Budget: {budget_range}
+    Interests: {', '.join(preferences)}
+    Dates: {start_date} to {end_date}
+    Special requirements: {', '.join(special_requirements)}
+    """
+    
+    result = initialize_trip_planner().process_message(user_query)
+    # The wrapper reports agent failures as a successful "❌ ..." response
+    if not (result and result.get("success")) or result.get("response", "").startswith("❌"):
+        raise _UnsuccessfulPlan(result)
+    return result
+
 def generate_itinerary_with_adk(travel_input):
     """Generate itinerary using the ADK system"""
     # Add debug information
     st.write("🔍 **Debug Information:**")
-    st.write(f"- ADK_AVAILABLE: {ADK_AVAILABLE}")
+    st.write(f"- ADK_AVAILABLE: {_load_adk() is not None}")
     
     trip_planner = initialize_trip_planner()
     st.write(f"- Trip planner initialized: {trip_planner is not None}")
@@ -1632,22 +979,27 @@ def generate_itinerary_with_adk(travel_input):
         return create_demo_itinerary(travel_input)
     
     try:
-        # Convert travel input to the format expected by ADK
-        user_query = f"""
-        Plan a {travel_input['num_days']}-day trip to {travel_input['destination']} 
-        for {travel_input['num_travelers']} {travel_input['travel_type']} travelers.
-        Budget: {travel_input['budget_range']}
-        Interests: {', '.join(travel_input['preferences'])}
-        Dates: {travel_input['start_date']} to {travel_input['end_date']}
-        Special requirements: {', '.join(travel_input.get('special_requirements', []))}
-        """
-        
         st.write(f"- Sending query to ADK agents...")
-        st.write(f"- Query preview: {user_query[:150]}...")
         
-        # Show that we're actually calling the agents
+        # Show that we're actually calling the agents. Resubmitting the same
+        # trip (after normalizing the inputs) in this session reuses the last
+        # successful plan.
+        trip = (
+            ' '.join(travel_input['destination'].split()),
+            int(travel_input['num_days']),
+            int(travel_input['num_travelers']),
+            travel_input['travel_type'],
+            str(travel_input['budget_range']),
+            tuple(sorted(travel_input['preferences'])),
+            travel_input['start_date'],
+            travel_input['end_date'],
+            tuple(travel_input.get('special_requirements', [])),
+        )
         with st.spinner("🤖 Calling ADK agents..."):
-            result = trip_planner.process_message(user_query)
+            try:
+                result = _session_memo("planned_trip", trip, _plan_trip)
+            except _UnsuccessfulPlan as e:
+                result = e.result
         
         st.write(f"- ADK result received: {result is not None}")
         if result:
@@ -1674,7 +1026,7 @@ def generate_itinerary_with_adk_text(user_text):
     """Generate itinerary from natural language text using ADK"""
     # Add debug information
     st.write("🔍 **Debug Information (Text Input):**")
-    st.write(f"- ADK_AVAILABLE: {ADK_AVAILABLE}")
+    st.write(f"- ADK_AVAILABLE: {_load_adk() is not None}")
     
     trip_planner = initialize_trip_planner()
     st.write(f"- Trip planner initialized: {trip_planner is not None}")
@@ -2170,15 +1522,13 @@ def get_nearby_attractions(destination: str) -> List[Dict[str, Any]]:
         logger.error(f"Error getting nearby attractions: {e}")
         return []
 
-def display_timeline_itinerary(days_data: List[Dict[str, str]]):
-    """Display itinerary as a vertical timeline with plain first/last items and alternating middle items"""
-    if not days_data:
-        return
-    
-    st.markdown('<div class="timeline-container">', unsafe_allow_html=True)
-    
+def render_timeline(days_data: List[Dict[str, str]]) -> str:
+    """Build the HTML for the whole itinerary timeline, with plain first/last items and timeline middle items"""
     total_days = len(days_data)
-    timeline_item_counter = 0  # Counter for alternating left/right positioning
+    timeline_item_counter = 0  # Counter for numbering the timeline days
+    
+    parts = ['<div class="timeline-container">']
+    append = parts.append
     
     for i, day_info in enumerate(days_data):
         activities = day_info.get('activities', 'No activities planned')
@@ -2207,46 +1557,38 @@ def display_timeline_itinerary(days_data: List[Dict[str, str]]):
             timeline_item_counter += 1
         
         if is_plain_item:
-            # Display as plain item (first and last)
-            st.markdown(f"""
-            <div class="plain-item">
-                <div class="plain-item-title">
-                    {day_label}
-                </div>
-                <div>
-                    {formatted_activities}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            # Plain item (first and last)
+            append(
+                f'<div class="plain-item"><div class="plain-item-title">{day_label}</div>'
+                f'<div>{formatted_activities}</div></div>'
+            )
         else:
-            # Display as timeline item (middle items)
+            # Timeline item (middle items)
             if i == 1 or (total_days < 2 and i == 0):
                 # Start timeline for first actual day
-                st.markdown('<div class="timeline">', unsafe_allow_html=True)
+                append('<div class="timeline">')
             
-            # Determine positioning: Day 1 centered, then alternating left/right
-
-            side_class = "center"  # Day 1 is centered
-          
-            st.markdown(f"""
-            <div class="timeline-item {side_class}">
-                <div class="timeline-marker"></div>
-                <div class="timeline-content">
-                    <div class="timeline-day">
-                        {day_label}
-                    </div>
-                    <div class="timeline-activities">
-                        {formatted_activities}
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            # Day 1 is centered
+            side_class = "center"
+            append(
+                f'<div class="timeline-item {side_class}"><div class="timeline-marker"></div>'
+                f'<div class="timeline-content"><div class="timeline-day">{day_label}</div>'
+                f'<div class="timeline-activities">{formatted_activities}</div></div></div>'
+            )
             
             # Close timeline after last timeline item
             if (i == total_days - 2 and total_days > 2) or (total_days <= 2 and i == total_days - 1):
-                st.markdown('</div>', unsafe_allow_html=True)
+                append('</div>')
     
-    st.markdown('</div>', unsafe_allow_html=True)
+    append('</div>')
+    return "\n".join(parts)
+
+def display_timeline_itinerary(days_data: List[Dict[str, str]]):
+    """Display itinerary as a vertical timeline, rendered as one HTML element"""
+    if not days_data:
+        return
+    
+    st.markdown(render_timeline(days_data), unsafe_allow_html=True)
 
 def format_activities_for_timeline(activities_text: str) -> str:
     """Format activities text for better timeline display"""
@@ -2268,14 +1610,14 @@ def format_activities_for_timeline(activities_text: str) -> str:
         if line:
             # Add time indicators if not present
             if not any(time_word in line.lower() for time_word in ['morning', 'afternoon', 'evening', 'night', ':', 'am', 'pm']):
-                formatted_lines.append(f"<li>{line}</li>")
+                formatted_lines.append(f"<li>{html.escape(line)}</li>")
             else:
-                formatted_lines.append(f"<li><strong>{line}</strong></li>")
+                formatted_lines.append(f"<li><strong>{html.escape(line)}</strong></li>")
     
     if formatted_lines:
         return f"<ul>{''.join(formatted_lines)}</ul>"
     else:
-        return f"<p>{activities_text}</p>"
+        return f"<p>{html.escape(activities_text)}</p>"
 
 def display_payment_section(destination: str, travel_data: Dict):
     """Display payment and booking section with EMT navigation"""
@@ -2329,28 +1671,26 @@ def display_payment_section(destination: str, travel_data: Dict):
     # Additional booking info
     st.info("💡 **Booking Benefits**: EMT Price Match Guarantee | 24/7 Support | Instant Confirmation | Zero Cancellation Fee")
 
-def display_flashcard_itinerary(days_data: List[Dict[str, str]]):
-    """Display itinerary as horizontal cards with colored headers"""
-    if not days_data:
-        return
-    
-    st.markdown('<div class="flashcard-container">', unsafe_allow_html=True)
-    
+# Header gradients cycled through the day flashcards
+_FLASHCARD_GRADIENTS = (
+    "linear-gradient(135deg, #667eea 0%, #764ba2 100%)",
+    "linear-gradient(135deg, #f093fb 0%, #f5576c 100%)",
+    "linear-gradient(135deg, #4facfe 0%, #00f2fe 100%)",
+    "linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)",
+    "linear-gradient(135deg, #fa709a 0%, #fee140 100%)",
+    "linear-gradient(135deg, #a8edea 0%, #fed6e3 100%)",
+    "linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%)",
+)
+
+def render_flashcards(days_data: List[Dict[str, str]]) -> str:
+    """Build the HTML for the itinerary flashcards, with arrival/departure cards around numbered days"""
     total_days = len(days_data)
     
+    parts = ['<div class="flashcard-container">']
+    append = parts.append
+    
     for i, day_info in enumerate(days_data):
-        # Create different gradient colors for each day header
-        gradients = [
-            "linear-gradient(135deg, #667eea 0%, #764ba2 100%)",
-            "linear-gradient(135deg, #f093fb 0%, #f5576c 100%)",
-            "linear-gradient(135deg, #4facfe 0%, #00f2fe 100%)",
-            "linear-gradient(135deg, #43e97b 0%, #38f9d7 100%)",
-            "linear-gradient(135deg, #fa709a 0%, #fee140 100%)",
-            "linear-gradient(135deg, #a8edea 0%, #fed6e3 100%)",
-            "linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%)"
-        ]
-        
-        gradient = gradients[i % len(gradients)]
+        gradient = _FLASHCARD_GRADIENTS[i % len(_FLASHCARD_GRADIENTS)]
         
         # Determine the day label and title based on position
         if total_days <= 2:
@@ -2371,23 +1711,34 @@ def display_flashcard_itinerary(days_data: List[Dict[str, str]]):
             day_number = f"Day {day_number_value}"
             day_title = day_info.get('day', f'Day {day_number_value}').replace('Day', '').strip()
         
-        st.markdown(f"""
-        <div class="day-flashcard">
-            <div class="day-header" style="background: {gradient};">
-                <div class="day-number">{day_number}</div>
-                <div class="day-title">{day_title}</div>
-            </div>
-            <div class="day-content">
-                <div class="day-activities">{day_info.get('activities', 'No activities planned')}</div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        activities = html.escape(day_info.get('activities', 'No activities planned'))
+        append(
+            f'<div class="day-flashcard"><div class="day-header" style="background: {gradient};">'
+            f'<div class="day-number">{day_number}</div><div class="day-title">{html.escape(day_title)}</div></div>'
+            f'<div class="day-content"><div class="day-activities">{activities}</div></div></div>'
+        )
     
-    st.markdown('</div>', unsafe_allow_html=True)
+    append('</div>')
+    return "\n".join(parts)
+
+def display_flashcard_itinerary(days_data: List[Dict[str, str]]):
+    """Display itinerary as horizontal cards with colored headers, rendered as one HTML element"""
+    if not days_data:
+        return
+    
+    st.markdown(render_flashcards(days_data), unsafe_allow_html=True)
+
+def _session_memo(key: str, source: Any, compute):
+    """Return compute(source), reusing the result kept in st.session_state across reruns while source is unchanged"""
+    cached = st.session_state.get(key)
+    if cached is None or cached[0] != source:
+        cached = (source, compute(source))
+        st.session_state[key] = cached
+    return cached[1]
 
 def display_nearby_attractions(destination: str):
     """Display nearby attractions for the destination with images and highest ratings first"""
-    attractions = get_nearby_attractions(destination)
+    attractions = _session_memo("nearby_attractions", destination, get_nearby_attractions)
     
     if not attractions:
         return
@@ -2447,7 +1798,7 @@ def display_itinerary(result):
         
         # Parse itinerary into days for timeline display
         itinerary_text = result.get("itinerary", "")
-        days_data = parse_itinerary_into_days(itinerary_text)
+        days_data = _session_memo("itinerary_days", itinerary_text, parse_itinerary_into_days)
         
         if days_data:
           
@@ -2480,7 +1831,7 @@ def display_itinerary(result):
             st.markdown('</div>', unsafe_allow_html=True)
         
         # Extract places from itinerary (existing functionality)
-        places = extract_places_from_itinerary(result["itinerary"])
+        places = _session_memo("itinerary_places", result["itinerary"], extract_places_from_itinerary)
         
         # Display place gallery if places found (existing functionality)
         if places:
@@ -2623,7 +1974,7 @@ def main():
         else:
             st.warning("⚠️ Environment needs setup")
         
-        if ADK_AVAILABLE:
+        if _load_adk() is not None:
             st.success("✅ ADK system ready")
         else:
             st.warning("⚠️ ADK in demo mode")
@@ -20,9 +20,9 @@ class StreamlitTripPlannerWrapper:
     def initialize(self):
         """Initialize the trip planner application."""
         try:
-            # Import the actual app instance from app.py
-            from app import app
-            self.app = app
+            # Get the shared app instance from app.py
+            from app import create_app
+            self.app = create_app()
             logger.info("✅ Trip planner initialized successfully")
             return True
         except Exception as e:
@@ -41,6 +41,9 @@ class StreamlitTripPlannerWrapper:
                 'ai_agents': False
             }
         
+        # Tools and agents are built by the startup warm-up
+        self.app.wait_until_ready(timeout=10)
+        
         # Check if app has tools attribute
         tools = getattr(self.app, 'tools', {})
         agents = getattr(self.app, 'agents', {})
@@ -102,8 +105,9 @@ class StreamlitTripPlannerWrapper:
                 new_loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(new_loop)
                 
-                # Import app in the thread
-                from app import app
+                # Get the shared app instance in the thread
+                from app import create_app
+                app = create_app()
                 
                 result = new_loop.run_until_complete(
                     app.process_user_input(message, session)
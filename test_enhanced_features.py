@@ -9,6 +9,7 @@ from datetime import datetime, date
 from agents.itinerary_planner import ItineraryPlannerAgent
 from schemas.trip_models import TripRequest
 from tools.maps_api import MapsApiTool
+from tools.weather_api import WeatherApiTool
 from schemas.poi_models import POI, POICategory, Coordinates
 from schemas.weather_transport_models import WeatherCondition
 import logging
@@ -118,7 +119,7 @@ def test_complete_activity_lists():
             poi=poi,
             time_slot=f"{9+i}:00 - {10+i}:00",
             estimated_duration=60,
-            cost_estimate=Decimal("10"),
+            cost_estimate=1000,
             notes=f"Visit {poi.name}"
         )
         items.append(item)
@@ -128,7 +129,7 @@ def test_complete_activity_lists():
         day=1,
         date=trip_request.start_date,
         items=items,
-        total_estimated_cost=Decimal("60"),
+        total_estimated_cost=6000,
         weather=None
     )
     
@@ -137,7 +138,7 @@ def test_complete_activity_lists():
     itinerary = Itinerary(
         trip_request=trip_request,
         days=[day_plan],
-        total_cost=Decimal("60")
+        total_cost=6000
     )
     
     # Test summary generation
@@ -160,6 +161,32 @@ def test_complete_activity_lists():
     assert "₹" in summary["total_cost"]
     assert "₹" in daily_breakdown[0]["estimated_cost"]
 
+def test_weather_outdoor_suitability():
+    """Test that outdoor suitability keeps the millimetre precipitation thresholds."""
+    weather_tool = WeatherApiTool("test-key")
+    forecast_date = date(2024, 6, 1)
+    
+    # Heavy precipitation is anything above 5 mm, rain above 1 mm
+    for condition, precipitation, expected in [
+        ("Clear", 5.0, True),
+        ("Clear", 5.05, False),
+        ("Rain", 1.0, True),
+        ("Rain", 1.05, False),
+        ("Thunderstorm", 0, False),
+    ]:
+        weather = weather_tool._convert_to_weather_info(
+            {"condition": condition, "precipitation": precipitation}, forecast_date
+        )
+        assert weather.is_suitable_for_outdoor == expected, (condition, precipitation)
+        assert weather.precipitation_mm == precipitation
+        assert weather.precipitation_chance == int(precipitation * 10)
+    
+    # Mock forecasts are mild sunny or cloudy days, suitable in every season
+    for month in range(1, 13):
+        for location in ["Bangalore", "Paris", "Tokyo", "New York"]:
+            weather = weather_tool._generate_mock_weather(location, date(2024, month, 1))
+            assert weather.is_suitable_for_outdoor
+
 if __name__ == "__main__":
     print("🧪 Testing Enhanced Features...")
     
@@ -175,4 +202,8 @@ if __name__ == "__main__":
     test_complete_activity_lists()
     print("✅ Complete activity lists working!")
     
+    print("\n4️⃣ Testing Weather Outdoor Suitability...")
+    test_weather_outdoor_suitability()
+    print("✅ Weather outdoor suitability working!")
+    
     print("\n🎉 All enhanced features are working correctly!")
\ No newline at end of file
@@ -13,7 +13,7 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 
 # Import application components
-from app import TripPlannerApp
+from app import TripPlannerApp, _env_snapshot
 from schemas import (
     TripRequest, BudgetRange, GroupType, InterestCategory,
     POI, POICategory, WeatherInfo, Itinerary, AgentResponse
@@ -32,7 +32,10 @@ class TestTripPlannerApp:
             'OPENWEATHER_API_KEY': 'test-weather-key',
             'STRIPE_API_KEY': 'test-stripe-key'
         }):
-            return TripPlannerApp()
+            _env_snapshot.cache_clear()
+            app = TripPlannerApp()
+            app._ensure_initialized()
+            return app
     
     @pytest.fixture
     def mock_session(self):
@@ -55,7 +58,7 @@ class TestTripPlannerApp:
         config = app.config
         assert config['project_id'] == 'test-project'
         assert config['google_maps_api_key'] == 'test-maps-key'
-        assert config['vertex_ai']['project_id'] == 'test-project'
+        assert app.vertex_config['project_id'] == 'test-project'
     
     @pytest.mark.asyncio
     async def test_basic_trip_planning(self, app, mock_session):
@@ -86,13 +89,13 @@ class TestTripPlannerApp:
                                     "title": "Louvre Museum",
                                     "start_time": "09:00",
                                     "end_time": "12:00",
-                                    "estimated_cost": 15.0
+                                    "cost_estimate": 1500
                                 }
                             ],
-                            "total_estimated_cost": 150.0
+                            "total_estimated_cost": 15000
                         }
                     ],
-                    "total_cost": 450.0,
+                    "total_cost": 45000,
                     "created_at": "2024-01-01T00:00:00",
                     "version": 1
                 },
@@ -0,0 +1,175 @@
+"""
+Tests for the Redis streams job queue and the offline job worker.
+
+A small in-memory stand-in for the redis.asyncio client covers the stream
+commands the tool uses, so no Redis server is needed.
+"""
+
+import pytest
+import orjson
+from unittest.mock import Mock, AsyncMock
+from redis.exceptions import ConnectionError, ResponseError
+
+from app import TripPlannerApp
+from tools.job_queue_tool import JobQueueTool
+
+
+class FakeRedis:
+    """In-memory subset of the redis.asyncio stream commands."""
+    
+    def __init__(self):
+        self.streams = {}
+        self.groups = set()
+        self.pending = {}
+        self.delivered = 0
+        self.fail = False
+        self._next_id = 0
+    
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("Redis unavailable")
+    
+    async def xadd(self, stream, fields):
+        self._check()
+        self._next_id += 1
+        job_id = f"{self._next_id}-0"
+        self.streams.setdefault(stream, []).append((job_id, fields))
+        return job_id
+    
+    async def xgroup_create(self, stream, group, id="0", mkstream=False):
+        self._check()
+        if (stream, group) in self.groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        self.groups.add((stream, group))
+        self.streams.setdefault(stream, [])
+    
+    async def xreadgroup(self, group, consumer, streams, count=1, block=0):
+        self._check()
+        response = []
+        for stream in streams:
+            entries = self.streams.get(stream, [])[self.delivered:self.delivered + count]
+            self.delivered += len(entries)
+            for job_id, _ in entries:
+                self.pending[job_id] = consumer
+            if entries:
+                response.append((stream, entries))
+        return response
+    
+    async def xack(self, stream, group, job_id):
+        self._check()
+        return 1 if self.pending.pop(job_id, None) else 0
+
+
+@pytest.fixture
+def queue():
+    """Job queue tool backed by the in-memory client."""
+    tool = JobQueueTool("redis://localhost:6379/0", max_attempts=2)
+    tool.client = FakeRedis()
+    return tool
+
+
+class TestJobQueueTool:
+    """Test enqueueing, consuming and acknowledging jobs."""
+    
+    @pytest.mark.asyncio
+    async def test_enqueue_consume_ack(self, queue):
+        """A queued job is read back with its payload and can be acked."""
+        job_id = await queue.enqueue({"user_input": "Plan Paris", "session_id": "s1", "user_id": "u1"})
+        
+        jobs = await queue.consume("worker-1")
+        
+        assert jobs == [(job_id, {"user_input": "Plan Paris", "session_id": "s1", "user_id": "u1"})]
+        assert await queue.ack(job_id) is True
+        assert queue.client.pending == {}
+    
+    @pytest.mark.asyncio
+    async def test_consume_without_jobs_returns_empty_list(self, queue):
+        """An idle stream is not reported as a failure."""
+        assert await queue.consume("worker-1") == []
+    
+    @pytest.mark.asyncio
+    async def test_redis_errors(self, queue):
+        """Redis failures are reported as None/False rather than raised."""
+        queue.client.fail = True
+        
+        assert await queue.enqueue({"user_input": "Plan Paris"}) is None
+        assert await queue.consume("worker-1") is None
+        assert await queue.ack("1-0") is False
+    
+    @pytest.mark.asyncio
+    async def test_retry_requeues_then_dead_letters(self, queue):
+        """A failed job is requeued until max_attempts, then dead-lettered."""
+        await queue.enqueue({"user_input": "Plan Paris"})
+        
+        [(job_id, job)] = await queue.consume("worker-1")
+        assert await queue.retry(job_id, job) is True
+        
+        [(retry_id, retried)] = await queue.consume("worker-1")
+        assert retried["attempts"] == 1
+        assert await queue.retry(retry_id, retried) is True
+        
+        assert await queue.consume("worker-1") == []
+        [(_, fields)] = queue.client.streams[queue.dead_letter_stream]
+        assert orjson.loads(fields["payload"]) == {"user_input": "Plan Paris", "attempts": 2}
+        assert queue.client.pending == {}
+
+
+class TestJobWorker:
+    """Test how the offline worker settles each job."""
+    
+    @pytest.fixture
+    def app(self):
+        """Stand-in for the app; _run_job only needs tools and cache invalidation."""
+        return Mock(tools={})
+    
+    @pytest.fixture
+    def job_queue(self):
+        """Job queue whose ack and retry calls are recorded."""
+        return Mock(ack=AsyncMock(return_value=True), retry=AsyncMock(return_value=True))
+    
+    JOB = {"user_input": "Plan Paris", "session_id": "s1", "user_id": "u1"}
+    
+    @pytest.mark.asyncio
+    async def test_successful_plan_is_acked(self, app, job_queue):
+        """A planned trip is acknowledged."""
+        orchestrator = Mock(aplan_trip=AsyncMock(return_value=Mock(success=True)))
+        
+        await TripPlannerApp._run_job(app, job_queue, orchestrator, "1-0", self.JOB)
+        
+        job_queue.ack.assert_awaited_once_with("1-0")
+        job_queue.retry.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_incomplete_request_is_acked(self, app, job_queue):
+        """A request missing trip details is acked; retrying would ask the same questions."""
+        orchestrator = Mock(aplan_trip=AsyncMock(return_value=Mock(
+            success=False, message="Need more information to create your trip plan",
+            error="Incomplete trip requirements"
+        )))
+        
+        await TripPlannerApp._run_job(app, job_queue, orchestrator, "1-0", self.JOB)
+        
+        job_queue.ack.assert_awaited_once_with("1-0")
+        job_queue.retry.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_failed_plan_is_retried(self, app, job_queue):
+        """A plan that failed for a transient reason is retried, not acked."""
+        orchestrator = Mock(aplan_trip=AsyncMock(return_value=Mock(
+            success=False, message="Failed to find places", error="Places API timeout"
+        )))
+        
+        await TripPlannerApp._run_job(app, job_queue, orchestrator, "1-0", self.JOB)
+        
+        job_queue.ack.assert_not_awaited()
+        job_queue.retry.assert_awaited_once_with("1-0", self.JOB)
+    
+    @pytest.mark.asyncio
+    async def test_planner_exception_is_retried(self, app, job_queue):
+        """A planner exception is caught and the job retried."""
+        orchestrator = Mock(aplan_trip=AsyncMock(side_effect=RuntimeError("Vertex AI unavailable")))
+        
+        await TripPlannerApp._run_job(app, job_queue, orchestrator, "1-0", self.JOB)
+        
+        job_queue.ack.assert_not_awaited()
+        job_queue.retry.assert_awaited_once_with("1-0", self.JOB)
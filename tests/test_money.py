@@ -0,0 +1,75 @@
+"""
+Tests for Money amounts stored as integer cents and the legacy migration.
+
+Documents stored before Money moved to cents hold major units and carry no
+money_unit marker; FirestoreTool converts them on read.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from schemas import BookingBasket, LEGACY_MONEY_CONTEXT, MONEY_UNIT_KEY, MONEY_UNIT_CENTS, utc_now
+from tools.firestore_tool import _from_document, _to_document
+
+
+BASKET = {"id": "basket-1", "itinerary_id": "itinerary-1", "items": []}
+
+
+class TestMoney:
+    """Test validating Money amounts with and without the legacy context."""
+    
+    @pytest.mark.parametrize("amount", [1500, "1500"])
+    def test_amounts_are_cents(self, amount):
+        """Without the legacy context, amounts are integer cents."""
+        assert BookingBasket.model_validate({**BASKET, "subtotal": amount}).subtotal == 1500
+    
+    def test_fractional_cents_rejected(self):
+        """A fractional amount isn't cents, so it's rejected rather than guessed at."""
+        with pytest.raises(ValidationError):
+            BookingBasket.model_validate({**BASKET, "subtotal": 15.5})
+    
+    @pytest.mark.parametrize("amount, cents", [
+        (15, 1500),
+        ("15", 1500),
+        (15.5, 1550),
+        ("15.07", 1507),
+        (0, 0),
+    ])
+    def test_legacy_amounts_are_major_units(self, amount, cents):
+        """Under the legacy context every amount is major units, integers included."""
+        basket = BookingBasket.model_validate({**BASKET, "subtotal": amount}, context=LEGACY_MONEY_CONTEXT)
+        assert basket.subtotal == cents
+    
+    def test_invalid_legacy_amount(self):
+        """Unparseable legacy amounts fail validation."""
+        with pytest.raises(ValidationError):
+            BookingBasket.model_validate({**BASKET, "subtotal": "abc"}, context=LEGACY_MONEY_CONTEXT)
+
+
+class TestFirestoreDocuments:
+    """Test the money unit marker on Firestore documents."""
+    
+    def test_round_trip(self):
+        """Documents written now are marked and read back unchanged."""
+        basket = BookingBasket(**BASKET, subtotal=1500, total=1650)
+        
+        document = _to_document(basket, utc_now())
+        assert document[MONEY_UNIT_KEY] == MONEY_UNIT_CENTS
+        
+        restored = _from_document(BookingBasket, document)
+        assert (restored.subtotal, restored.total) == (1500, 1650)
+    
+    def test_timestamps_stamped_on_save_only(self):
+        """Dumping a model leaves its timestamps unset; saving stamps them once."""
+        basket = BookingBasket(**BASKET)
+        assert basket.model_dump()["created_at"] is None
+        assert basket.created_at is None
+        
+        now = utc_now()
+        assert _to_document(basket, now)["created_at"] == now
+        assert _to_document(basket, utc_now())["created_at"] == now
+    
+    def test_unmarked_document_is_converted(self):
+        """Documents without the marker are read as major units."""
+        restored = _from_document(BookingBasket, {**BASKET, "subtotal": 15, "total": "16.50"})
+        assert (restored.subtotal, restored.total) == (1500, 1650)
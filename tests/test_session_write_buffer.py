@@ -0,0 +1,128 @@
+"""
+Tests for batching new-session writes through SessionWriteBuffer.
+
+A small in-memory stand-in for the Firestore client covers the document and
+batch calls used when creating sessions.
+"""
+
+from google.api_core.exceptions import AlreadyExists
+
+from schemas import SessionData
+from tools.firestore_tool import FirestoreTool, SessionWriteBuffer
+
+
+class FakeDocument:
+    """Document reference that records creates in its client."""
+    
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+    
+    def collection(self, name):
+        return FakeCollection(self.client, f"{self.path}/{name}")
+    
+    def create(self, data):
+        self.client.create(self.path, data)
+
+
+class FakeCollection:
+    """Collection reference handing out fake documents."""
+    
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+    
+    def document(self, document_id):
+        return FakeDocument(self.client, f"{self.path}/{document_id}")
+
+
+class FakeBatch:
+    """Write batch applied atomically on commit."""
+    
+    def __init__(self, client):
+        self.client = client
+        self.creates = []
+    
+    def create(self, document, data):
+        self.creates.append((document.path, data))
+    
+    def set(self, document, data, merge=False):
+        pass
+    
+    def commit(self):
+        for path, _ in self.creates:
+            if path in self.client.documents:
+                raise AlreadyExists(f"{path} already exists")
+        for path, data in self.creates:
+            self.client.create(path, data)
+
+
+class FakeFirestore:
+    """In-memory subset of the Firestore client."""
+    
+    def __init__(self, failing=()):
+        self.documents = {}
+        self.failing = set(failing)
+    
+    def collection(self, name):
+        return FakeCollection(self, name)
+    
+    def batch(self):
+        return FakeBatch(self)
+    
+    def create(self, path, data):
+        if path in self.documents:
+            raise AlreadyExists(f"{path} already exists")
+        if path in self.failing:
+            raise RuntimeError("write failed")
+        self.documents[path] = data
+
+
+def make_buffer(client):
+    """Build a buffer over a FirestoreTool backed by the fake client."""
+    tool = FirestoreTool.__new__(FirestoreTool)
+    tool.client = client
+    flushed = []
+    buffer = SessionWriteBuffer(tool, flush_interval=3600, on_flushed=flushed.extend)
+    return buffer, flushed
+
+
+def session(session_id):
+    return SessionData(session_id=session_id, user_id="user-1")
+
+
+class TestSessionWriteBuffer:
+    """Test flushing queued sessions to Firestore."""
+    
+    def test_flush_writes_batch(self):
+        """Queued sessions are created together and reported as flushed."""
+        client = FakeFirestore()
+        buffer, flushed = make_buffer(client)
+        
+        assert buffer.enqueue(session("a")) and buffer.enqueue(session("b"))
+        assert not buffer.enqueue(session("a"))
+        assert buffer.flush()
+        
+        assert {"sessions/a", "sessions/b"} <= set(client.documents)
+        assert [s.session_id for s in flushed] == ["a", "b"]
+    
+    def test_fallback_unmarks_only_failed_sessions(self):
+        """After an existing session rejects the batch, only real write failures can be re-registered."""
+        client = FakeFirestore(failing={"sessions/c"})
+        client.documents["sessions/a"] = {}
+        buffer, flushed = make_buffer(client)
+        
+        for session_id in ("a", "b", "c"):
+            buffer.enqueue(session(session_id))
+        assert not buffer.flush()
+        
+        assert "sessions/b" in client.documents
+        assert "sessions/c" not in client.documents
+        assert [s.session_id for s in flushed] == ["a", "b"]
+        assert not buffer.enqueue(session("a"))
+        assert not buffer.enqueue(session("b"))
+        assert buffer.enqueue(session("c"))
+        
+        client.failing.clear()
+        assert buffer.flush()
+        assert "sessions/c" in client.documents
@@ -0,0 +1,60 @@
+"""
+Tests for natural-language parsing of trip requests and refinements.
+"""
+
+import pytest
+
+from app import _REFINE_RE
+from streamlit_app import _INTEREST_KEYWORDS, parse_voice_text_to_form_data
+
+
+def substring_interests(text):
+    """Interests as found by the original substring scan of the lowercased text."""
+    text_lower = text.lower()
+    return [
+        interest for interest, keywords in _INTEREST_KEYWORDS.items()
+        if any(keyword in text_lower for keyword in keywords)
+    ]
+
+
+class TestInterestDetection:
+    """Test that word-based interest matching finds what the substring scan did."""
+    
+    @pytest.mark.parametrize("text", [
+        "I want to go to Paris for 5 days with my wife, love food and art",
+        "We are 4 people visiting Jaipur, interested in temples and history",
+        "Solo trip to Manali, adventure and hiking in the mountains",
+        "Family vacation to Kerala with kids, luxury spa relaxation",
+        "Relaxing week in Bali visiting museums, galleries and temples",
+        "Relaxed trip with restaurants, local markets and evenings at clubs",
+        "Heading to Tokyo, nightlife and shopping, photos of historical buildings",
+        "Traditional cuisine, culturally rich sights and peaceful parks",
+    ])
+    def test_matches_substring_scan(self, text):
+        """Inflected and plural keywords give the same interests as before."""
+        parsed = parse_voice_text_to_form_data(text)
+        
+        assert parsed.get('preferences', []) == substring_interests(text)
+    
+    def test_no_interests(self):
+        """Text without interest keywords sets no preferences."""
+        assert 'preferences' not in parse_voice_text_to_form_data("Trip to Goa for 3 days")
+
+
+class TestRefinementKeywords:
+    """Test which messages are treated as itinerary refinements."""
+    
+    @pytest.mark.parametrize("text", [
+        "Change the hotel", "changing the dates", "Can you modify day 2?",
+        "Replace the museum with a beach", "Start later", "something cheaper",
+        "add a cooking class", "We added a day", "removing the last stop",
+    ])
+    def test_keywords_and_inflections(self, text):
+        assert _REFINE_RE.search(text)
+    
+    @pytest.mark.parametrize("text", [
+        "What is the hotel address?", "Any additional tips?", "The path runs laterally",
+        "Plan a trip to Goa for 3 days",
+    ])
+    def test_words_starting_with_keywords(self, text):
+        assert not _REFINE_RE.search(text)
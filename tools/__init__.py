@@ -9,11 +9,13 @@ from .weather_api import WeatherApiTool
 from .bigquery_tool import BigQueryTool
 from .firestore_tool import FirestoreTool
 from .payment_tool import PaymentTool
+from .job_queue_tool import JobQueueTool
 
 __all__ = [
     "MapsApiTool",
     "WeatherApiTool", 
     "BigQueryTool",
     "FirestoreTool",
-    "PaymentTool"
+    "PaymentTool",
+    "JobQueueTool"
 ]
\ No newline at end of file
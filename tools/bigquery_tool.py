@@ -6,14 +6,16 @@ reviews, and analytics using Google BigQuery.
 """
 
 import logging
-import json
+import orjson
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from google.cloud import bigquery
 from google.cloud.exceptions import NotFound
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
 from adk import Tool
 
-from schemas import POI, TripRequest
+from schemas import POI, TripRequest, to_display, utc_now
 
 logger = logging.getLogger(__name__)
 
@@ -35,8 +37,8 @@ def serialize_for_bigquery(obj: Any) -> Any:
         return {key: serialize_for_bigquery(value) for key, value in obj.items() if value is not None}
     elif isinstance(obj, list):
         return [serialize_for_bigquery(item) for item in obj]
-    elif hasattr(obj, 'dict'):  # Pydantic model
-        return serialize_for_bigquery(obj.dict())
+    elif hasattr(obj, 'model_dump'):  # Pydantic model
+        return serialize_for_bigquery(obj.model_dump())
     else:
         return obj
 
@@ -61,7 +63,7 @@ def prepare_address_field(address_obj) -> str:
             "formatted_address": None
         }
     else:
-        address_dict = address_obj.dict() if hasattr(address_obj, 'dict') else address_obj
+        address_dict = address_obj.model_dump() if hasattr(address_obj, 'model_dump') else address_obj
         # Ensure required fields exist
         result = {
             "street": address_dict.get("street"),
@@ -74,7 +76,7 @@ def prepare_address_field(address_obj) -> str:
     
     # Filter out None values and convert to JSON string
     filtered_result = {k: v for k, v in result.items() if v is not None}
-    return json.dumps(filtered_result)
+    return orjson.dumps(filtered_result).decode()
 
 
 def prepare_opening_hours_field(opening_hours_obj) -> str:
@@ -97,9 +99,9 @@ def prepare_opening_hours_field(opening_hours_obj) -> str:
     if isinstance(opening_hours_obj, dict):
         opening_hours_dict = opening_hours_obj
         logger.info(f"Opening hours is dict: {opening_hours_dict}")
-    elif hasattr(opening_hours_obj, 'dict'):
-        opening_hours_dict = opening_hours_obj.dict()
-        logger.info(f"Opening hours has .dict() method, converted: {opening_hours_dict}")
+    elif hasattr(opening_hours_obj, 'model_dump'):
+        opening_hours_dict = opening_hours_obj.model_dump()
+        logger.info(f"Opening hours has .model_dump() method, converted: {opening_hours_dict}")
     else:
         # If it's some other type, convert to string representation
         logger.info(f"Opening hours is unknown type, converting to string: {opening_hours_obj}")
@@ -112,7 +114,7 @@ def prepare_opening_hours_field(opening_hours_obj) -> str:
             result[str(key)] = str(value)
     
     # Convert to JSON string for BigQuery
-    json_result = json.dumps(result)
+    json_result = orjson.dumps(result).decode()
     logger.info(f"prepare_opening_hours_field output: {json_result}")
     return json_result
 
@@ -136,14 +138,14 @@ def prepare_json_object_field(data) -> str:
         for key, value in data.items():
             if value is not None:
                 result[str(key)] = value
-    elif hasattr(data, 'dict'):
-        temp_dict = data.dict()
+    elif hasattr(data, 'model_dump'):
+        temp_dict = data.model_dump()
         result = {str(k): v for k, v in temp_dict.items() if v is not None}
     else:
         # Convert other types to a basic representation
         result = {"value": str(data)}
     
-    return json.dumps(result)
+    return orjson.dumps(result).decode()
 
 
 def prepare_json_array_field(data) -> str:
@@ -166,14 +168,30 @@ def prepare_json_array_field(data) -> str:
         # Convert single item to list
         result = [data] if data is not None else []
     
-    return json.dumps(result)
+    return orjson.dumps(result).decode()
 
 
 class BigQueryTool(Tool):
     """BigQuery tool for caching POI data and analytics."""
     
-    def __init__(self, project_id: str, dataset_id: str = "trip_planner", location: str = "US"):
-        """Initialize BigQuery tool."""
+    def __init__(
+        self,
+        project_id: str,
+        dataset_id: str = "trip_planner",
+        location: str = "US",
+        credentials: Optional[Any] = None,
+        pool_size: int = 20
+    ):
+        """
+        Initialize BigQuery tool.
+        
+        Args:
+            project_id: Google Cloud project ID
+            dataset_id: BigQuery dataset ID
+            location: Dataset location
+            credentials: Pre-resolved Google credentials; resolved by the client if None
+            pool_size: HTTP connection pool size for concurrent BigQuery calls
+        """
         super().__init__("bigquery_tool", "BigQuery data caching and analytics tool")
         self.project_id = project_id
         self.dataset_id = dataset_id
@@ -181,13 +199,48 @@ class BigQueryTool(Tool):
         self.client = None
         
         try:
-            self.client = bigquery.Client(project=project_id)
+            self.client = bigquery.Client(
+                project=project_id,
+                credentials=credentials,
+                _http=self._create_http(credentials, pool_size)
+            )
             self._ensure_dataset_exists()
             self._ensure_tables_exist()
-            logger.info(f"BigQuery tool initialized for project {project_id}")
+            logger.debug("BigQuery tool initialized for project %s", project_id)
         except Exception as e:
             logger.error(f"Failed to initialize BigQuery client: {e}")
     
+    @staticmethod
+    def _create_http(credentials: Optional[Any], pool_size: int) -> Optional[AuthorizedSession]:
+        """
+        Create an authorized HTTP session with a larger connection pool.
+        
+        The BigQuery client talks REST over a requests session whose default
+        pool holds 10 connections; agents querying in parallel queue behind it.
+        Returns None (client default) when no credentials were supplied.
+        """
+        if credentials is None:
+            return None
+        
+        http = AuthorizedSession(credentials)
+        http.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+        return http
+    
+    def ping(self) -> bool:
+        """
+        Make a minimal request so auth and the connection pool are warm.
+        
+        Returns:
+            True if BigQuery responded, False otherwise
+        """
+        try:
+            list(self.client.list_datasets(max_results=1))
+            return True
+            
+        except Exception as e:
+            logger.error(f"BigQuery ping failed: {e}")
+            return False
+    
     @property
     def dataset_ref(self):
         """Get dataset reference."""
@@ -374,8 +427,8 @@ class BigQueryTool(Tool):
                 "estimated_visit_duration": poi.estimated_visit_duration,
                 "popularity_score": poi.popularity_score,
                 "accessibility_features": poi.accessibility_features,
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
+                "created_at": utc_now(),
+                "updated_at": utc_now()
             }
             
             # For POI data, JSON fields are already prepared as strings, so we only need to serialize datetime fields
@@ -542,15 +595,15 @@ class BigQueryTool(Tool):
         try:
             table_id = f"{self.project_id}.{self.dataset_id}.search_cache"
             
-            expires_at = datetime.utcnow().replace(microsecond=0)
-            expires_at = expires_at.replace(hour=expires_at.hour + ttl_hours)
+            created_at = utc_now().replace(microsecond=0)
+            expires_at = created_at + timedelta(hours=ttl_hours)
             
             row = {
                 "cache_key": cache_key,
                 "location": location,
                 "search_params": prepare_json_object_field(search_params),
                 "results": prepare_json_array_field(results),
-                "created_at": datetime.utcnow(),
+                "created_at": created_at,
                 "expires_at": expires_at
             }
             
@@ -621,7 +674,7 @@ class BigQueryTool(Tool):
         
         Args:
             trip_request: Original trip request
-            itinerary_data: Generated itinerary data
+            itinerary_data: Generated itinerary data (costs in cents)
             
         Returns:
             True if successful, False otherwise
@@ -637,9 +690,9 @@ class BigQueryTool(Tool):
                 "end_date": trip_request.end_date.isoformat(),
                 "group_type": trip_request.group_type.value,
                 "budget_range": trip_request.budget_range.value,
-                "total_cost": float(itinerary_data.get("total_cost", 0)),
+                "total_cost": to_display(itinerary_data.get("total_cost", 0)),
                 "poi_count": len(itinerary_data.get("pois", [])),
-                "created_at": datetime.utcnow()
+                "created_at": utc_now()
             }
             
             # Serialize all data to ensure JSON compatibility
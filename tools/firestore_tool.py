@@ -5,30 +5,61 @@ This tool provides functionality to store and retrieve trip data,
 user sessions, and itineraries using Google Firestore.
 """
 
+import atexit
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+import threading
+from typing import Dict, Any, Optional, List, Callable, Tuple, Type, TypeVar
+from datetime import datetime, timedelta
+from cachetools import TTLCache
+from google.api_core.exceptions import AlreadyExists
 from google.cloud import firestore
 from adk import Tool
 
-from schemas import TripRequest, Itinerary, SessionData, BookingBasket
+from pydantic import BaseModel
+from schemas import (
+    TripRequest, Itinerary, SessionData, BookingBasket, TimestampedModel, utc_now,
+    MONEY_UNIT_KEY, MONEY_UNIT_CENTS, LEGACY_MONEY_CONTEXT
+)
 
 logger = logging.getLogger(__name__)
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _to_document(model: TimestampedModel, now: datetime) -> Dict[str, Any]:
+    """Dump a model for Firestore, stamping its unset timestamps with now and marking its Money amounts as cents."""
+    model.stamp_timestamps(now)
+    document = model.model_dump()
+    document[MONEY_UNIT_KEY] = MONEY_UNIT_CENTS
+    return document
+
+
+def _from_document(model_cls: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    """Validate a Firestore document, converting amounts of documents stored before Money moved to cents."""
+    legacy = data.pop(MONEY_UNIT_KEY, None) != MONEY_UNIT_CENTS
+    return model_cls.model_validate(data, context=LEGACY_MONEY_CONTEXT if legacy else None)
+
 
 class FirestoreTool(Tool):
     """Firestore tool for session and trip data persistence."""
     
-    def __init__(self, project_id: str, database: str = "(default)"):
-        """Initialize Firestore tool."""
+    def __init__(self, project_id: str, database: str = "(default)", credentials: Optional[Any] = None):
+        """
+        Initialize Firestore tool.
+        
+        Args:
+            project_id: Google Cloud project ID
+            database: Firestore database name
+            credentials: Pre-resolved Google credentials; resolved by the client if None
+        """
         super().__init__("firestore_tool", "Firestore database integration for data persistence")
         self.project_id = project_id
         self.database = database
         self.client = None
         
         try:
-            self.client = firestore.Client(project=project_id, database=database)
-            logger.info(f"Firestore tool initialized for project {project_id}")
+            self.client = firestore.Client(project=project_id, database=database, credentials=credentials)
+            logger.debug("Firestore tool initialized for project %s", project_id)
         except Exception as e:
             logger.error(f"Failed to initialize Firestore client: {e}")
     
@@ -38,8 +69,12 @@ class FirestoreTool(Tool):
             return self.save_session(**kwargs)
         elif operation == "get_session":
             return self.get_session(**kwargs)
+        elif operation == "get_session_metadata":
+            return self.get_session_metadata(**kwargs)
         elif operation == "get_user_sessions":
             return self.get_user_sessions(**kwargs)
+        elif operation == "count_user_sessions":
+            return self.count_user_sessions(**kwargs)
         elif operation == "get_user_latest_session":
             return self.get_user_latest_session(**kwargs)
         elif operation == "get_user_active_sessions":
@@ -53,6 +88,21 @@ class FirestoreTool(Tool):
         else:
             raise ValueError(f"Unknown operation: {operation}")
     
+    def ping(self) -> bool:
+        """
+        Read a single document so auth and the gRPC channel are warm.
+        
+        Returns:
+            True if Firestore responded, False otherwise
+        """
+        try:
+            self.client.collection('sessions').document('_ping').get()
+            return True
+            
+        except Exception as e:
+            logger.error(f"Firestore ping failed: {e}")
+            return False
+    
     def save_session(self, session_data: SessionData) -> bool:
         """
         Save session data to Firestore with user-specific organization.
@@ -65,8 +115,9 @@ class FirestoreTool(Tool):
         """
         try:
             # Convert to dict for Firestore
-            session_dict = session_data.dict()
-            session_dict['last_activity'] = datetime.utcnow()
+            now = utc_now()
+            session_dict = _to_document(session_data, now)
+            session_dict['last_activity'] = now
             
             # Save to main sessions collection
             session_ref = self.client.collection('sessions').document(session_data.session_id)
@@ -87,7 +138,7 @@ class FirestoreTool(Tool):
                 user_ref.set({
                     'user_id': session_data.user_id,
                     'last_session_id': session_data.session_id,
-                    'last_activity': datetime.utcnow(),
+                    'last_activity': now,
                     'total_sessions': firestore.Increment(1) if user_doc.exists else 1
                 }, merge=True)
             
@@ -98,6 +149,108 @@ class FirestoreTool(Tool):
             logger.error(f"Error saving session {session_data.session_id}: {e}")
             return False
     
+    def create_session_if_absent(self, session_data: SessionData) -> bool:
+        """
+        Create a session unless it already exists, in a single conditional write.
+        
+        Uses Firestore's create() precondition instead of reading the
+        document first, so an existing session is never overwritten.
+        
+        Args:
+            session_data: Session data to create
+            
+        Returns:
+            True if the session was created, False if it existed or the write failed
+        """
+        try:
+            self._create_session(session_data)
+            logger.info(f"Created session {session_data.session_id}")
+            return True
+            
+        except AlreadyExists:
+            return False
+        except Exception as e:
+            logger.error(f"Error creating session {session_data.session_id}: {e}")
+            return False
+    
+    def _create_session(self, session_data: SessionData) -> None:
+        """Create a session document and its user records, raising AlreadyExists if the session exists."""
+        now = utc_now()
+        session_dict = _to_document(session_data, now)
+        session_dict['last_activity'] = now
+        
+        self.client.collection('sessions').document(session_data.session_id).create(session_dict)
+        if session_data.user_id:
+            batch = self.client.batch()
+            self._add_user_session_writes(batch, session_data, session_dict)
+            batch.commit()
+    
+    def save_sessions_batch(self, sessions: List[SessionData]) -> List[str]:
+        """
+        Create several new sessions in a single batched write.
+        
+        Session documents are written with create(), so a queued registration
+        never overwrites a session the orchestrator has since saved. If any
+        session in the batch already exists the whole batch is rejected, and
+        the sessions fall back to one conditional create each.
+        
+        Args:
+            sessions: Session data to create
+            
+        Returns:
+            IDs of the sessions that could not be written (empty if successful).
+            Sessions that already existed are not counted as failures.
+        """
+        if not sessions:
+            return []
+        
+        try:
+            batch = self.client.batch()
+            now = utc_now()
+            
+            for session_data in sessions:
+                session_dict = _to_document(session_data, now)
+                session_dict['last_activity'] = now
+                batch.create(self.client.collection('sessions').document(session_data.session_id), session_dict)
+                if session_data.user_id:
+                    self._add_user_session_writes(batch, session_data, session_dict)
+            
+            batch.commit()
+            logger.info(f"Batch-created {len(sessions)} sessions")
+            return []
+            
+        except AlreadyExists:
+            return self._create_sessions_individually(sessions)
+        except Exception as e:
+            logger.error(f"Error batch-saving {len(sessions)} sessions: {e}")
+            return [session_data.session_id for session_data in sessions]
+    
+    def _create_sessions_individually(self, sessions: List[SessionData]) -> List[str]:
+        """Create each session unless it exists, returning the IDs whose writes failed."""
+        failed = []
+        for session_data in sessions:
+            try:
+                self._create_session(session_data)
+            except AlreadyExists:
+                continue
+            except Exception as e:
+                logger.error(f"Error creating session {session_data.session_id}: {e}")
+                failed.append(session_data.session_id)
+        
+        logger.info(f"Wrote {len(sessions) - len(failed)} of {len(sessions)} sessions individually")
+        return failed
+    
+    def _add_user_session_writes(self, batch: Any, session_data: SessionData, session_dict: Dict[str, Any]) -> None:
+        """Add a new session's user-subcollection copy and user metadata to a write batch."""
+        user_ref = self.client.collection('users').document(session_data.user_id)
+        batch.set(user_ref.collection('sessions').document(session_data.session_id), session_dict, merge=True)
+        batch.set(user_ref, {
+            'user_id': session_data.user_id,
+            'last_session_id': session_data.session_id,
+            'last_activity': session_dict['last_activity'],
+            'total_sessions': firestore.Increment(1)
+        }, merge=True)
+    
     def get_session(self, session_id: str) -> Optional[SessionData]:
         """
         Retrieve session data from Firestore.
@@ -115,7 +268,7 @@ class FirestoreTool(Tool):
             if doc.exists:
                 data = doc.to_dict()
                 # Convert back to SessionData object
-                return SessionData(**data)
+                return _from_document(SessionData, data)
             
             return None
             
@@ -123,6 +276,31 @@ class FirestoreTool(Tool):
             logger.error(f"Error retrieving session {session_id}: {e}")
             return None
     
+    def get_session_metadata(self, session_id: str) -> Optional[Tuple[Any, Any]]:
+        """
+        Retrieve only a session's last activity and document update time.
+        
+        Reads a single-field projection, so it is much cheaper than get_session
+        for checking whether a session has changed.
+        
+        Args:
+            session_id: Session ID to check
+            
+        Returns:
+            (last_activity, update_time) tuple or None if not found
+        """
+        try:
+            doc = self.client.collection('sessions').document(session_id).get(field_paths=['last_activity'])
+            
+            if doc.exists:
+                return doc.get('last_activity'), doc.update_time
+            
+            return None
+            
+        except Exception as e:
+            logger.error(f"Error retrieving metadata for session {session_id}: {e}")
+            return None
+    
     def get_user_sessions(self, user_id: str, limit: Optional[int] = None, active_only: bool = False) -> List[SessionData]:
         """
         Retrieve all sessions for a specific user.
@@ -154,7 +332,7 @@ class FirestoreTool(Tool):
             for doc in docs:
                 if doc.exists:
                     data = doc.to_dict()
-                    sessions.append(SessionData(**data))
+                    sessions.append(_from_document(SessionData, data))
             
             logger.info(f"Retrieved {len(sessions)} sessions for user {user_id}")
             return sessions
@@ -163,6 +341,34 @@ class FirestoreTool(Tool):
             logger.error(f"Error retrieving sessions for user {user_id}: {e}")
             return []
     
+    def count_user_sessions(self, user_id: str, active_only: bool = False) -> Optional[int]:
+        """
+        Count a user's sessions with a server-side aggregation query.
+        
+        Args:
+            user_id: User ID to count sessions for
+            active_only: If True, only count active sessions
+            
+        Returns:
+            Number of sessions, or None if the count failed
+        """
+        try:
+            query = (self.client
+                    .collection('users')
+                    .document(user_id)
+                    .collection('sessions'))
+            
+            if active_only:
+                query = query.where('is_active', '==', True)
+            
+            # count() is evaluated by Firestore; no documents are transferred
+            result = query.count().get()
+            return int(result[0][0].value)
+            
+        except Exception as e:
+            logger.error(f"Error counting sessions for user {user_id}: {e}")
+            return None
+    
     def get_user_latest_session(self, user_id: str) -> Optional[SessionData]:
         """
         Get the most recent session for a user.
@@ -255,8 +461,9 @@ class FirestoreTool(Tool):
             doc_ref = self.client.collection('itineraries').document(itinerary.id)
             
             # Convert to dict for Firestore
-            itinerary_dict = itinerary.dict()
-            itinerary_dict['updated_at'] = datetime.utcnow()
+            now = utc_now()
+            itinerary_dict = _to_document(itinerary, now)
+            itinerary_dict['updated_at'] = now
             
             doc_ref.set(itinerary_dict, merge=True)
             logger.info(f"Saved itinerary {itinerary.id}")
@@ -282,7 +489,7 @@ class FirestoreTool(Tool):
             
             if doc.exists:
                 data = doc.to_dict()
-                return Itinerary(**data)
+                return _from_document(Itinerary, data)
             
             return None
             
@@ -304,7 +511,7 @@ class FirestoreTool(Tool):
             doc_ref = self.client.collection('booking_baskets').document(basket.id)
             
             # Convert to dict for Firestore
-            basket_dict = basket.dict()
+            basket_dict = _to_document(basket, utc_now())
             
             doc_ref.set(basket_dict, merge=True)
             logger.info(f"Saved booking basket {basket.id}")
@@ -330,7 +537,7 @@ class FirestoreTool(Tool):
             
             if doc.exists:
                 data = doc.to_dict()
-                return BookingBasket(**data)
+                return _from_document(BookingBasket, data)
             
             return None
             
@@ -434,7 +641,7 @@ class FirestoreTool(Tool):
             
             preferences_data = {
                 'preferences': preferences,
-                'updated_at': datetime.utcnow()
+                'updated_at': utc_now()
             }
             
             doc_ref.set(preferences_data, merge=True)
@@ -486,7 +693,7 @@ class FirestoreTool(Tool):
                 'user_id': user_id,
                 'activity': activity,
                 'details': details,
-                'timestamp': datetime.utcnow()
+                'timestamp': utc_now()
             }
             
             self.client.collection('user_activities').add(activity_data)
@@ -508,9 +715,7 @@ class FirestoreTool(Tool):
             Number of sessions cleaned up
         """
         try:
-            cutoff_time = datetime.utcnow().replace(
-                hour=datetime.utcnow().hour - hours
-            )
+            cutoff_time = utc_now() - timedelta(hours=hours)
             
             query = (self.client.collection('sessions')
                     .where('last_activity', '<', cutoff_time))
@@ -527,4 +732,98 @@ class FirestoreTool(Tool):
             
         except Exception as e:
             logger.error(f"Error cleaning up expired sessions: {e}")
-            return 0
\ No newline at end of file
+            return 0
+
+class SessionWriteBuffer:
+    """
+    Coalesces new-session writes and flushes them to Firestore in batches.
+    
+    Registering a session only queues it; a background thread writes pending
+    sessions every flush_interval seconds (or as soon as max_batch are
+    queued) with FirestoreTool.save_sessions_batch. Repeated registrations of
+    the same session are ignored while it is remembered.
+    """
+    
+    def __init__(
+        self,
+        firestore_tool: FirestoreTool,
+        max_batch: int = 50,
+        flush_interval: float = 0.5,
+        seen_ttl: int = 3600,
+        on_flushed: Optional[Callable[[List[SessionData]], None]] = None
+    ):
+        """
+        Initialize the buffer and start its flusher thread.
+        
+        Args:
+            firestore_tool: Firestore tool used to write the batches
+            max_batch: Pending sessions that trigger an immediate flush
+            flush_interval: Maximum seconds a session waits before being written
+            seen_ttl: Seconds a registered session ID is remembered for deduplication
+            on_flushed: Optional callback receiving each batch once it is written
+        """
+        self.firestore_tool = firestore_tool
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.on_flushed = on_flushed
+        self._pending: Dict[str, SessionData] = {}
+        self._seen = TTLCache(maxsize=100_000, ttl=seen_ttl)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        
+        threading.Thread(target=self._run, name="session-write-buffer", daemon=True).start()
+        atexit.register(self.flush)
+    
+    def enqueue(self, session_data: SessionData) -> bool:
+        """
+        Queue a session for creation unless it was registered recently.
+        
+        Args:
+            session_data: Session to write
+            
+        Returns:
+            True if the session was queued, False if it was already known
+        """
+        with self._lock:
+            if session_data.session_id in self._seen:
+                return False
+            self._seen[session_data.session_id] = True
+            self._pending[session_data.session_id] = session_data
+            if len(self._pending) >= self.max_batch:
+                self._wakeup.set()
+        return True
+    
+    def flush(self) -> bool:
+        """
+        Write all pending sessions now.
+        
+        Returns:
+            True if every session was written (or nothing was pending), False otherwise
+        """
+        with self._lock:
+            if not self._pending:
+                return True
+            sessions = list(self._pending.values())
+            self._pending.clear()
+            
+        failed = set(self.firestore_tool.save_sessions_batch(sessions))
+        if failed:
+            # Let the failed sessions be registered again on a later message
+            with self._lock:
+                for session_id in failed:
+                    self._seen.pop(session_id, None)
+        
+        written = [session_data for session_data in sessions if session_data.session_id not in failed]
+        if written and self.on_flushed:
+            self.on_flushed(written)
+        return not failed
+    
+    def _run(self) -> None:
+        """Flush pending sessions until the process exits."""
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing session writes: {e}")
\ No newline at end of file
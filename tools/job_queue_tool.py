@@ -0,0 +1,168 @@
+"""
+Job queue tool for the Trip Planner ADK application.
+
+This tool provides functionality to enqueue trip planning requests for
+offline processing and to consume them from a worker, using Redis streams.
+"""
+
+import logging
+import orjson
+from typing import Dict, Any, Optional, List, Tuple
+import redis.asyncio as redis
+from redis.exceptions import ResponseError
+from adk import Tool
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueTool(Tool):
+    """Redis streams tool for offline trip planning jobs."""
+    
+    def __init__(self, redis_url: str, stream: str = "planner_jobs", group: str = "planner_workers",
+                 max_attempts: int = 3):
+        """
+        Initialize the job queue tool.
+        
+        Args:
+            redis_url: Redis connection URL (e.g. "redis://localhost:6379/0")
+            stream: Name of the Redis stream holding queued jobs
+            group: Consumer group shared by worker processes
+            max_attempts: Attempts a job gets before it is moved to the dead-letter stream
+        """
+        super().__init__("job_queue_tool", "Redis streams queue for offline trip planning")
+        self.stream = stream
+        self.dead_letter_stream = f"{stream}:dead"
+        self.group = group
+        self.max_attempts = max_attempts
+        self.client = None
+        self._group_ready = False
+        
+        try:
+            self.client = redis.from_url(redis_url, decode_responses=True)
+            logger.debug("Job queue tool initialized for stream %s", stream)
+        except Exception as e:
+            logger.error(f"Failed to initialize Redis client: {e}")
+    
+    def execute(self, operation: str, **kwargs) -> Any:
+        """Execute job queue operations (returns an awaitable)."""
+        if operation == "enqueue":
+            return self.enqueue(**kwargs)
+        elif operation == "consume":
+            return self.consume(**kwargs)
+        elif operation == "ack":
+            return self.ack(**kwargs)
+        elif operation == "retry":
+            return self.retry(**kwargs)
+        else:
+            raise ValueError(f"Unknown operation: {operation}")
+    
+    async def enqueue(self, payload: Dict[str, Any]) -> Optional[str]:
+        """
+        Add a job to the stream.
+        
+        Args:
+            payload: JSON-serializable job description
+            
+        Returns:
+            Job ID assigned by Redis, or None if enqueueing failed
+        """
+        try:
+            job_id = await self.client.xadd(self.stream, {"payload": orjson.dumps(payload).decode()})
+            logger.info(f"Queued job {job_id} on {self.stream}")
+            return job_id
+            
+        except Exception as e:
+            logger.error(f"Error queueing job on {self.stream}: {e}")
+            return None
+    
+    async def consume(self, consumer: str, count: int = 1, block_ms: int = 5000) -> Optional[List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Read new jobs for this consumer, blocking up to block_ms.
+        
+        Args:
+            consumer: Unique name of the worker reading jobs
+            count: Maximum number of jobs to return
+            block_ms: How long to wait for a job before returning empty
+            
+        Returns:
+            List of (job_id, payload) tuples (empty if no job arrived in
+            time), or None if reading from Redis failed
+        """
+        try:
+            await self._ensure_group()
+            response = await self.client.xreadgroup(
+                self.group, consumer, {self.stream: ">"}, count=count, block=block_ms
+            )
+            
+            jobs = []
+            for _, entries in response or []:
+                for job_id, fields in entries:
+                    jobs.append((job_id, orjson.loads(fields["payload"])))
+                    
+            return jobs
+            
+        except Exception as e:
+            logger.error(f"Error reading jobs from {self.stream}: {e}")
+            return None
+    
+    async def ack(self, job_id: str) -> bool:
+        """
+        Mark a job as processed.
+        
+        Args:
+            job_id: Job ID returned by consume
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            await self.client.xack(self.stream, self.group, job_id)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error acknowledging job {job_id}: {e}")
+            return False
+    
+    async def retry(self, job_id: str, payload: Dict[str, Any]) -> bool:
+        """
+        Requeue a failed job, or dead-letter it once it has used all attempts.
+        
+        The payload's "attempts" count is incremented and the job is added
+        back to the stream (or to the dead-letter stream) before the failed
+        delivery is acknowledged.
+        
+        Args:
+            job_id: Job ID returned by consume
+            payload: Job payload returned by consume
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        attempts = payload.get("attempts", 0) + 1
+        stream = self.stream if attempts < self.max_attempts else self.dead_letter_stream
+        try:
+            new_id = await self.client.xadd(stream, {"payload": orjson.dumps({**payload, "attempts": attempts}).decode()})
+            await self.client.xack(self.stream, self.group, job_id)
+            
+            if stream == self.dead_letter_stream:
+                logger.warning(f"Job {job_id} failed {attempts} times, moved to {stream} as {new_id}")
+            else:
+                logger.info(f"Requeued job {job_id} as {new_id} (attempt {attempts + 1} of {self.max_attempts})")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error requeueing job {job_id}: {e}")
+            return False
+    
+    async def _ensure_group(self) -> None:
+        """Create the consumer group (and stream) if it doesn't exist."""
+        if self._group_ready:
+            return
+            
+        try:
+            await self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+                
+        self._group_ready = True
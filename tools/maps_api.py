@@ -8,6 +8,7 @@ and calculate distances using Google Maps API.
 import logging
 from typing import List, Dict, Any, Optional
 import googlemaps
+import requests
 from adk import Tool
 
 from schemas import POI, POICategory, Coordinates, Address
@@ -18,15 +19,21 @@ logger = logging.getLogger(__name__)
 class MapsApiTool(Tool):
     """Google Maps API tool for place discovery and location services."""
     
-    def __init__(self, api_key: str):
-        """Initialize the Maps API tool."""
+    def __init__(self, api_key: str, http: Optional[requests.Session] = None):
+        """
+        Initialize the Maps API tool.
+        
+        Args:
+            api_key: Google Maps API key
+            http: Shared requests session to reuse pooled connections
+        """
         super().__init__("maps_api_tool", "Google Maps API integration for places and locations")
         self.api_key = api_key
         self.client = None
         
         try:
-            self.client = googlemaps.Client(key=api_key)
-            logger.info("Google Maps API tool initialized")
+            self.client = googlemaps.Client(key=api_key, requests_session=http)
+            logger.debug("Google Maps API tool initialized")
         except Exception as e:
             logger.error(f"Failed to initialize Google Maps client: {e}")
     
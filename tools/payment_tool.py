@@ -7,26 +7,39 @@ booking transactions using Stripe (mock implementation).
 
 import logging
 from typing import Dict, Any, Optional
-from decimal import Decimal
 import stripe
+import requests
 from adk import Tool
 
-from schemas import PaymentInfo, BookingBasket
+from schemas import PaymentInfo, PaymentMethod, BookingBasket, to_display
 
 logger = logging.getLogger(__name__)
 
 
+def _percent_of(cents: int, basis_points: int) -> int:
+    """Return basis_points / 10000 of an amount in cents, rounded half up."""
+    return (cents * basis_points + 5_000) // 10_000
+
+
 class PaymentTool(Tool):
     """Stripe payment processing tool for booking transactions."""
     
-    def __init__(self, stripe_secret_key: str):
-        """Initialize the Payment tool."""
+    def __init__(self, stripe_secret_key: str, http: Optional[requests.Session] = None):
+        """
+        Initialize the Payment tool.
+        
+        Args:
+            stripe_secret_key: Stripe secret API key
+            http: Shared requests session to reuse pooled connections
+        """
         super().__init__("payment_tool", "Stripe payment processing integration")
         self.stripe_secret_key = stripe_secret_key
         
         try:
             stripe.api_key = stripe_secret_key
-            logger.info("Stripe payment tool initialized")
+            if http is not None:
+                stripe.default_http_client = stripe.RequestsClient(session=http)
+            logger.debug("Stripe payment tool initialized")
         except Exception as e:
             logger.error(f"Failed to initialize Stripe: {e}")
     
@@ -43,7 +56,7 @@ class PaymentTool(Tool):
     
     def create_payment_intent(
         self,
-        amount: Decimal,
+        amount: int,
         currency: str = "usd",
         description: Optional[str] = None,
         metadata: Optional[Dict[str, str]] = None
@@ -52,7 +65,7 @@ class PaymentTool(Tool):
         Create a Stripe payment intent.
         
         Args:
-            amount: Payment amount
+            amount: Payment amount in cents
             currency: Currency code
             description: Payment description
             metadata: Additional metadata
@@ -61,22 +74,20 @@ class PaymentTool(Tool):
             Payment intent data or None if error
         """
         try:
-            # Convert amount to cents for Stripe
-            amount_cents = int(amount * 100)
-            
+            # Amounts are already in cents, as Stripe expects
             intent = stripe.PaymentIntent.create(
-                amount=amount_cents,
+                amount=amount,
                 currency=currency.lower(),
                 description=description,
                 metadata=metadata or {},
                 automatic_payment_methods={"enabled": True}
             )
             
-            logger.info(f"Created payment intent {intent.id} for {amount} {currency}")
+            logger.info(f"Created payment intent {intent.id} for {to_display(amount):.2f} {currency}")
             return {
                 "id": intent.id,
                 "client_secret": intent.client_secret,
-                "amount": amount,
+                "amount": to_display(amount),
                 "currency": currency,
                 "status": intent.status
             }
@@ -120,7 +131,7 @@ class PaymentTool(Tool):
     def process_booking_payment(
         self,
         booking_basket: BookingBasket,
-        payment_method: str = "card"
+        payment_method: PaymentMethod = "card"
     ) -> PaymentInfo:
         """
         Process payment for a booking basket.
@@ -197,7 +208,7 @@ class PaymentTool(Tool):
     def refund_payment(
         self,
         payment_intent_id: str,
-        amount: Optional[Decimal] = None,
+        amount: Optional[int] = None,
         reason: str = "requested_by_customer"
     ) -> Optional[Dict[str, Any]]:
         """
@@ -205,7 +216,7 @@ class PaymentTool(Tool):
         
         Args:
             payment_intent_id: Payment intent ID to refund
-            amount: Refund amount (None for full refund)
+            amount: Refund amount in cents (None for full refund)
             reason: Refund reason
             
         Returns:
@@ -226,7 +237,7 @@ class PaymentTool(Tool):
             }
             
             if amount:
-                refund_params["amount"] = int(amount * 100)  # Convert to cents
+                refund_params["amount"] = amount
             
             refund = stripe.Refund.create(**refund_params)
             
@@ -261,26 +272,26 @@ class PaymentTool(Tool):
             logger.error(f"Error getting payment status for {payment_intent_id}: {e}")
             return None
     
-    def calculate_booking_fees(self, subtotal: Decimal, currency: str = "usd") -> Dict[str, Decimal]:
+    def calculate_booking_fees(self, subtotal: int, currency: str = "usd") -> Dict[str, int]:
         """
         Calculate fees for a booking.
         
         Args:
-            subtotal: Booking subtotal
+            subtotal: Booking subtotal in cents
             currency: Currency code
             
         Returns:
-            Dictionary with fee breakdown
+            Dictionary with fee breakdown in cents
         """
         try:
             # Calculate service fee (5% of subtotal)
-            service_fee = subtotal * Decimal("0.05")
+            service_fee = _percent_of(subtotal, 500)
             
             # Calculate tax (10% of subtotal)
-            tax = subtotal * Decimal("0.10")
+            tax = _percent_of(subtotal, 1000)
             
             # Calculate payment processing fee (2.9% + $0.30)
-            processing_fee = (subtotal * Decimal("0.029")) + Decimal("0.30")
+            processing_fee = _percent_of(subtotal, 290) + 30
             
             total_fees = service_fee + processing_fee
             total_taxes = tax
@@ -300,11 +311,11 @@ class PaymentTool(Tool):
             logger.error(f"Error calculating booking fees: {e}")
             return {
                 "subtotal": subtotal,
-                "service_fee": Decimal("0"),
-                "processing_fee": Decimal("0"),
-                "total_fees": Decimal("0"),
-                "tax": Decimal("0"),
-                "total_taxes": Decimal("0"),
+                "service_fee": 0,
+                "processing_fee": 0,
+                "total_fees": 0,
+                "tax": 0,
+                "total_taxes": 0,
                 "total": subtotal
             }
     
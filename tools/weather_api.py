@@ -24,7 +24,7 @@ class WeatherApiTool(Tool):
         """Initialize the Weather API tool with mock data generation."""
         super().__init__("weather_api_tool", "Mock weather integration for weather data")
         self.api_key = api_key
-        logger.info("Weather API tool initialized with mock data generation")
+        logger.debug("Weather API tool initialized with mock data generation")
     
     def execute(self, operation: str, **kwargs) -> Any:
         """Execute Weather API operations."""
@@ -386,9 +386,6 @@ class WeatherApiTool(Tool):
         wind_speed = forecast_data.get('wind_speed', 5)
         precipitation = forecast_data.get('precipitation', 0)
         
-        # Determine if suitable for outdoor activities
-        is_suitable = self._is_suitable_for_outdoor(condition, temp_high, temp_low, wind_speed, precipitation)
-        
         return WeatherInfo(
             date=forecast_date,
             condition=condition,
@@ -396,9 +393,9 @@ class WeatherApiTool(Tool):
             temperature_low=temp_low,
             humidity=int(humidity),
             precipitation_chance=min(int(precipitation * 10), 100),  # Convert to percentage
+            precipitation_mm=precipitation,
             wind_speed=wind_speed,
-            uv_index=self._estimate_uv_index(condition),
-            is_suitable_for_outdoor=is_suitable
+            uv_index=self._estimate_uv_index(condition)
         )
     
     def _generate_mock_weather(self, location: str, forecast_date: date) -> WeatherInfo:
@@ -429,8 +426,6 @@ class WeatherApiTool(Tool):
         temp_high += temp_adjustment
         temp_low += temp_adjustment
         
-        is_suitable = self._is_suitable_for_outdoor(condition, temp_high, temp_low, 5, 0)
-        
         return WeatherInfo(
             date=forecast_date,
             condition=condition,
@@ -438,38 +433,11 @@ class WeatherApiTool(Tool):
             temperature_low=temp_low,
             humidity=60,
             precipitation_chance=20,
+            precipitation_mm=0,
             wind_speed=5.0,
-            uv_index=self._estimate_uv_index(condition),
-            is_suitable_for_outdoor=is_suitable
+            uv_index=self._estimate_uv_index(condition)
         )
     
-    def _is_suitable_for_outdoor(
-        self,
-        condition: WeatherCondition,
-        temp_high: float,
-        temp_low: float,
-        wind_speed: float,
-        precipitation: float
-    ) -> bool:
-        """Determine if weather is suitable for outdoor activities."""
-        # Check for extreme conditions
-        if condition in [WeatherCondition.STORMY, WeatherCondition.SNOWY]:
-            return False
-        
-        if temp_high < -5 or temp_high > 40:  # Extreme temperatures
-            return False
-        
-        if wind_speed > 25:  # Very windy
-            return False
-        
-        if precipitation > 5:  # Heavy precipitation
-            return False
-        
-        if condition == WeatherCondition.RAINY and precipitation > 1:
-            return False
-        
-        return True
-    
     def _estimate_uv_index(self, condition: WeatherCondition) -> int:
         """Estimate UV index based on weather condition."""
         uv_map = {